@@ -0,0 +1,77 @@
+"""Recall@k vs queries/sec of the IVF indexes against exact search.
+
+The corpus is synthetic: unit vectors drawn around random cluster centres,
+which is roughly how embeddings of a topical knowledge base are distributed.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_ann.py --n 100000 --dim 128 --nlist 512
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from src.retrieval.ivf_index import IVFIndex
+
+
+def _corpus(n: int, dim: int, clusters: int, queries: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(clusters, dim)).astype(np.float32)
+    data = centres[rng.integers(0, clusters, n)]
+    data += 0.5 * rng.normal(size=data.shape).astype(np.float32)
+    data /= np.linalg.norm(data, axis=1, keepdims=True)
+    picks = rng.choice(n, queries, replace=False)
+    query = data[picks] + 0.1 * rng.normal(size=(queries, dim)).astype(np.float32)
+    query /= np.linalg.norm(query, axis=1, keepdims=True)
+    return data, query
+
+
+def _exact(data: np.ndarray, queries: np.ndarray, k: int) -> tuple[np.ndarray, float]:
+    started = time.perf_counter()
+    ids = np.empty((len(queries), k), dtype=np.int64)
+    for i, query in enumerate(queries):
+        scores = data @ query
+        best = np.argpartition(-scores, k - 1)[:k]
+        ids[i] = best[np.argsort(-scores[best])]
+    return ids, len(queries) / (time.perf_counter() - started)
+
+
+def _recall(found: np.ndarray, truth: np.ndarray) -> float:
+    return float(np.mean([len(set(f) & set(t)) / len(t) for f, t in zip(found, truth)]))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--clusters", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nlist", type=int, default=512)
+    parser.add_argument("--pq-m", type=int, nargs="*", default=[16, 32])
+    parser.add_argument("--nprobe", type=int, nargs="*", default=[1, 4, 8, 16, 32, 64])
+    args = parser.parse_args()
+
+    data, queries = _corpus(args.n, args.dim, args.clusters, args.queries)
+    truth, exact_qps = _exact(data, queries, args.k)
+    print(f"n={args.n} dim={args.dim} nlist={args.nlist} k={args.k}")
+    print(f"{'index':<16} {'nprobe':>6} {'recall@k':>9} {'qps':>10}")
+    print(f"{'exact':<16} {'-':>6} {1.0:>9.3f} {exact_qps:>10,.0f}")
+
+    train = data[np.random.default_rng(1).choice(args.n, min(args.n, args.nlist * 39), replace=False)]
+    for pq_m in [None, *args.pq_m]:
+        index = IVFIndex(args.dim, nlist=args.nlist, pq_m=pq_m)
+        index.train(train, iterations=10)
+        index.add(np.arange(args.n), data)
+        name = "ivf_flat" if pq_m is None else f"ivf_pq{pq_m}"
+        for nprobe in args.nprobe:
+            started = time.perf_counter()
+            _, ids = index.search(queries, args.k, nprobe=nprobe)
+            qps = len(queries) / (time.perf_counter() - started)
+            print(f"{name:<16} {nprobe:>6} {_recall(ids, truth):>9.3f} {qps:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
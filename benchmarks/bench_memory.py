@@ -0,0 +1,77 @@
+"""Ops/sec of the persistent memory backends under concurrent load.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_memory.py --ops 2000 --concurrency 32
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from src.memory.base_memory import BaseMemory
+from src.memory.log_structured import LogStructuredMemory
+from src.memory.long_term import LongTermMemory
+from src.memory.sqlite_memory import SQLiteMemory
+
+
+async def _run(
+    memory: BaseMemory, ops: int, concurrency: int, keys: int, read_ratio: float
+) -> float:
+    rng = random.Random(42)
+    plan = [
+        ("get" if rng.random() < read_ratio else "put", f"task:{rng.randrange(keys)}")
+        for _ in range(ops)
+    ]
+    queue: asyncio.Queue = asyncio.Queue()
+    for item in plan:
+        queue.put_nowait(item)
+
+    async def worker() -> None:
+        while not queue.empty():
+            op, key = queue.get_nowait()
+            if op == "put":
+                await memory.store(key, {"task_type": "score", "processed": True, "key": key})
+            else:
+                await memory.retrieve(key)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return ops / (time.perf_counter() - started)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ops", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--keys", type=int, default=1000)
+    parser.add_argument("--read-ratio", type=float, default=0.5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = {
+            "json_file (LongTermMemory)": lambda: LongTermMemory(str(Path(tmp) / "lt.json")),
+            "sqlite_wal (SQLiteMemory)": lambda: SQLiteMemory(str(Path(tmp) / "lt.sqlite3")),
+            "log (LogStructuredMemory)": lambda: LogStructuredMemory(str(Path(tmp) / "lt.log")),
+        }
+        print(
+            f"ops={args.ops} concurrency={args.concurrency} keys={args.keys} "
+            f"read_ratio={args.read_ratio}"
+        )
+        for name, factory in backends.items():
+            memory = factory()
+            # Pre-populate so reads hit and the JSON file has realistic size.
+            for i in range(args.keys):
+                await memory.store(f"task:{i}", {"task_type": "score", "processed": True})
+            ops_per_sec = await _run(
+                memory, args.ops, args.concurrency, args.keys, args.read_ratio
+            )
+            await memory.close()
+            print(f"{name:<30} {ops_per_sec:>12,.0f} ops/sec")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,126 @@
+"""Per-request cost of the Prometheus instrumentation.
+
+Drives a minimal FastAPI app directly through its ASGI interface (no
+sockets, no HTTP client) so that the difference between variants is the
+instrumentation itself:
+
+* ``bare``: no metrics at all
+* ``manual``: ``.labels(...)`` lookups inside the handler, as routes used to
+* ``middleware``: ``PrometheusMiddleware`` with pre-bound children
+
+End-to-end numbers on a shared machine vary by a few microseconds between
+runs, so the middleware is also timed on its own around a no-op ASGI app.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_metrics.py --requests 20000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI
+
+from src.api.metrics_middleware import PrometheusMiddleware
+from src.core.metrics import REQUEST_COUNT, REQUEST_LATENCY
+
+
+def _build(variant: str) -> FastAPI:
+    app = FastAPI()
+
+    if variant == "manual":
+
+        @app.get("/api/v1/items/{item_id}")
+        async def item(item_id: str) -> dict:
+            REQUEST_COUNT.labels(endpoint="/items", method="GET").inc()
+            with REQUEST_LATENCY.labels(endpoint="/items").time():
+                return {"id": item_id}
+
+    else:
+
+        @app.get("/api/v1/items/{item_id}")
+        async def item(item_id: str) -> dict:
+            return {"id": item_id}
+
+    if variant == "middleware":
+        app.add_middleware(PrometheusMiddleware)
+    return app
+
+
+async def _drive(app: FastAPI, requests: int) -> float:
+    """Seconds per request, served sequentially."""
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        pass
+
+    def scope(i: int) -> dict:
+        path = f"/api/v1/items/{i % 100}"
+        return {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": "",
+            "query_string": b"",
+            "headers": [(b"host", b"bench")],
+            "client": ("127.0.0.1", 1234),
+            "server": ("bench", 80),
+        }
+
+    for i in range(min(1000, requests)):  # Warm up routing and label caches.
+        await app(scope(i), receive, send)
+    started = time.perf_counter()
+    for i in range(requests):
+        await app(scope(i), receive, send)
+    return (time.perf_counter() - started) / requests
+
+
+async def _isolated_middleware(requests: int) -> float:
+    """Seconds per request added by the middleware around a no-op app."""
+
+    class _Route:
+        path = "/api/v1/items/{item_id}"
+
+    async def noop(scope: dict, receive, send) -> None:
+        scope["route"] = _Route
+
+    middleware = PrometheusMiddleware(noop)
+    scope = {"type": "http", "path": "/api/v1/items/1", "method": "GET"}
+    timings = []
+    for app in (noop, middleware):
+        started = time.perf_counter()
+        for _ in range(requests):
+            await app(scope, None, None)
+        timings.append((time.perf_counter() - started) / requests)
+    return timings[1] - timings[0]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--rounds", type=int, default=5, help="Best of N per variant.")
+    args = parser.parse_args()
+
+    apps = {variant: _build(variant) for variant in ("bare", "manual", "middleware")}
+    best = {variant: float("inf") for variant in apps}
+    for _ in range(args.rounds):
+        for variant, app in apps.items():
+            best[variant] = min(best[variant], await _drive(app, args.requests))
+
+    print(f"requests={args.requests} rounds={args.rounds}")
+    for variant, seconds in best.items():
+        overhead = (seconds - best["bare"]) * 1e6
+        print(f"{variant:<12} {seconds * 1e6:>8.1f} us/request  {overhead:>+7.1f} us vs bare")
+    isolated = min([await _isolated_middleware(args.requests) for _ in range(args.rounds)])
+    print(f"middleware alone: {isolated * 1e6:.2f} us/request")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,295 @@
+"""Open-loop end-to-end load test of the API with regression gates.
+
+Runs the app from ``src.api.main.create_app`` (lifespan and warm-up included, so requests go
+through the full ``Orchestrator``) either in-process over httpx's ASGI
+transport or behind a local uvicorn server.  Requests are fired on a Poisson
+arrival schedule that does not wait for responses, and latency is measured
+from each request's *scheduled* start, so a stalled server shows up as
+latency instead of quietly lowering the offered load.
+
+With ``--baseline`` each (mix, rate) result is compared against the stored
+one and the script exits 1 if throughput drops, p99 rises or the error rate
+grows past the tolerances.  Baselines are machine-specific; refresh them on
+the machine that runs the gate with ``--save-baseline``.
+
+Usage:
+    PYTHONPATH=. python benchmarks/loadtest.py --rates 200,500 --duration 5 --mix mixed
+    PYTHONPATH=. python benchmarks/loadtest.py --baseline benchmarks/loadtest_baseline.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import socket
+import statistics
+import sys
+import threading
+import time
+from collections.abc import AsyncIterator, Callable
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+# Per-request INFO logs would dominate the measurement; set before the app is imported.
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+Request = tuple[str, dict[str, Any]]
+
+
+def _task(size: int) -> Callable[[random.Random], Request]:
+    def build(rng: random.Random) -> Request:
+        data = {"applicant_id": rng.randrange(1_000_000)}
+        if size:
+            data["notes"] = "x" * size
+        return "/api/v1/tasks", {"task_type": "analyse", "data": data}
+
+    return build
+
+
+def _broadcast(rng: random.Random) -> Request:
+    return "/api/v1/broadcasts", {
+        "task_type": "analyse",
+        "data": {"applicant_id": rng.randrange(1_000_000)},
+        "broadcast": {"target_type": "task", "per_target_timeout": 1.0},
+    }
+
+
+# Weighted request builders per named traffic mix.
+MIXES: dict[str, list[tuple[float, Callable[[random.Random], Request]]]] = {
+    "tasks": [(1.0, _task(0))],
+    "mixed": [(0.7, _task(0)), (0.2, _task(4096)), (0.1, _broadcast)],
+}
+
+
+@contextlib.asynccontextmanager
+async def _asgi_client() -> AsyncIterator[httpx.AsyncClient]:
+    from src.api.main import create_app
+
+    app = create_app()
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+            yield client
+
+
+@contextlib.asynccontextmanager
+async def _uvicorn_client(max_connections: int) -> AsyncIterator[httpx.AsyncClient]:
+    import uvicorn
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(
+        uvicorn.Config(
+            "src.api.main:create_app",
+            factory=True,
+            host="127.0.0.1",
+            port=port,
+            log_level="warning",
+        )
+    )
+    thread = threading.Thread(target=server.run, name="loadtest-uvicorn", daemon=True)
+    thread.start()
+    try:
+        while not server.started:
+            await asyncio.sleep(0.05)
+        limits = httpx.Limits(max_connections=max_connections)
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=30.0
+        ) as client:
+            yield client
+    finally:
+        server.should_exit = True
+        await asyncio.to_thread(thread.join)
+
+
+def _quantile(ordered: list[float], q: float) -> float:
+    if not ordered:
+        return float("nan")
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run_rate(
+    client: httpx.AsyncClient,
+    mix: str,
+    rate: float,
+    duration: float,
+    max_in_flight: int,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """Offer ``rate`` requests/sec for ``duration`` seconds and summarise the results."""
+    rng = random.Random(seed)
+    weights, builders = zip(*MIXES[mix])
+    latencies: list[float] = []
+    errors = 0
+    shed = 0
+    in_flight: set[asyncio.Task] = set()
+
+    async def fire(scheduled: float, path: str, body: dict[str, Any]) -> None:
+        nonlocal errors
+        try:
+            response = await client.post(path, json=body)
+            ok = response.status_code == 200 and response.json().get("success", False)
+        except httpx.HTTPError:
+            ok = False
+        if ok:
+            latencies.append(time.perf_counter() - scheduled)
+        else:
+            errors += 1
+
+    started = time.perf_counter()
+    scheduled = started
+    sent = 0
+    while True:
+        scheduled += rng.expovariate(rate)
+        if scheduled - started >= duration:
+            break
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        sent += 1
+        if len(in_flight) >= max_in_flight:
+            shed += 1  # The client itself is saturated; count it against the server.
+            continue
+        path, body = rng.choices(builders, weights)[0](rng)
+        task = asyncio.create_task(fire(scheduled, path, body))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+    if in_flight:
+        await asyncio.gather(*in_flight)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    failed = errors + shed
+    return {
+        "mix": mix,
+        "offered_rps": rate,
+        "sent": sent,
+        "completed": len(latencies),
+        "errors": failed,
+        "error_rate": failed / sent if sent else 0.0,
+        "throughput_rps": len(latencies) / elapsed,
+        "p50_ms": _quantile(latencies, 0.50) * 1000,
+        "p95_ms": _quantile(latencies, 0.95) * 1000,
+        "p99_ms": _quantile(latencies, 0.99) * 1000,
+    }
+
+
+def median_run(runs: list[dict[str, Any]]) -> dict[str, Any]:
+    """Per-metric median across repeated runs at the same rate."""
+    merged = dict(runs[0])
+    for field, value in runs[0].items():
+        if isinstance(value, float) and field != "offered_rps":
+            merged[field] = statistics.median(run[field] for run in runs)
+    merged["repeats"] = len(runs)
+    return merged
+
+
+def regressions(
+    result: dict[str, Any],
+    baseline: dict[str, Any],
+    tolerance: float,
+    p99_tolerance: float,
+    error_slack: float,
+) -> list[str]:
+    """Human-readable reasons ``result`` is worse than ``baseline``, if any."""
+    found = []
+    if result["throughput_rps"] < baseline["throughput_rps"] * (1 - tolerance):
+        found.append(
+            f"throughput {result['throughput_rps']:.0f} < baseline {baseline['throughput_rps']:.0f} rps"
+        )
+    if result["p99_ms"] > baseline["p99_ms"] * (1 + p99_tolerance):
+        found.append(f"p99 {result['p99_ms']:.2f} > baseline {baseline['p99_ms']:.2f} ms")
+    if result["error_rate"] > baseline["error_rate"] + error_slack:
+        found.append(
+            f"error rate {result['error_rate']:.2%} > baseline {baseline['error_rate']:.2%}"
+        )
+    return found
+
+
+def _key(result: dict[str, Any]) -> str:
+    return f"{result['mix']}@{result['offered_rps']:g}"
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rates", default="200,500", help="Comma-separated offered loads (req/s).")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per run.")
+    parser.add_argument(
+        "--repeats", type=int, default=5, help="Runs per rate; the median of each metric counts."
+    )
+    parser.add_argument("--warmup", type=float, default=1.0, help="Unmeasured seconds first.")
+    parser.add_argument("--mix", choices=sorted(MIXES), default="tasks")
+    parser.add_argument("--transport", choices=("asgi", "uvicorn"), default="asgi")
+    parser.add_argument("--max-in-flight", type=int, default=1000)
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--save-baseline", type=Path)
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed throughput drop.")
+    # Tail latency is noisier run to run than throughput.
+    parser.add_argument("--p99-tolerance", type=float, default=1.0, help="Allowed p99 rise.")
+    parser.add_argument("--error-slack", type=float, default=0.01)
+    args = parser.parse_args()
+    rates = [float(r) for r in args.rates.split(",") if r]
+
+    client_cm = (
+        _asgi_client() if args.transport == "asgi" else _uvicorn_client(args.max_in_flight)
+    )
+    results = []
+    async with client_cm as client:
+        if args.warmup:
+            await run_rate(client, args.mix, rates[0], args.warmup, args.max_in_flight)
+        print(
+            f"transport={args.transport} mix={args.mix} "
+            f"duration={args.duration}s repeats={args.repeats}"
+        )
+        print(
+            f"{'offered':>8} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>8}"
+        )
+        for rate in rates:
+            result = median_run(
+                [
+                    await run_rate(
+                        client, args.mix, rate, args.duration, args.max_in_flight, seed=i
+                    )
+                    for i in range(args.repeats)
+                ]
+            )
+            results.append(result)
+            print(
+                f"{rate:>8g} {result['throughput_rps']:>8.0f} {result['p50_ms']:>8.2f} "
+                f"{result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} {result['error_rate']:>8.2%}"
+            )
+
+    if args.save_baseline:
+        args.save_baseline.write_text(
+            json.dumps({_key(r): r for r in results}, indent=2, sort_keys=True) + "\n"
+        )
+        print(f"baseline written to {args.save_baseline}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        failed = False
+        for result in results:
+            stored = baseline.get(_key(result))
+            if stored is None:
+                print(f"{_key(result)}: no baseline, skipped")
+                continue
+            reasons = regressions(
+                result, stored, args.tolerance, args.p99_tolerance, args.error_slack
+            )
+            for reason in reasons:
+                print(f"REGRESSION {_key(result)}: {reason}")
+            failed = failed or bool(reasons)
+        if failed:
+            return 1
+        print("no regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
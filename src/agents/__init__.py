@@ -1,6 +1,15 @@
 from .base_agent import BaseAgent
-from .registry import AgentRegistry
 from .coordinator_agent import CoordinatorAgent
+from .registry import AgentRegistry
+from .remote_agent import RemoteAgent
+from .scoring_agent import ScoringAgent
 from .task_agent import TaskAgent
 
-__all__ = ["BaseAgent", "AgentRegistry", "CoordinatorAgent", "TaskAgent"]
+__all__ = [
+    "AgentRegistry",
+    "BaseAgent",
+    "CoordinatorAgent",
+    "RemoteAgent",
+    "ScoringAgent",
+    "TaskAgent",
+]
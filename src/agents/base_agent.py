@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import abc
 import uuid
-from datetime import datetime, timezone
+from datetime import UTC, datetime
 from typing import Any
 
 from pydantic import BaseModel, Field
@@ -14,7 +14,7 @@ from src.protocol.message_schema import A2AMessage, AgentResponse
 class AgentMetadata(BaseModel):
     agent_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     agent_type: str
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
     capabilities: list[str] = Field(default_factory=list)
 
 
@@ -48,6 +48,9 @@ class BaseAgent(abc.ABC):
     async def shutdown(self) -> None:
         """Lifecycle hook called when the agent stops."""
 
+    async def warm_up(self) -> None:
+        """Optional hook to load models and prime caches before serving traffic."""
+
     async def health_check(self) -> dict[str, Any]:
         return {
             "agent_id": self.agent_id,
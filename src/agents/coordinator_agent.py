@@ -1,11 +1,22 @@
 """CoordinatorAgent: routes incoming tasks to appropriate TaskAgents."""
 from __future__ import annotations
 
+import itertools
 from typing import TYPE_CHECKING
 
+from pydantic import ValidationError
+
 from src.agents.base_agent import BaseAgent
+from src.agents.hedging import HedgePolicy, Hedger
 from src.core.logging_config import get_logger
+from src.core.tracing import span
 from src.protocol.message_schema import A2AMessage, AgentResponse, MessageType
+from src.protocol.scatter_gather import (
+    BROADCAST_OPTIONS_KEY,
+    Aggregator,
+    BroadcastOptions,
+    ScatterGather,
+)
 
 if TYPE_CHECKING:
     from src.agents.registry import AgentRegistry
@@ -16,17 +27,26 @@ logger = get_logger(__name__)
 class CoordinatorAgent(BaseAgent):
     """
     Coordinator that receives orchestration messages and delegates
-    subtasks to registered TaskAgents.
+    subtasks to registered TaskAgents, or to a specialist agent whose
+    capabilities include the task's ``task_type`` (e.g. ``"score"``).
     """
 
     AGENT_TYPE = "coordinator"
 
-    def __init__(self, registry: "AgentRegistry") -> None:
+    def __init__(
+        self,
+        registry: AgentRegistry,
+        aggregators: dict[str, Aggregator] | None = None,
+        hedge_policy: HedgePolicy | None = None,
+    ) -> None:
         super().__init__(
             agent_type=self.AGENT_TYPE,
             capabilities=["route", "delegate", "aggregate"],
         )
         self._registry = registry
+        self._scatter_gather = ScatterGather(self.agent_id, aggregators)
+        self._hedger = Hedger(hedge_policy) if hedge_policy else None
+        self._round_robin = itertools.count()
 
     async def startup(self) -> None:
         logger.info("coordinator_startup", extra={"agent_id": self.agent_id})
@@ -42,6 +62,8 @@ class CoordinatorAgent(BaseAgent):
 
         if message.message_type == MessageType.TASK_REQUEST:
             return await self._delegate_task(message)
+        elif message.message_type == MessageType.BROADCAST:
+            return await self._broadcast(message)
         elif message.message_type == MessageType.HEALTH_CHECK:
             return AgentResponse(
                 agent_id=self.agent_id,
@@ -57,9 +79,24 @@ class CoordinatorAgent(BaseAgent):
                 error=f"Unsupported message type: {message.message_type}",
             )
 
+    def _candidates(self, task_type: str) -> list[BaseAgent]:
+        """Agents advertising ``task_type`` as a capability, else the TaskAgents."""
+        if task_type:
+            specialists = [
+                a for a in self._registry.get_by_capability(task_type)
+                if a.agent_id != self.agent_id
+            ]
+            if specialists:
+                return specialists
+        return self._registry.get_by_type("task")
+
     async def _delegate_task(self, message: A2AMessage) -> AgentResponse:
+        with span("coordinator_delegate", message):
+            return await self._route_task(message)
+
+    async def _route_task(self, message: A2AMessage) -> AgentResponse:
         task_type = (message.payload or {}).get("task_type", "")
-        candidates = self._registry.get_by_type("task")
+        candidates = self._candidates(task_type)
 
         if not candidates:
             return AgentResponse(
@@ -69,9 +106,43 @@ class CoordinatorAgent(BaseAgent):
                 error="No TaskAgents available.",
             )
 
-        target = candidates[0]
+        # Rotate across replicas (local and remote alike); when hedging, the
+        # hedge always lands on a different replica than the primary.
+        start = next(self._round_robin) % len(candidates)
+        primary = candidates[start]
         logger.info(
             "coordinator_delegating",
-            extra={"target_agent_id": target.agent_id, "task_type": task_type},
+            extra={"target_agent_id": primary.agent_id, "task_type": task_type},
         )
-        return await target.handle(message)
+        if self._hedger is None:
+            return await primary.handle(message)
+        secondary = candidates[(start + 1) % len(candidates)] if len(candidates) > 1 else None
+        return await self._hedger.run(message, primary, secondary)
+
+    async def _broadcast(self, message: A2AMessage) -> AgentResponse:
+        try:
+            options = BroadcastOptions.model_validate(
+                (message.payload or {}).get(BROADCAST_OPTIONS_KEY) or {}
+            )
+        except ValidationError as exc:
+            return AgentResponse(
+                agent_id=self.agent_id,
+                message_id=message.message_id,
+                success=False,
+                error=f"Invalid broadcast options: {exc.errors()}",
+            )
+
+        if options.target_type:
+            targets = self._registry.get_by_type(options.target_type)
+        elif options.capability:
+            targets = self._registry.get_by_capability(options.capability)
+        else:
+            return AgentResponse(
+                agent_id=self.agent_id,
+                message_id=message.message_id,
+                success=False,
+                error="Broadcast requires a target_type or capability.",
+            )
+
+        targets = [t for t in targets if t.agent_id != self.agent_id]
+        return await self._scatter_gather.run(message, targets, options)
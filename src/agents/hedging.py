@@ -0,0 +1,151 @@
+"""Hedged delegation to cut tail latency across TaskAgent replicas.
+
+If the primary replica has not answered within a recent latency percentile,
+a duplicate of the request goes to a second replica.  Whichever answers
+first wins and the other is cancelled.  A token bucket caps the fraction of
+requests that may be hedged so a slow backend cannot double the load.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from src.core.logging_config import get_logger
+from src.core.metrics import HEDGE_BUDGET_EXHAUSTED, HEDGE_FIRED, HEDGE_WON
+from src.protocol.message_schema import A2AMessage, AgentResponse
+
+if TYPE_CHECKING:
+    from src.agents.base_agent import BaseAgent
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class HedgePolicy:
+    """Tuning knobs for hedged delegation."""
+
+    percentile: float = 0.95
+    budget_ratio: float = 0.1
+    budget_burst: float = 10.0
+    min_delay_seconds: float = 0.005
+    initial_delay_seconds: float = 0.05
+    window: int = 1000
+    min_samples: int = 20
+
+
+class LatencyTracker:
+    """Sliding window of recent latencies with a lazily refreshed percentile."""
+
+    _REFRESH_EVERY = 32
+
+    def __init__(self, window: int) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+        self._since_refresh = 0
+        self._cached: dict[float, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self._since_refresh += 1
+        if self._since_refresh >= self._REFRESH_EVERY:
+            self._cached.clear()
+            self._since_refresh = 0
+
+    def percentile(self, q: float) -> float:
+        value = self._cached.get(q)
+        if value is None:
+            ordered = sorted(self._samples)
+            value = ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+            self._cached[q] = value
+        return value
+
+
+class HedgeBudget:
+    """Token bucket: each request earns ``ratio`` tokens, each hedge spends one."""
+
+    def __init__(self, ratio: float, burst: float) -> None:
+        self._ratio = ratio
+        self._burst = burst
+        self._tokens = burst
+
+    def earn(self) -> None:
+        self._tokens = min(self._burst, self._tokens + self._ratio)
+
+    def try_spend(self) -> bool:
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        return False
+
+
+class Hedger:
+    """Runs one delegation with an optional hedge to a second replica."""
+
+    def __init__(self, policy: HedgePolicy | None = None) -> None:
+        self.policy = policy or HedgePolicy()
+        self._latencies = LatencyTracker(self.policy.window)
+        self._budget = HedgeBudget(self.policy.budget_ratio, self.policy.budget_burst)
+
+    def hedge_delay(self) -> float:
+        if len(self._latencies) < self.policy.min_samples:
+            return self.policy.initial_delay_seconds
+        return max(
+            self.policy.min_delay_seconds,
+            self._latencies.percentile(self.policy.percentile),
+        )
+
+    async def run(
+        self,
+        message: A2AMessage,
+        primary: BaseAgent,
+        secondary: BaseAgent | None,
+    ) -> AgentResponse:
+        self._budget.earn()
+        started = time.perf_counter()
+        tasks = {asyncio.create_task(primary.handle(message)): primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay())
+            if not done and secondary is not None:
+                if self._budget.try_spend():
+                    HEDGE_FIRED.inc()
+                    logger.info(
+                        "coordinator_hedging",
+                        extra={
+                            "message_id": message.message_id,
+                            "primary_agent_id": primary.agent_id,
+                            "hedge_agent_id": secondary.agent_id,
+                        },
+                    )
+                    tasks[asyncio.create_task(secondary.handle(message))] = secondary
+                else:
+                    HEDGE_BUDGET_EXHAUSTED.inc()
+            winner = await self._first_good(tasks)
+            if tasks[winner] is not primary:
+                HEDGE_WON.inc()
+            self._latencies.observe(time.perf_counter() - started)
+            return winner.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Reap the loser so its cancellation (or error) is not left unobserved.
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    @staticmethod
+    async def _first_good(tasks: dict[asyncio.Task, BaseAgent]) -> asyncio.Task:
+        """First task to finish with a successful response, else the last to finish."""
+        pending = set(tasks)
+        while True:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            good = [
+                t for t in done
+                if not t.cancelled() and t.exception() is None and t.result().success
+            ]
+            if good:
+                return good[0]
+            if not pending:
+                return done.pop()
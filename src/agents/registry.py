@@ -2,8 +2,6 @@
 from __future__ import annotations
 
 import asyncio
-import logging
-from typing import Optional
 
 from src.agents.base_agent import BaseAgent
 from src.core.logging_config import get_logger
@@ -38,12 +36,18 @@ class AgentRegistry:
                 agent._is_running = False
                 logger.info("agent_deregistered", extra={"agent_id": agent_id})
 
-    def get(self, agent_id: str) -> Optional[BaseAgent]:
+    def get(self, agent_id: str) -> BaseAgent | None:
         return self._agents.get(agent_id)
 
     def get_by_type(self, agent_type: str) -> list[BaseAgent]:
         return [a for a in self._agents.values() if a.agent_type == agent_type]
 
+    def get_by_capability(self, capability: str) -> list[BaseAgent]:
+        return [a for a in self._agents.values() if capability in a.metadata.capabilities]
+
+    def all_agents(self) -> list[BaseAgent]:
+        return list(self._agents.values())
+
     def count(self) -> int:
         """Return the number of currently registered agents."""
         return len(self._agents)
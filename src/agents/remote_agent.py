@@ -0,0 +1,46 @@
+"""RemoteAgent: local proxy for an agent hosted behind an AgentServer."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from src.agents.base_agent import BaseAgent
+from src.protocol.message_schema import A2AMessage, AgentResponse
+
+if TYPE_CHECKING:
+    from src.protocol.socket_transport import SocketTransport
+
+
+class RemoteAgent(BaseAgent):
+    """
+    Registers like any local agent but forwards every message over a
+    ``SocketTransport`` to the process that actually hosts the agent.
+    """
+
+    def __init__(
+        self,
+        address: str,
+        transport: SocketTransport,
+        agent_id: str,
+        agent_type: str,
+        capabilities: list[str] | None = None,
+    ) -> None:
+        super().__init__(agent_type=agent_type, capabilities=capabilities)
+        self.metadata.agent_id = agent_id
+        self.address = address
+        self._transport = transport
+
+    async def startup(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    async def handle(self, message: A2AMessage) -> AgentResponse:
+        if message.recipient_id != self.agent_id:
+            message = message.model_copy(update={"recipient_id": self.agent_id})
+        return await self._transport.request(self.address, message)
+
+    async def health_check(self) -> dict:
+        health = await super().health_check()
+        health["address"] = self.address
+        return health
@@ -0,0 +1,169 @@
+"""ScoringAgent: scores credit applicants with the exported model."""
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any
+
+from src.agents.base_agent import BaseAgent
+from src.core.logging_config import get_logger
+from src.core.tracing import record_task_outcome, span
+from src.protocol.message_schema import A2AMessage, AgentResponse, MessageType
+
+if TYPE_CHECKING:
+    from src.drift_monitor import DriftMonitor
+
+logger = get_logger(__name__)
+
+
+def _load_artifact(path: str) -> dict[str, Any]:
+    # joblib (and the sklearn it unpickles) is imported on first load, not at startup.
+    import joblib
+
+    return joblib.load(path)
+
+
+class ScoringAgent(BaseAgent):
+    """
+    Scores batches of applicants with the artifact written by
+    ``train_model.export_model`` and attaches the most similar historical
+    applicants to each score.  The artifact is loaded by ``warm_up`` or on
+    first use.  If it carries a drift reference, every scored batch also
+    feeds a ``DriftMonitor``.
+    """
+
+    AGENT_TYPE = "scoring"
+
+    def __init__(
+        self,
+        artifact_path: str,
+        neighbours: int = 5,
+        drift_half_life_rows: float | None = 50_000,
+        drift_min_rows: float = 500,
+    ) -> None:
+        super().__init__(
+            agent_type=self.AGENT_TYPE,
+            capabilities=["score", "similar_applicants"],
+        )
+        self._artifact_path = artifact_path
+        self._neighbours = neighbours
+        self._drift_half_life_rows = drift_half_life_rows
+        self._drift_min_rows = drift_min_rows
+        self._artifact: dict[str, Any] | None = None
+        self.drift_monitor: DriftMonitor | None = None
+        self._load_lock = asyncio.Lock()
+
+    async def startup(self) -> None:
+        logger.info(
+            "scoring_agent_startup",
+            extra={"agent_id": self.agent_id, "artifact_path": self._artifact_path},
+        )
+
+    async def shutdown(self) -> None:
+        logger.info("scoring_agent_shutdown", extra={"agent_id": self.agent_id})
+
+    async def _load(self) -> dict[str, Any]:
+        if self._artifact is None:
+            async with self._load_lock:
+                if self._artifact is None:
+                    artifact = await asyncio.to_thread(_load_artifact, self._artifact_path)
+                    if artifact.get("drift_reference") is not None:
+                        from src.drift_monitor import DriftMonitor
+
+                        self.drift_monitor = DriftMonitor(
+                            artifact["drift_reference"],
+                            half_life_rows=self._drift_half_life_rows,
+                            min_rows=self._drift_min_rows,
+                        )
+                    self._artifact = artifact
+                    logger.info(
+                        "scoring_agent_artifact_loaded",
+                        extra={
+                            "agent_id": self.agent_id,
+                            "historical_rows": len(self._artifact["similar_applicants"]),
+                            "drift_monitoring": self.drift_monitor is not None,
+                        },
+                    )
+        return self._artifact
+
+    async def warm_up(self) -> None:
+        """Load the artifact and score one average applicant end to end."""
+        artifact = await self._load()
+        applicant = dict(zip(artifact["features"], artifact["scaler"].mean_.tolist()))
+        # No monitor: the synthetic applicant is not traffic.
+        await asyncio.to_thread(self._score, artifact, [applicant], self._neighbours, None)
+        logger.info("scoring_agent_warmed_up", extra={"agent_id": self.agent_id})
+
+    async def handle(self, message: A2AMessage) -> AgentResponse:
+        logger.info(
+            "scoring_agent_received",
+            extra={"message_id": message.message_id, "msg_type": message.message_type},
+        )
+        if message.message_type != MessageType.TASK_REQUEST:
+            return self._error(message, f"Unsupported message type: {message.message_type}")
+
+        with span("task_execute", message):
+            try:
+                response = await self._score_request(message)
+            except Exception:
+                record_task_outcome(self.agent_type, success=False)
+                raise
+        record_task_outcome(self.agent_type, response.success)
+        return response
+
+    async def _score_request(self, message: A2AMessage) -> AgentResponse:
+        payload = message.payload or {}
+        applicants = payload.get("applicants") or payload.get("data", {}).get("applicants")
+        if not applicants:
+            return self._error(message, "Payload must contain a non-empty 'applicants' list.")
+
+        artifact = await self._load()
+        features = artifact["features"]
+        missing = sorted({f for a in applicants for f in features if a.get(f) is None})
+        if missing:
+            return self._error(message, f"Applicants are missing features: {missing}")
+
+        k = int(payload.get("neighbours", self._neighbours))
+        scores = await asyncio.to_thread(
+            self._score, artifact, applicants, k, self.drift_monitor
+        )
+        return AgentResponse(
+            agent_id=self.agent_id,
+            message_id=message.message_id,
+            success=True,
+            payload={"scores": scores},
+        )
+
+    @staticmethod
+    def _score(
+        artifact: dict[str, Any],
+        applicants: list[dict[str, Any]],
+        k: int,
+        drift_monitor=None,
+    ) -> list[dict[str, Any]]:
+        import numpy as np
+
+        scaler = artifact["scaler"]
+        raw = np.array(
+            [[float(a[f]) for f in artifact["features"]] for a in applicants], dtype=np.float64
+        )
+        # Same transform as StandardScaler.transform, without the feature-name checks.
+        scaled = (raw - scaler.mean_) / scaler.scale_
+        probabilities = artifact["model"].predict_proba(scaled)[:, 1]
+        if drift_monitor is not None:
+            drift_monitor.update(raw, probabilities)
+        similar = artifact["similar_applicants"].query(scaled, k) if k > 0 else None
+        return [
+            {
+                "default_probability": float(p),
+                **({"similar_applicants": similar[i]} if similar is not None else {}),
+            }
+            for i, p in enumerate(probabilities)
+        ]
+
+    def _error(self, message: A2AMessage, error: str) -> AgentResponse:
+        return AgentResponse(
+            agent_id=self.agent_id,
+            message_id=message.message_id,
+            success=False,
+            error=error,
+        )
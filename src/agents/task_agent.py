@@ -1,9 +1,15 @@
 """TaskAgent: executes concrete tasks delegated by the CoordinatorAgent."""
 from __future__ import annotations
 
+from typing import Any
+
 from src.agents.base_agent import BaseAgent
 from src.core.logging_config import get_logger
+from src.core.tracing import record_task_outcome, span
+from src.memory.base_memory import BaseMemory
 from src.memory.short_term import ShortTermMemory
+from src.memory.snapshot import SnapshotError, restore_snapshot, save_snapshot
+from src.memory.tiered import TieredMemory
 from src.protocol.message_schema import A2AMessage, AgentResponse, MessageType
 
 logger = get_logger(__name__)
@@ -13,22 +19,51 @@ class TaskAgent(BaseAgent):
     """
     General-purpose task executor.  Stores results in short-term memory
     and returns structured responses.
+
+    With ``snapshot_path`` set (and a ``ShortTermMemory`` or the cache tier
+    of a ``TieredMemory``), memory is written to a snapshot on shutdown and
+    restored from it on startup so a restarted agent begins warm.  Without
+    a snapshot a ``ShortTermMemory`` is cleared on shutdown; any other
+    memory is only closed, which flushes it, and is never cleared.
     """
 
     AGENT_TYPE = "task"
 
-    def __init__(self) -> None:
+    def __init__(
+        self, memory: BaseMemory | None = None, snapshot_path: str | None = None
+    ) -> None:
         super().__init__(
             agent_type=self.AGENT_TYPE,
             capabilities=["execute", "store", "retrieve"],
         )
-        self._memory = ShortTermMemory()
+        self._memory = memory if memory is not None else ShortTermMemory()
+        self._snapshot_path = snapshot_path
+        if snapshot_path and not isinstance(self._memory, (ShortTermMemory, TieredMemory)):
+            logger.warning(
+                "task_agent_snapshot_unsupported",
+                extra={"agent_id": self.agent_id, "memory": type(self._memory).__name__},
+            )
+            self._snapshot_path = None
 
     async def startup(self) -> None:
+        memory = self._memory
+        if self._snapshot_path and isinstance(memory, (ShortTermMemory, TieredMemory)):
+            try:
+                await restore_snapshot(memory, self._snapshot_path)
+            except (OSError, SnapshotError) as exc:
+                logger.warning(
+                    "task_agent_snapshot_restore_failed",
+                    extra={"agent_id": self.agent_id, "error": str(exc)},
+                )
         logger.info("task_agent_startup", extra={"agent_id": self.agent_id})
 
     async def shutdown(self) -> None:
-        await self._memory.clear()
+        memory = self._memory
+        if self._snapshot_path and isinstance(memory, (ShortTermMemory, TieredMemory)):
+            await save_snapshot(memory, self._snapshot_path)
+        elif isinstance(memory, ShortTermMemory):
+            await self._memory.clear()
+        await self._memory.close()
         logger.info("task_agent_shutdown", extra={"agent_id": self.agent_id})
 
     async def handle(self, message: A2AMessage) -> AgentResponse:
@@ -41,14 +76,7 @@ class TaskAgent(BaseAgent):
             result = await self._execute_task(message)
             return result
         elif message.message_type == MessageType.MEMORY_QUERY:
-            key = (message.payload or {}).get("key")
-            value = await self._memory.retrieve(key) if key else None
-            return AgentResponse(
-                agent_id=self.agent_id,
-                message_id=message.message_id,
-                success=True,
-                payload={"key": key, "value": value},
-            )
+            return await self._query_memory(message)
         else:
             return AgentResponse(
                 agent_id=self.agent_id,
@@ -57,7 +85,42 @@ class TaskAgent(BaseAgent):
                 error=f"Unsupported message type: {message.message_type}",
             )
 
+    async def _query_memory(self, message: A2AMessage) -> AgentResponse:
+        """Look up one ``key``, a batch of ``keys``, or every key under a ``prefix``."""
+        payload = message.payload or {}
+        result: dict[str, Any]
+        if "keys" in payload:
+            result = {"items": await self._memory.retrieve_many(payload["keys"])}
+        elif "prefix" in payload:
+            limit = payload.get("limit")
+            items: dict[str, Any] = {}
+            async for name, value in self._memory.scan(payload["prefix"]):
+                if limit is not None and len(items) >= limit:
+                    break
+                items[name] = value
+            result = {"prefix": payload["prefix"], "items": items}
+        else:
+            key = payload.get("key")
+            value = await self._memory.retrieve(key) if key else None
+            result = {"key": key, "value": value}
+        return AgentResponse(
+            agent_id=self.agent_id,
+            message_id=message.message_id,
+            success=True,
+            payload=result,
+        )
+
     async def _execute_task(self, message: A2AMessage) -> AgentResponse:
+        with span("task_execute", message):
+            try:
+                response = await self._run_task(message)
+            except Exception:
+                record_task_outcome(self.agent_type, success=False)
+                raise
+        record_task_outcome(self.agent_type, response.success)
+        return response
+
+    async def _run_task(self, message: A2AMessage) -> AgentResponse:
         payload = message.payload or {}
         task_type = payload.get("task_type", "generic")
         task_data = payload.get("data", {})
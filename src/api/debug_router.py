@@ -0,0 +1,92 @@
+"""Authenticated diagnostics endpoints for a running service.
+
+Disabled (every route answers 404) unless ``DEBUG_TOKEN`` is set; callers
+then send it as ``Authorization: Bearer <token>``.
+"""
+from __future__ import annotations
+
+import asyncio
+import secrets
+import threading
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import PlainTextResponse
+
+from src.core.logging_config import get_logger
+from src.core.profiler import SamplingProfiler, collapse, task_stacks
+
+logger = get_logger(__name__)
+
+# One profile at a time: concurrent samplers would skew each other.
+_profile_lock = threading.Lock()
+
+
+def get_debug_token(request: Request) -> str | None:
+    return request.app.state.settings.debug_token
+
+
+def get_profile_max_seconds(request: Request) -> float:
+    return request.app.state.settings.debug_profile_max_seconds
+
+
+def require_debug_token(
+    authorization: str | None = Header(default=None),
+    token: str | None = Depends(get_debug_token),
+) -> None:
+    if not token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    scheme, _, supplied = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(
+        supplied.encode(), token.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid debug token.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+debug_router = APIRouter(
+    prefix="/api/v1/debug",
+    tags=["debug"],
+    dependencies=[Depends(require_debug_token)],
+)
+
+
+@debug_router.get("/profile", response_class=PlainTextResponse)
+async def profile(
+    seconds: float = Query(5.0, gt=0),
+    interval_ms: float = Query(5.0, ge=1, le=1000),
+    max_seconds: float = Depends(get_profile_max_seconds),
+) -> PlainTextResponse:
+    """Sample every thread for ``seconds`` and return collapsed stacks."""
+    if seconds > max_seconds:
+        raise HTTPException(
+            status_code=422, detail=f"seconds must be <= {max_seconds}."
+        )
+    if not _profile_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="A profile is already running.")
+    try:
+        logger.info("debug_profile_started", extra={"seconds": seconds, "interval_ms": interval_ms})
+        profiler = SamplingProfiler(interval=interval_ms / 1000)
+        # Sample from a worker thread so the loop keeps serving (and is sampled).
+        counts = await asyncio.to_thread(profiler.sample, seconds)
+    finally:
+        _profile_lock.release()
+    return PlainTextResponse(collapse(counts))
+
+
+@debug_router.get("/tasks")
+async def tasks() -> dict:
+    """Await-chain stack of every asyncio task on the event loop."""
+    dumps = task_stacks()
+    return {"count": len(dumps), "tasks": dumps}
+
+
+@debug_router.get("/loop-lag")
+async def loop_lag(request: Request) -> dict:
+    """Event-loop lag statistics and the stacks captured during recent stalls."""
+    monitor = getattr(request.app.state, "loop_monitor", None)
+    if monitor is None:
+        raise HTTPException(status_code=503, detail="Loop lag monitor is not running.")
+    return monitor.snapshot()
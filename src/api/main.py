@@ -1,50 +1,129 @@
-"""FastAPI application entry point."""
+"""FastAPI application entry point.
+
+``create_app()`` builds the application; serve it with
+``uvicorn --factory src.api.main:create_app``.  Startup runs in the lifespan:
+the orchestrator is set up, agents warm up (models loaded, hot path
+exercised) and only then does ``GET /api/v1/ready`` start passing.
+``src.api.main:app`` still works and builds a default app on first access.
+"""
 from __future__ import annotations
 
-import logging
+import time
+
+_import_started = time.perf_counter()
+
+import contextlib
+from collections.abc import AsyncIterator
+from typing import Any
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from prometheus_client import make_asgi_app
 
+from src.api.debug_router import debug_router
+from src.api.metrics_middleware import PrometheusMiddleware
 from src.api.router import router
 from src.core.config import Settings
-from src.core.logging_config import configure_logging
+from src.core.logging_config import configure_logging, get_logger, shutdown_logging
+from src.core.metrics import (
+    APP_IMPORT_SECONDS,
+    APP_READY,
+    APP_READY_SECONDS,
+    make_metrics_app,
+    mark_process_dead,
+)
 from src.core.orchestrator import Orchestrator
+from src.core.profiler import LoopLagMonitor
+from src.core.tracing import configure_tracing
 
-settings = Settings()
-configure_logging(settings.log_level)
+logger = get_logger(__name__)
 
-app = FastAPI(
-    title="Agentic AI Core Framework",
-    description="Production-grade multi-agent orchestration platform.",
-    version="1.0.0",
-)
+IMPORT_SECONDS = time.perf_counter() - _import_started
+APP_IMPORT_SECONDS.set(IMPORT_SECONDS)
 
-# CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.allowed_origins,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
 
-# Prometheus metrics endpoint
-metrics_app = make_asgi_app()
-app.mount("/metrics", metrics_app)
+def create_app(settings: Settings | None = None) -> FastAPI:
+    settings = settings or Settings()
+    created = time.perf_counter()
+    configure_logging(
+        settings.log_level,
+        asynchronous=settings.log_async,
+        queue_size=settings.log_queue_size,
+        sample_rates=settings.log_sample_rates,
+    )
+    configure_tracing(settings.trace_slow_span_seconds)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        orchestrator = Orchestrator(settings=settings)
+        await orchestrator.setup()
+        app.state.orchestrator = orchestrator
+        loop_monitor = LoopLagMonitor(
+            interval=settings.loop_lag_interval_seconds,
+            stall_threshold=settings.loop_stall_threshold_seconds,
+        )
+        await loop_monitor.start()
+        app.state.loop_monitor = loop_monitor
+        try:
+            if settings.warmup_enabled:
+                await orchestrator.warm_up()
+            ready_seconds = time.perf_counter() - created
+            app.state.ready = True
+            APP_READY_SECONDS.set(ready_seconds)
+            APP_READY.set(1)
+            logger.info(
+                "application_ready",
+                extra={
+                    "import_seconds": round(IMPORT_SECONDS, 4),
+                    "ready_seconds": round(ready_seconds, 4),
+                },
+            )
+            yield
+        finally:
+            # Fail readiness first so load balancers drain before teardown.
+            app.state.ready = False
+            APP_READY.set(0)
+            await loop_monitor.stop()
+            await orchestrator.teardown()
+            mark_process_dead()
+            logger.info("application_shutdown")
+            shutdown_logging()
+
+    app = FastAPI(
+        title="Agentic AI Core Framework",
+        description="Production-grade multi-agent orchestration platform.",
+        version="1.0.0",
+        lifespan=lifespan,
+    )
+    app.state.settings = settings
+    app.state.ready = False
+
+    # CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.allowed_origins,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Request count/latency for every route; added last so it wraps CORS too.
+    app.add_middleware(PrometheusMiddleware)
+
+    # Prometheus metrics endpoint (aggregated across workers in multiprocess mode)
+    app.mount("/metrics", make_metrics_app())
 
-app.include_router(router)
+    app.include_router(router)
+    app.include_router(debug_router)
+    return app
 
 
-@app.on_event("startup")
-async def on_startup() -> None:
-    orchestrator = Orchestrator(settings=settings)
-    await orchestrator.setup()
-    app.state.orchestrator = orchestrator
-    logging.getLogger(__name__).info("application_startup")
+_default_app: FastAPI | None = None
 
 
-@app.on_event("shutdown")
-async def on_shutdown() -> None:
-    await app.state.orchestrator.teardown()
-    logging.getLogger(__name__).info("application_shutdown")
+def __getattr__(name: str) -> Any:
+    # ``src.api.main:app`` without building an app (and reading settings) at import.
+    global _default_app
+    if name == "app":
+        if _default_app is None:
+            _default_app = create_app()
+        return _default_app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
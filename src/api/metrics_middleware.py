@@ -0,0 +1,57 @@
+"""ASGI middleware recording request count and latency for every route.
+
+Requests are labelled with the matched route's path template (e.g.
+``/api/v1/agents/{agent_id}/health``) rather than the raw path, so label
+cardinality stays bounded by the number of routes.  Label children are bound
+once per (route, method) and reused, so the per-request cost is a dict
+lookup, a counter increment and a histogram observation.  A plain ASGI
+callable is used instead of ``BaseHTTPMiddleware`` to avoid its extra task
+and response streaming per request.
+"""
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable
+from typing import Any
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.core.metrics import REQUEST_COUNT, REQUEST_LATENCY
+
+UNMATCHED_ENDPOINT = "<unmatched>"
+
+_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+
+class PrometheusMiddleware:
+    def __init__(self, app: ASGIApp, skip_paths: Iterable[str] = ("/metrics",)) -> None:
+        self.app = app
+        self._skip_paths = tuple(skip_paths)
+        self._children: dict[tuple[str, str], tuple[Any, Any]] = {}
+
+    def _bound(self, endpoint: str, method: str) -> tuple[Any, Any]:
+        children = self._children.get((endpoint, method))
+        if children is None:
+            children = self._children[(endpoint, method)] = (
+                REQUEST_COUNT.labels(endpoint=endpoint, method=method),
+                REQUEST_LATENCY.labels(endpoint=endpoint),
+            )
+        return children
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self._skip_paths):
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            # The router records the matched route on the shared scope.
+            route = scope.get("route")
+            endpoint = getattr(route, "path", None) or UNMATCHED_ENDPOINT
+            method = scope["method"]
+            if method not in _METHODS:
+                method = "OTHER"
+            count, latency = self._bound(endpoint, method)
+            count.inc()
+            latency.observe(time.perf_counter() - started)
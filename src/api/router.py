@@ -1,59 +1,97 @@
 """FastAPI route definitions for the agent orchestration API."""
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status
 from pydantic import BaseModel
-from typing import Any, Optional
 
-from src.core.metrics import REQUEST_COUNT, REQUEST_LATENCY
 from src.core.orchestrator import Orchestrator
-from src.protocol.message_schema import A2AMessage, AgentResponse, MessageType
+from src.core.tracing import ensure_correlation_id, span
+from src.protocol.message_schema import A2AMessage, AgentResponse, MessageType, Priority
+from src.protocol.scatter_gather import BROADCAST_OPTIONS_KEY, BroadcastOptions
 
 router = APIRouter(prefix="/api/v1", tags=["agents"])
 
 
-def get_orchestrator() -> Orchestrator:
-    from src.api.main import app
-    return app.state.orchestrator
+def get_orchestrator(request: Request) -> Orchestrator:
+    return request.app.state.orchestrator
+
+
+OrchestratorDep = Annotated[Orchestrator, Depends(get_orchestrator)]
 
 
 class TaskRequest(BaseModel):
     sender_id: str = "api_client"
     task_type: str
-    data: Optional[dict[str, Any]] = None
-    recipient_id: Optional[str] = None
+    data: dict[str, Any] | None = None
+    recipient_id: str | None = None
+    priority: Priority = Priority.NORMAL
 
 
 @router.post("/tasks", response_model=AgentResponse, status_code=status.HTTP_200_OK)
 async def submit_task(
     request: TaskRequest,
-    orchestrator: Orchestrator = Depends(get_orchestrator),
+    orchestrator: OrchestratorDep,
+    x_correlation_id: str | None = Header(default=None),
 ) -> AgentResponse:
     """Submit a task to the orchestrator for routing."""
-    REQUEST_COUNT.labels(endpoint="/tasks", method="POST").inc()
-    with REQUEST_LATENCY.labels(endpoint="/tasks").time():
-        message = A2AMessage(
-            sender_id=request.sender_id,
-            recipient_id=request.recipient_id,
-            message_type=MessageType.TASK_REQUEST,
-            payload={"task_type": request.task_type, "data": request.data or {}},
-        )
+    message = A2AMessage(
+        sender_id=request.sender_id,
+        recipient_id=request.recipient_id,
+        message_type=MessageType.TASK_REQUEST,
+        priority=request.priority,
+        correlation_id=x_correlation_id,
+        payload={"task_type": request.task_type, "data": request.data or {}},
+    )
+    ensure_correlation_id(message)
+    with span("api", message):
+        return await orchestrator.dispatch(message)
+
+
+class BroadcastRequest(BaseModel):
+    sender_id: str = "api_client"
+    task_type: str
+    data: dict[str, Any] | None = None
+    broadcast: BroadcastOptions
+    priority: Priority = Priority.NORMAL
+
+
+@router.post("/broadcasts", response_model=AgentResponse, status_code=status.HTTP_200_OK)
+async def submit_broadcast(
+    request: BroadcastRequest,
+    orchestrator: OrchestratorDep,
+    x_correlation_id: str | None = Header(default=None),
+) -> AgentResponse:
+    """Fan a task out to every matching agent and return the aggregated result."""
+    message = A2AMessage(
+        sender_id=request.sender_id,
+        message_type=MessageType.BROADCAST,
+        priority=request.priority,
+        correlation_id=x_correlation_id,
+        payload={
+            "task_type": request.task_type,
+            "data": request.data or {},
+            BROADCAST_OPTIONS_KEY: request.broadcast.model_dump(mode="json"),
+        },
+    )
+    ensure_correlation_id(message)
+    with span("api", message):
         return await orchestrator.dispatch(message)
 
 
 @router.get("/agents", status_code=status.HTTP_200_OK)
 async def list_agents(
-    orchestrator: Orchestrator = Depends(get_orchestrator),
+    orchestrator: OrchestratorDep,
 ) -> dict:
     """List all registered agents."""
-    REQUEST_COUNT.labels(endpoint="/agents", method="GET").inc()
     return {"agents": orchestrator.registry.list_agents()}
 
 
 @router.get("/agents/{agent_id}/health", status_code=status.HTTP_200_OK)
 async def agent_health(
     agent_id: str,
-    orchestrator: Orchestrator = Depends(get_orchestrator),
+    orchestrator: OrchestratorDep,
 ) -> dict:
     """Health check for a specific agent."""
     agent = orchestrator.registry.get(agent_id)
@@ -66,3 +104,12 @@ async def agent_health(
 async def system_health() -> dict:
     """Overall system health."""
     return {"status": "healthy"}
+
+
+@router.get("/ready", status_code=status.HTTP_200_OK)
+async def readiness(request: Request, response: Response) -> dict:
+    """Readiness probe: passes once startup and warm-up have finished."""
+    if not getattr(request.app.state, "ready", False):
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "starting"}
+    return {"status": "ready"}
@@ -11,10 +11,41 @@ class Settings(BaseSettings):
 
     app_name: str = "agentic-ai-core-framework"
     log_level: str = "INFO"
+    log_async: bool = True
+    log_queue_size: int = 10_000
+    log_sample_rates: dict[str, float] = {}
+    trace_slow_span_seconds: float | None = None
+    warmup_enabled: bool = True
+    debug_token: str | None = None
+    debug_profile_max_seconds: float = 30.0
+    loop_lag_interval_seconds: float = 0.1
+    loop_stall_threshold_seconds: float = 0.25
     allowed_origins: list[str] = ["*"]
     max_agents: int = 50
     task_timeout_seconds: float = 30.0
+    scheduler_workers: int = 32
+    scheduler_max_queue_size: int = 10_000
+    scheduler_sender_weights: dict[str, float] = {}
+    hedging_enabled: bool = False
+    hedge_percentile: float = 0.95
+    hedge_budget_ratio: float = 0.1
+    hedge_min_delay_seconds: float = 0.005
+    remote_agent_addresses: list[str] = []
+    transport_pool_size: int = 4
     short_term_memory_max_size: int = 1000
-    long_term_memory_path: str = "./data/agent_long_term_memory.json"
+    short_term_memory_max_bytes: int = 64 * 1024 * 1024
+    short_term_memory_ttl_seconds: float | None = None
+    memory_snapshot_dir: str | None = None
+    long_term_memory_backend: str = "log"
+    long_term_memory_path: str | None = None
+    tiered_memory_enabled: bool = False
+    memory_consistency: str = "write_behind"
+    memory_flush_interval_seconds: float = 0.05
+    memory_flush_batch_size: int = 256
+    memory_negative_ttl_seconds: float | None = 5.0
+    model_artifact_path: str = "./models/credit_model.joblib"
+    similar_applicants_k: int = 5
+    drift_half_life_rows: float | None = 50_000
+    drift_min_rows: float = 500
     chroma_collection_name: str = "agent_knowledge"
     prometheus_port: int = 9090
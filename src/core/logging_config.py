@@ -1,14 +1,57 @@
-"""Structured JSON logging configuration."""
+"""Structured JSON logging configuration.
+
+By default records are formatted and written to stdout on the calling
+thread.  ``configure_logging(asynchronous=True)`` instead puts a bounded
+queue on the hot path: callers only enqueue the record, and a background
+``QueueListener`` thread serialises and writes it.  When the queue is full
+the record is dropped rather than blocking the event loop.  High-volume
+per-message events can be sampled with ``sample_rates``; every dropped or
+sampled-out record is counted in ``agent_log_records_dropped_total``.
+"""
 from __future__ import annotations
 
+import atexit
+import copy
 import json
 import logging
+import logging.handlers
+import queue
+import random
 import sys
-from typing import Any
+from collections.abc import Callable, Mapping
+from typing import Any, cast
+
+from src.core.metrics import LOG_RECORDS_DROPPED
+
+try:
+    import orjson
+
+    def _dumps(obj: dict[str, Any]) -> str:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+except ImportError:  # pragma: no cover - orjson is optional
+
+    def _dumps(obj: dict[str, Any]) -> str:
+        return json.dumps(obj, default=str)
+
+
+# Attributes every LogRecord has; anything else came in through ``extra``.
+_RESERVED_ATTRS = frozenset(
+    logging.LogRecord("", 0, "", 0, "", None, None).__dict__
+) | {"message", "asctime", "taskName"}
+
+_dropped_full = LOG_RECORDS_DROPPED.labels(reason="queue_full")
+_dropped_sampled = LOG_RECORDS_DROPPED.labels(reason="sampled")
+
+_listener: logging.handlers.QueueListener | None = None
 
 
 class _JSONFormatter(logging.Formatter):
-    def format(self, record: logging.LogRecord) -> str:  # noqa: A003
+    def __init__(self, dumps: Callable[[dict[str, Any]], str] = _dumps) -> None:
+        super().__init__()
+        self._dumps = dumps
+
+    def format(self, record: logging.LogRecord) -> str:
         log_entry: dict[str, Any] = {
             "timestamp": self.formatTime(record, self.datefmt),
             "level": record.levelname,
@@ -17,27 +60,109 @@ class _JSONFormatter(logging.Formatter):
         }
         if record.exc_info:
             log_entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            log_entry["exc_info"] = record.exc_text
         # Merge any extra fields
         for key, value in record.__dict__.items():
-            if key not in {
-                "name", "msg", "args", "levelname", "levelno", "pathname",
-                "filename", "module", "exc_info", "exc_text", "stack_info",
-                "lineno", "funcName", "created", "msecs", "relativeCreated",
-                "thread", "threadName", "processName", "process", "message",
-                "taskName",
-            }:
+            if key not in _RESERVED_ATTRS:
                 log_entry[key] = value
-        return json.dumps(log_entry, default=str)
+        return self._dumps(log_entry)
+
+
+class _SamplingFilter(logging.Filter):
+    """Keeps each record whose message is in ``rates`` with that probability."""
+
+    def __init__(self, rates: Mapping[str, float]) -> None:
+        super().__init__()
+        self._rates = dict(rates)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = self._rates.get(record.msg) if isinstance(record.msg, str) else None
+        if rate is None or rate >= 1.0 or random.random() < rate:
+            return True
+        _dropped_sampled.inc()
+        return False
+
 
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Non-blocking ``QueueHandler`` that counts records it has to drop."""
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _dropped_full.inc()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve only what cannot cross threads safely: %-args and the
+        # traceback.  JSON formatting happens on the listener thread.  Work on
+        # a copy, as the stdlib does: other handlers still see the original.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class _Listener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # Block rather than fail when the queue is full at shutdown; None is
+        # the listener's stop sentinel.
+        cast("queue.Queue[Any]", self.queue).put(None)
+
+
+def _stop_listener() -> None:
+    """Drain the queue, then let the root logger write synchronously again."""
+    global _listener
+    if _listener is None:
+        return
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, _DroppingQueueHandler):
+            root.removeHandler(handler)
+            for writer in _listener.handlers:
+                writer.filters = list(handler.filters)
+                root.addHandler(writer)
+    _listener.stop()
+    _listener = None
+
+
+def configure_logging(
+    level: str = "INFO",
+    asynchronous: bool = False,
+    queue_size: int = 10_000,
+    sample_rates: Mapping[str, float] | None = None,
+) -> None:
+    global _listener
+    _stop_listener()
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(_JSONFormatter())
+
+    if asynchronous:
+        log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        handler: logging.Handler = _DroppingQueueHandler(log_queue)
+        _listener = _Listener(log_queue, stream_handler)
+        _listener.start()
+    else:
+        handler = stream_handler
+    if sample_rates:
+        handler.addFilter(_SamplingFilter(sample_rates))
 
-def configure_logging(level: str = "INFO") -> None:
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(_JSONFormatter())
     root = logging.getLogger()
     root.handlers.clear()
     root.addHandler(handler)
     root.setLevel(getattr(logging, level.upper(), logging.INFO))
 
 
+def shutdown_logging() -> None:
+    """Flush queued records and stop the background writer, if any."""
+    _stop_listener()
+
+
+atexit.register(_stop_listener)
+
+
 def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(name)
@@ -1,7 +1,24 @@
-"""Prometheus-compatible metrics definitions."""
+"""Prometheus-compatible metrics definitions.
+
+With several worker processes, set ``PROMETHEUS_MULTIPROC_DIR`` to an empty
+directory before they start: each worker then writes its samples to
+memory-mapped files there and ``/metrics`` (see ``make_metrics_app``)
+reports totals across all workers.  Gauges declare how they aggregate.
+"""
 from __future__ import annotations
 
-from prometheus_client import Counter, Histogram, Gauge
+import os
+
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    make_asgi_app,
+    multiprocess,
+)
+
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
 
 REQUEST_COUNT = Counter(
     "agent_api_requests_total",
@@ -18,6 +35,7 @@ REQUEST_LATENCY = Histogram(
 AGENT_COUNT = Gauge(
     "agent_registered_total",
     "Number of currently registered agents.",
+    multiprocess_mode="livesum",
 )
 
 TASK_SUCCESS_COUNT = Counter(
@@ -31,3 +49,128 @@ TASK_FAILURE_COUNT = Counter(
     "Number of failed tasks.",
     ["agent_type"],
 )
+
+SCHEDULER_QUEUE_WAIT = Histogram(
+    "agent_scheduler_queue_wait_seconds",
+    "Time a message spent queued in the dispatch scheduler.",
+    ["priority"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+SCHEDULER_QUEUE_DEPTH = Gauge(
+    "agent_scheduler_queue_depth",
+    "Number of messages waiting in the dispatch scheduler.",
+    ["priority"],
+    multiprocess_mode="livesum",
+)
+
+SCHEDULER_EXPIRED = Counter(
+    "agent_scheduler_expired_total",
+    "Number of messages whose deadline passed while queued, so they were never run.",
+    ["priority"],
+)
+
+HEDGE_FIRED = Counter(
+    "agent_hedge_fired_total",
+    "Number of duplicate requests sent to a second replica.",
+)
+
+HEDGE_WON = Counter(
+    "agent_hedge_won_total",
+    "Number of hedged requests where the duplicate answered first.",
+)
+
+HEDGE_BUDGET_EXHAUSTED = Counter(
+    "agent_hedge_budget_exhausted_total",
+    "Number of hedges skipped because the hedge budget was spent.",
+)
+
+MEMORY_HITS = Counter(
+    "agent_memory_hits_total",
+    "Number of memory lookups that found a live entry.",
+    ["backend"],
+)
+
+MEMORY_MISSES = Counter(
+    "agent_memory_misses_total",
+    "Number of memory lookups that found nothing.",
+    ["backend"],
+)
+
+MEMORY_EVICTIONS = Counter(
+    "agent_memory_evictions_total",
+    "Number of entries evicted to stay within a memory budget.",
+    ["backend", "reason"],
+)
+
+MEMORY_EXPIRATIONS = Counter(
+    "agent_memory_expirations_total",
+    "Number of entries dropped because their TTL elapsed.",
+    ["backend"],
+)
+
+LOG_RECORDS_DROPPED = Counter(
+    "agent_log_records_dropped_total",
+    "Number of log records not written: sampled out or dropped on a full queue.",
+    ["reason"],
+)
+
+HOP_LATENCY = Histogram(
+    "agent_hop_duration_seconds",
+    "Time spent in each hop of a request (inclusive of the hops it calls).",
+    ["hop"],
+    buckets=(
+        0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+        0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+    ),
+)
+
+EVENT_LOOP_LAG = Histogram(
+    "agent_event_loop_lag_seconds",
+    "How late the event loop ran the lag monitor's periodic heartbeat.",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+APP_IMPORT_SECONDS = Gauge(
+    "agent_app_import_seconds",
+    "Time taken to import the API application module.",
+    multiprocess_mode="livemax",
+)
+
+APP_READY_SECONDS = Gauge(
+    "agent_app_ready_seconds",
+    "Time from create_app() until the readiness probe passes, including warm-up.",
+    multiprocess_mode="livemax",
+)
+
+APP_READY = Gauge(
+    "agent_app_ready",
+    "1 once startup and warm-up have finished, 0 otherwise (summed over workers).",
+    multiprocess_mode="livesum",
+)
+
+DRIFT_PSI = Gauge(
+    "agent_drift_psi",
+    "Population stability index of recent scoring traffic against the training data.",
+    ["variable"],
+    multiprocess_mode="livemax",
+)
+
+
+def multiprocess_enabled() -> bool:
+    return bool(os.environ.get(MULTIPROC_DIR_ENV))
+
+
+def make_metrics_app():
+    """ASGI app serving ``/metrics``, aggregated across workers in multiprocess mode."""
+    if not multiprocess_enabled():
+        return make_asgi_app()
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return make_asgi_app(registry)
+
+
+def mark_process_dead(pid: int | None = None) -> None:
+    """Drop this worker's live gauges from the multiprocess aggregate on exit."""
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(pid if pid is not None else os.getpid())
@@ -1,16 +1,37 @@
 """Central orchestrator: wires registry, protocol, and agents together."""
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Callable
+from pathlib import Path
+
 from src.agents.coordinator_agent import CoordinatorAgent
+from src.agents.hedging import HedgePolicy
 from src.agents.registry import AgentRegistry
+from src.agents.scoring_agent import ScoringAgent
 from src.agents.task_agent import TaskAgent
 from src.core.config import Settings
 from src.core.logging_config import get_logger
+from src.core.scheduler import DispatchScheduler
+from src.memory.base_memory import BaseMemory
+from src.memory.log_structured import LogStructuredMemory
+from src.memory.long_term import LongTermMemory
+from src.memory.short_term import ShortTermMemory
+from src.memory.sqlite_memory import SQLiteMemory
+from src.memory.tiered import ConsistencyMode, TieredMemory
 from src.protocol.a2a_protocol import A2AProtocol
-from src.protocol.message_schema import A2AMessage, AgentResponse
+from src.protocol.message_schema import A2AMessage, AgentResponse, MessageType
+from src.protocol.socket_transport import SocketTransport
+from src.protocol.transport import BaseTransport, InProcessTransport
 
 logger = get_logger(__name__)
 
+LONG_TERM_BACKENDS: dict[str, Callable[..., BaseMemory]] = {
+    "json": LongTermMemory,
+    "log": LogStructuredMemory,
+    "sqlite": SQLiteMemory,
+}
+
 
 class Orchestrator:
     """
@@ -21,26 +42,124 @@ class Orchestrator:
     def __init__(self, settings: Settings | None = None) -> None:
         self._settings = settings or Settings()
         self.registry = AgentRegistry()
-        self._protocol = A2AProtocol(self.registry)
+        self._transport = self._build_transport()
+        self._protocol = A2AProtocol(self.registry, transport=self._transport)
+        self._scheduler = DispatchScheduler(
+            self._dispatch_now,
+            workers=self._settings.scheduler_workers,
+            max_queue_size=self._settings.scheduler_max_queue_size,
+            sender_weights=self._settings.scheduler_sender_weights,
+            max_queue_wait=self._settings.task_timeout_seconds,
+        )
+
+    def _build_transport(self) -> BaseTransport:
+        if not self._settings.remote_agent_addresses:
+            return InProcessTransport()
+        return SocketTransport(pool_size=self._settings.transport_pool_size)
+
+    def _build_long_term_memory(self) -> BaseMemory:
+        """Durable store chosen by ``long_term_memory_backend``; each has its own default path."""
+        backend = LONG_TERM_BACKENDS.get(self._settings.long_term_memory_backend)
+        if backend is None:
+            raise ValueError(
+                f"Unknown long_term_memory_backend '{self._settings.long_term_memory_backend}'; "
+                f"expected one of {sorted(LONG_TERM_BACKENDS)}"
+            )
+        if self._settings.long_term_memory_path is None:
+            return backend()
+        return backend(self._settings.long_term_memory_path)
+
+    def _build_task_memory(self) -> BaseMemory:
+        short_term = ShortTermMemory(
+            max_size=self._settings.short_term_memory_max_size,
+            max_bytes=self._settings.short_term_memory_max_bytes,
+            default_ttl=self._settings.short_term_memory_ttl_seconds,
+        )
+        if not self._settings.tiered_memory_enabled:
+            return short_term
+        return TieredMemory(
+            front=short_term,
+            back=self._build_long_term_memory(),
+            mode=ConsistencyMode(self._settings.memory_consistency),
+            flush_interval=self._settings.memory_flush_interval_seconds,
+            flush_batch_size=self._settings.memory_flush_batch_size,
+            negative_ttl=self._settings.memory_negative_ttl_seconds,
+        )
 
     async def setup(self) -> None:
         """Initialise and register default agents."""
-        coordinator = CoordinatorAgent(registry=self.registry)
-        task_agent = TaskAgent()
+        hedge_policy = None
+        if self._settings.hedging_enabled:
+            hedge_policy = HedgePolicy(
+                percentile=self._settings.hedge_percentile,
+                budget_ratio=self._settings.hedge_budget_ratio,
+                min_delay_seconds=self._settings.hedge_min_delay_seconds,
+            )
+        coordinator = CoordinatorAgent(registry=self.registry, hedge_policy=hedge_policy)
+        snapshot_path = None
+        if self._settings.memory_snapshot_dir:
+            snapshot_path = str(Path(self._settings.memory_snapshot_dir) / "task_agent.snap")
+        task_agent = TaskAgent(memory=self._build_task_memory(), snapshot_path=snapshot_path)
 
         await self.registry.register(coordinator)
         await self.registry.register(task_agent)
+        if Path(self._settings.model_artifact_path).exists():
+            await self.registry.register(
+                ScoringAgent(
+                    self._settings.model_artifact_path,
+                    neighbours=self._settings.similar_applicants_k,
+                    drift_half_life_rows=self._settings.drift_half_life_rows,
+                    drift_min_rows=self._settings.drift_min_rows,
+                )
+            )
+        if isinstance(self._transport, SocketTransport):
+            for address in self._settings.remote_agent_addresses:
+                await self._transport.register_remote_agents(self.registry, address)
+        await self._scheduler.start()
 
         logger.info(
             "orchestrator_setup_complete",
             extra={"registered_count": self.registry.count()},
         )
 
+    async def warm_up(self) -> None:
+        """
+        Let every agent load what it needs, then push one health check
+        through the scheduler, protocol and transport so the first real
+        request does not pay for lazy initialisation.
+        """
+        agents = self.registry.all_agents()
+        results = await asyncio.gather(
+            *(agent.warm_up() for agent in agents), return_exceptions=True
+        )
+        for agent, result in zip(agents, results):
+            if isinstance(result, Exception):
+                logger.warning(
+                    "agent_warm_up_failed",
+                    extra={"agent_id": agent.agent_id, "error": str(result)},
+                )
+        response = await self.dispatch(
+            A2AMessage(
+                sender_id="orchestrator",
+                message_type=MessageType.HEALTH_CHECK,
+            )
+        )
+        if not response.success:
+            logger.warning("orchestrator_warm_up_dispatch_failed", extra={"error": response.error})
+
     async def teardown(self) -> None:
+        await self._scheduler.stop()
         await self.registry.shutdown_all()
+        await self._transport.close()
         logger.info("orchestrator_teardown_complete")
 
     async def dispatch(self, message: A2AMessage) -> AgentResponse:
+        """Queue a message by priority; dispatch inline when the scheduler is disabled."""
+        if self._settings.scheduler_workers <= 0:
+            return await self._dispatch_now(message)
+        return await self._scheduler.submit(message)
+
+    async def _dispatch_now(self, message: A2AMessage) -> AgentResponse:
         return await self._protocol.dispatch(
             message, timeout=self._settings.task_timeout_seconds
         )
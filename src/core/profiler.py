@@ -0,0 +1,212 @@
+"""In-process diagnostics for a running service.
+
+``SamplingProfiler`` periodically snapshots every thread's Python stack via
+``sys._current_frames()`` and aggregates them into collapsed stacks (the
+``a;b;c count`` format read by flamegraph.pl and speedscope).  Nothing is
+hooked into the interpreter, so the cost is one stack walk per thread per
+sample and only while a profile is running.
+
+``task_stacks`` dumps the await chain of every asyncio task, and
+``LoopLagMonitor`` measures event-loop scheduling lag.  When the loop stalls,
+its watchdog thread captures the loop thread's stack, which names the
+handler that is blocking it.
+"""
+from __future__ import annotations
+
+import asyncio
+import collections
+import os
+import sys
+import threading
+import time
+from typing import Any
+
+from src.core.logging_config import get_logger
+from src.core.metrics import EVENT_LOOP_LAG
+
+logger = get_logger(__name__)
+
+_labels: dict[Any, str] = {}
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    label = _labels.get(code)
+    if label is None:
+        name = getattr(code, "co_qualname", code.co_name)
+        label = _labels[code] = f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    return label
+
+
+def _stack(frame, max_depth: int) -> list[str]:
+    """Labels from outermost to innermost frame."""
+    labels: list[str] = []
+    while frame is not None and len(labels) < max_depth:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+class SamplingProfiler:
+    """Statistical profiler over all (or selected) Python threads."""
+
+    def __init__(self, interval: float = 0.005, max_depth: int = 128) -> None:
+        self.interval = interval
+        self.max_depth = max_depth
+
+    def sample(
+        self, duration: float, thread_ids: set[int] | None = None
+    ) -> collections.Counter:
+        """
+        Sample for ``duration`` seconds and return collapsed-stack counts.
+
+        Blocks the calling thread, so run it off the event loop (e.g. with
+        ``asyncio.to_thread``).  The sampling thread excludes itself.
+        """
+        me = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        counts: collections.Counter = collections.Counter()
+        deadline = time.perf_counter() + duration
+        while True:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == me or (thread_ids is not None and thread_id not in thread_ids):
+                    continue
+                if thread_id not in names:  # Started after sampling began.
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                thread = names.get(thread_id, str(thread_id))
+                counts[";".join([thread, *_stack(frame, self.max_depth)])] += 1
+            if time.perf_counter() >= deadline:
+                return counts
+            time.sleep(self.interval)
+
+
+def collapse(counts: collections.Counter) -> str:
+    """Render counts as collapsed stacks, one ``stack count`` line each."""
+    return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
+
+
+def task_stacks(max_depth: int = 64) -> list[dict[str, Any]]:
+    """Await chain of every task on the running loop, outermost frame first."""
+    dumps = []
+    for task in asyncio.all_tasks():
+        stack: list[str] = []
+        coro: Any = task.get_coro()
+        while coro is not None and len(stack) < max_depth:
+            frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+            if frame is not None:
+                stack.append(f"{_frame_label(frame)} line {frame.f_lineno}")
+            coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+        dumps.append(
+            {
+                "name": task.get_name(),
+                "coro": getattr(task.get_coro(), "__qualname__", repr(task.get_coro())),
+                "done": task.done(),
+                "stack": stack,
+            }
+        )
+    return dumps
+
+
+class LoopLagMonitor:
+    """
+    Tracks how late the event loop runs a periodic callback.
+
+    A heartbeat task sleeps ``interval`` and records how much longer than
+    that it took to wake up (``agent_event_loop_lag_seconds``).  A watchdog
+    thread notices when no heartbeat has arrived for ``stall_threshold``
+    beyond the interval and records the loop thread's stack once per stall.
+    """
+
+    def __init__(
+        self, interval: float = 0.1, stall_threshold: float = 0.25, history: int = 32
+    ) -> None:
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self._lags: collections.deque[float] = collections.deque(maxlen=1024)
+        self._stalls: collections.deque[dict[str, Any]] = collections.deque(maxlen=history)
+        self._max_lag = 0.0
+        self._last_beat = time.monotonic()
+        self._loop_thread: int | None = None
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopping = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._loop_thread = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._heartbeat(), name="loop-lag-monitor")
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-lag-watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join)
+            self._watchdog = None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - started - self.interval)
+            self._last_beat = time.monotonic()
+            self._lags.append(lag)
+            self._max_lag = max(self._max_lag, lag)
+            EVENT_LOOP_LAG.observe(lag)
+
+    def _watch(self) -> None:
+        captured_for = None
+        loop_thread = self._loop_thread
+        if loop_thread is None:
+            return  # Started before the loop recorded its thread.
+        while not self._stopping.wait(self.interval / 2):
+            last_beat = self._last_beat
+            stalled_for = time.monotonic() - last_beat - self.interval
+            if stalled_for < self.stall_threshold or captured_for == last_beat:
+                continue
+            frame = sys._current_frames().get(loop_thread)
+            if frame is None:
+                continue
+            captured_for = last_beat
+            stack = _stack(frame, 128)
+            self._stalls.append(
+                {"detected_at": time.time(), "stalled_seconds": round(stalled_for, 6), "stack": stack}
+            )
+            logger.warning(
+                "event_loop_stall",
+                extra={"stalled_seconds": round(stalled_for, 6), "frame": stack[-1] if stack else None},
+            )
+
+    def snapshot(self) -> dict[str, Any]:
+        lags = sorted(self._lags)
+
+        def quantile(q: float) -> float | None:
+            return lags[min(len(lags) - 1, int(q * len(lags)))] if lags else None
+
+        return {
+            "running": self.running,
+            "interval_seconds": self.interval,
+            "samples": len(lags),
+            "last_lag_seconds": self._lags[-1] if self._lags else None,
+            "p50_lag_seconds": quantile(0.5),
+            "p99_lag_seconds": quantile(0.99),
+            "max_lag_seconds": self._max_lag,
+            "stalls": list(self._stalls),
+        }
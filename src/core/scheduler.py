@@ -0,0 +1,218 @@
+"""Priority-aware dispatch scheduler with per-sender weighted fair queuing.
+
+Sits between the API and the A2A protocol.  Messages are queued by their
+``Priority`` class; higher classes are always drained first.  Inside a
+class, senders share the workers by start-time fair queuing, so one bulk
+client flooding the queue cannot push everybody else's requests back.  A
+bounded pool of worker tasks drains the queues and the time each message
+spent waiting is exported per class.
+
+Each message gets a deadline when it is submitted: its ``ttl_seconds``,
+capped by ``max_queue_wait``.  A message still queued past its deadline is
+answered with a timeout error instead of being run.
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+from src.core.logging_config import get_logger
+from src.core.metrics import (
+    SCHEDULER_EXPIRED,
+    SCHEDULER_QUEUE_DEPTH,
+    SCHEDULER_QUEUE_WAIT,
+)
+from src.protocol.message_schema import A2AMessage, AgentResponse, Priority
+
+logger = get_logger(__name__)
+
+DispatchHandler = Callable[[A2AMessage], Awaitable[AgentResponse]]
+
+# Drain order: a lower index is always served first.
+PRIORITY_ORDER: tuple[Priority, ...] = (Priority.INTERACTIVE, Priority.NORMAL, Priority.BULK)
+
+
+@dataclass(order=True)
+class _Entry:
+    tag: float
+    seq: int
+    message: A2AMessage = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    deadline: float = field(compare=False)
+
+
+class _FairQueue:
+    """One priority class: a heap ordered by per-sender virtual start tags."""
+
+    def __init__(self, sender_weights: dict[str, float]) -> None:
+        self._heap: list[_Entry] = []
+        self._weights = sender_weights
+        self._last_finish: dict[str, float] = {}
+        self._vtime = 0.0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, entry: _Entry) -> None:
+        sender = entry.message.sender_id
+        start = max(self._vtime, self._last_finish.get(sender, 0.0))
+        self._last_finish[sender] = start + 1.0 / self._weights.get(sender, 1.0)
+        entry.tag = start
+        heapq.heappush(self._heap, entry)
+
+    def pop(self) -> _Entry:
+        entry = heapq.heappop(self._heap)
+        self._vtime = entry.tag
+        if not self._heap:
+            # Idle class: forget history so returning senders are not penalised.
+            self._last_finish.clear()
+        return entry
+
+
+class DispatchScheduler:
+    """Bounded worker pool draining per-priority, per-sender fair queues."""
+
+    def __init__(
+        self,
+        handler: DispatchHandler,
+        workers: int = 32,
+        max_queue_size: int = 10_000,
+        sender_weights: dict[str, float] | None = None,
+        max_queue_wait: float | None = None,
+    ) -> None:
+        invalid = {s: w for s, w in (sender_weights or {}).items() if not w > 0}
+        if invalid:
+            raise ValueError(f"sender weights must be > 0, got {invalid}")
+        self._handler = handler
+        self._num_workers = workers
+        self._max_queue_size = max_queue_size
+        self._max_queue_wait = max_queue_wait
+        self._queues = {p: _FairQueue(sender_weights or {}) for p in PRIORITY_ORDER}
+        self._size = 0
+        self._seq = itertools.count()
+        # Created in ``start``, on the loop that runs the workers.
+        self._ready = asyncio.Semaphore(0)
+        self._workers: list[asyncio.Task] = []
+        self._wait_metric = {
+            p: SCHEDULER_QUEUE_WAIT.labels(priority=p.value) for p in PRIORITY_ORDER
+        }
+        self._depth_metric = {
+            p: SCHEDULER_QUEUE_DEPTH.labels(priority=p.value) for p in PRIORITY_ORDER
+        }
+        self._expired_metric = {
+            p: SCHEDULER_EXPIRED.labels(priority=p.value) for p in PRIORITY_ORDER
+        }
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def qsize(self, priority: Priority | None = None) -> int:
+        if priority is None:
+            return self._size
+        return len(self._queues[priority])
+
+    async def start(self) -> None:
+        if self._workers:
+            return
+        self._ready = asyncio.Semaphore(0)
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"dispatch-worker-{i}")
+            for i in range(self._num_workers)
+        ]
+        logger.info("scheduler_started", extra={"workers": self._num_workers})
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        for priority, queue in self._queues.items():
+            while queue:
+                entry = queue.pop()
+                if not entry.future.done():
+                    entry.future.set_result(_error(entry.message, "Scheduler stopped."))
+            self._depth_metric[priority].set(0)
+        self._size = 0
+        logger.info("scheduler_stopped")
+
+    async def submit(self, message: A2AMessage) -> AgentResponse:
+        """Queue a message and wait for the response from whichever worker runs it."""
+        if not self._workers:
+            return _error(message, "Scheduler is not running.")
+        if self._size >= self._max_queue_size:
+            logger.warning(
+                "scheduler_queue_full",
+                extra={"message_id": message.message_id, "priority": message.priority},
+            )
+            return _error(message, "Scheduler queue is full.")
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        now = time.perf_counter()
+        wait = float(message.ttl_seconds)
+        if self._max_queue_wait is not None:
+            wait = min(wait, self._max_queue_wait)
+        entry = _Entry(0.0, next(self._seq), message, future, now, now + wait)
+        self._queues[message.priority].push(entry)
+        self._size += 1
+        self._depth_metric[message.priority].inc()
+        self._ready.release()
+        return await future
+
+    def _pop(self) -> tuple[Priority, _Entry]:
+        for priority in PRIORITY_ORDER:
+            queue = self._queues[priority]
+            if queue:
+                self._size -= 1
+                self._depth_metric[priority].dec()
+                return priority, queue.pop()
+        raise RuntimeError("Scheduler semaphore out of sync with queues.")
+
+    async def _worker(self) -> None:
+        while True:
+            await self._ready.acquire()
+            priority, entry = self._pop()
+            if entry.future.done():
+                # Caller went away (e.g. client disconnect) while queued.
+                continue
+            now = time.perf_counter()
+            waited = now - entry.enqueued_at
+            self._wait_metric[priority].observe(waited)
+            if now > entry.deadline:
+                self._expired_metric[priority].inc()
+                logger.warning(
+                    "scheduler_message_expired",
+                    extra={"message_id": entry.message.message_id, "waited": round(waited, 3)},
+                )
+                entry.future.set_result(
+                    _error(entry.message, f"Timed out after {waited:.3f}s in the scheduler queue.")
+                )
+                continue
+            try:
+                response = await self._handler(entry.message)
+            except asyncio.CancelledError:
+                if not entry.future.done():
+                    entry.future.set_result(_error(entry.message, "Scheduler stopped."))
+                raise
+            except Exception as exc:
+                logger.exception(
+                    "scheduler_handler_error",
+                    extra={"message_id": entry.message.message_id, "error": str(exc)},
+                )
+                response = _error(entry.message, str(exc))
+            if not entry.future.done():
+                entry.future.set_result(response)
+
+
+def _error(message: A2AMessage, error: str) -> AgentResponse:
+    return AgentResponse(
+        agent_id="scheduler",
+        message_id=message.message_id,
+        success=False,
+        error=error,
+    )
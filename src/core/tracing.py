@@ -0,0 +1,83 @@
+"""Lightweight per-hop latency spans.
+
+A request is followed hop by hop (API, protocol dispatch, coordinator
+delegation, task execution) using the ``correlation_id`` carried on the
+``A2AMessage``, so the same id ties the hops together even across a socket
+transport.  Each span costs two ``perf_counter`` calls and one observation
+on a pre-bound histogram child, cheap enough to leave on in production.
+Spans slower than the configured threshold are also logged with their
+correlation id, which points at the request to look at.
+"""
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Self
+
+from src.core.logging_config import get_logger
+from src.core.metrics import HOP_LATENCY, TASK_FAILURE_COUNT, TASK_SUCCESS_COUNT
+
+if TYPE_CHECKING:
+    from prometheus_client import Counter
+
+    from src.protocol.message_schema import A2AMessage
+
+logger = get_logger(__name__)
+
+HOPS = ("api", "protocol_dispatch", "coordinator_delegate", "task_execute")
+
+# Pre-bound children: ``.labels()`` does a lock and a dict lookup per call.
+_hop_latency = {hop: HOP_LATENCY.labels(hop=hop) for hop in HOPS}
+_task_success: dict[str, Counter] = {}
+_task_failure: dict[str, Counter] = {}
+
+_slow_span_seconds: float | None = None
+
+
+def configure_tracing(slow_span_seconds: float | None = None) -> None:
+    """Log spans slower than ``slow_span_seconds`` (``None`` disables)."""
+    global _slow_span_seconds
+    _slow_span_seconds = slow_span_seconds
+
+
+def ensure_correlation_id(message: A2AMessage) -> str:
+    """Start a trace at the edge: default the correlation id to the message id."""
+    if message.correlation_id is None:
+        message.correlation_id = message.message_id
+    return message.correlation_id
+
+
+def record_task_outcome(agent_type: str, success: bool) -> None:
+    children = _task_success if success else _task_failure
+    child = children.get(agent_type)
+    if child is None:
+        counter = TASK_SUCCESS_COUNT if success else TASK_FAILURE_COUNT
+        child = children[agent_type] = counter.labels(agent_type=agent_type)
+    child.inc()
+
+
+class span:
+    """Context manager timing one hop of ``message``'s journey."""
+
+    __slots__ = ("_hop", "_message", "_started")
+
+    def __init__(self, hop: str, message: A2AMessage) -> None:
+        self._hop = hop
+        self._message = message
+
+    def __enter__(self) -> Self:
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        elapsed = time.perf_counter() - self._started
+        _hop_latency[self._hop].observe(elapsed)
+        if _slow_span_seconds is not None and elapsed >= _slow_span_seconds:
+            logger.warning(
+                "slow_span",
+                extra={
+                    "hop": self._hop,
+                    "duration_seconds": round(elapsed, 6),
+                    "correlation_id": self._message.correlation_id,
+                    "message_id": self._message.message_id,
+                },
+            )
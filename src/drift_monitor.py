@@ -0,0 +1,159 @@
+"""Streaming population-stability monitoring for the scoring model.
+
+At export time ``ReferenceProfile.fit`` cuts each input feature, and the
+model's default probability, into quantile bins on the training data and
+stores the expected share per bin.  While serving, ``DriftMonitor`` drops
+each scored batch into the same bins (one ``searchsorted`` per variable and a
+single ``bincount``) and keeps only the bin counts.  The counts decay
+exponentially with a configurable half-life in rows, so they track recent
+traffic in constant memory.  The population stability index (PSI; called
+CSI for input characteristics) of each variable is exported as the
+``agent_drift_psi`` gauge.  Rule of thumb: < 0.1 stable, 0.1-0.25 moderate
+shift, > 0.25 significant shift.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Sequence
+
+import numpy as np
+
+from src.core.metrics import DRIFT_PSI
+
+SCORE = "score"
+
+# Floor for bin shares so empty bins do not make PSI infinite.
+_EPSILON = 1e-4
+
+
+class ReferenceProfile:
+    """Bin edges and expected bin shares for each monitored variable."""
+
+    def __init__(self, edges: dict[str, np.ndarray], expected: dict[str, np.ndarray]) -> None:
+        self.edges = {name: np.asarray(e, dtype=np.float64) for name, e in edges.items()}
+        self.expected = {name: np.asarray(p, dtype=np.float64) for name, p in expected.items()}
+
+    @property
+    def variables(self) -> list[str]:
+        return list(self.edges)
+
+    @classmethod
+    def fit(
+        cls,
+        features: np.ndarray,
+        feature_names: Sequence[str],
+        scores: np.ndarray | None = None,
+        bins: int = 10,
+    ) -> ReferenceProfile:
+        """Quantile bins per column of ``features`` (and of ``scores``)."""
+        features = np.asarray(features, dtype=np.float64)
+        columns = {name: features[:, i] for i, name in enumerate(feature_names)}
+        if scores is not None:
+            columns[SCORE] = np.asarray(scores, dtype=np.float64)
+        quantiles = np.linspace(0, 1, bins + 1)[1:-1]
+        edges, expected = {}, {}
+        for name, values in columns.items():
+            # Discrete variables (e.g. PAY_0) repeat quantiles; keep distinct edges.
+            edges[name] = np.unique(np.quantile(values, quantiles))
+            counts = np.bincount(
+                np.searchsorted(edges[name], values, side="right"),
+                minlength=len(edges[name]) + 1,
+            )
+            expected[name] = counts / counts.sum()
+        return cls(edges, expected)
+
+
+def psi(expected: np.ndarray, actual: np.ndarray) -> float:
+    """Population stability index between two vectors of bin shares."""
+    e = np.maximum(expected, _EPSILON)
+    a = np.maximum(actual, _EPSILON)
+    return float(np.sum((a - e) * np.log(a / e)))
+
+
+class DriftMonitor:
+    """
+    Exponentially decayed bin counts compared against a ``ReferenceProfile``.
+
+    ``update`` is thread-safe and cheap enough to call on every scored
+    batch; gauges are refreshed at most every ``publish_interval`` seconds
+    and only once ``min_rows`` (decayed) rows have been seen.
+    """
+
+    def __init__(
+        self,
+        reference: ReferenceProfile,
+        half_life_rows: float | None = 50_000,
+        min_rows: float = 500,
+        publish_interval: float = 1.0,
+    ) -> None:
+        self.reference = reference
+        self._names = reference.variables
+        sizes = [len(reference.edges[name]) + 1 for name in self._names]
+        # All variables share one flat count vector; variable i owns
+        # counts[offsets[i]:offsets[i + 1]].
+        self._offsets = np.concatenate([[0], np.cumsum(sizes)])
+        self._counts = np.zeros(self._offsets[-1], dtype=np.float64)
+        self._rows = 0.0
+        self._decay = 0.5 ** (1.0 / half_life_rows) if half_life_rows else 1.0
+        self._min_rows = min_rows
+        self._publish_interval = publish_interval
+        self._last_publish = float("-inf")
+        self._lock = threading.Lock()
+        self._gauges = {name: DRIFT_PSI.labels(variable=name) for name in self._names}
+
+    @property
+    def rows(self) -> float:
+        """Decayed number of rows currently represented in the counts."""
+        return self._rows
+
+    def update(self, features: np.ndarray, scores: np.ndarray | None = None) -> None:
+        """
+        Add a batch: ``features`` has one column per reference feature, in
+        the reference's order, and ``scores`` the model's probabilities.
+        """
+        features = np.atleast_2d(np.asarray(features, dtype=np.float64))
+        n = len(features)
+        if n == 0:
+            return
+        indices = []
+        for i, name in enumerate(self._names):
+            values = scores if name == SCORE else features[:, i]
+            if values is None:
+                continue
+            bins = np.searchsorted(self.reference.edges[name], values, side="right")
+            indices.append(bins + self._offsets[i])
+        batch = np.bincount(np.concatenate(indices), minlength=len(self._counts))
+        with self._lock:
+            if self._decay != 1.0:
+                factor = self._decay ** n
+                self._counts *= factor
+                self._rows *= factor
+            self._counts += batch
+            self._rows += n
+            publish = (
+                self._rows >= self._min_rows
+                and time.monotonic() - self._last_publish >= self._publish_interval
+            )
+            if publish:
+                self._last_publish = time.monotonic()
+        if publish:
+            self.publish()
+
+    def psi(self) -> dict[str, float]:
+        """Current PSI per variable (variables with no data are omitted)."""
+        with self._lock:
+            counts = self._counts.copy()
+        values = {}
+        for i, name in enumerate(self._names):
+            observed = counts[self._offsets[i]:self._offsets[i + 1]]
+            total = observed.sum()
+            if total > 0:
+                values[name] = psi(self.reference.expected[name], observed / total)
+        return values
+
+    def publish(self) -> dict[str, float]:
+        values = self.psi()
+        for name, value in values.items():
+            self._gauges[name].set(value)
+        return values
@@ -0,0 +1,287 @@
+"""In-house Newton (IRLS) solver for binary logistic regression.
+
+``NewtonLogisticRegression`` minimises the same objective as sklearn's
+``LogisticRegression`` (same ``C``, ``penalty`` and ``l1_ratio`` meaning, with
+an unpenalised intercept)::
+
+    C * sum_i s_i * logloss_i + (1 - l1_ratio) / 2 * ||w||^2 + l1_ratio * ||w||_1
+
+so its coefficients can be compared against sklearn directly.  Each
+iteration builds the exact gradient and Hessian in row blocks: one
+``X_b.T @ (X_b * w_b)`` GEMM per block, which uses multithreaded BLAS while
+keeping the weighted copy to ``block_rows`` rows.  Every row is sample
+weighted (``s_i``), e.g. to reweight accepted applicants for reject
+inference.  With ``l1_ratio == 0`` the step is a plain Newton solve;
+otherwise a proximal Newton step is taken, running coordinate descent on
+the quadratic model, which is cheap for the few features this pipeline
+uses.  Every step is backtracked on the full objective; if no step length
+decreases it enough, the fit stops there and is reported as not converged.
+
+It is a drop-in estimator for ``train_model`` and the ``ScoringAgent``:
+``fit`` / ``predict_proba`` / ``predict`` plus ``coef_``, ``intercept_``,
+``classes_`` and ``n_iter_``.  ``history_`` records, per iteration, the
+objective, gradient norm, step size and the time spent building the
+Hessian and in the whole iteration.
+"""
+from __future__ import annotations
+
+import time
+import warnings
+from typing import Any
+
+import numpy as np
+from scipy.special import expit
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.exceptions import ConvergenceWarning
+from threadpoolctl import threadpool_limits
+
+PENALTIES = ("l2", "elasticnet", None)
+
+# Armijo constant and maximum halvings for the backtracking line search.
+_ARMIJO = 1e-4
+_MAX_HALVINGS = 30
+
+
+def _blocked_newton_terms(
+    X: np.ndarray, y: np.ndarray, s: np.ndarray, theta: np.ndarray, block_rows: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Gradient and Hessian of the weighted log-loss over ``[X, 1]`` at ``theta``."""
+    n, d = X.shape
+    gradient = np.zeros(d + 1)
+    hessian = np.zeros((d + 1, d + 1))
+    w, b = theta[:d], theta[d]
+    weighted = np.empty((min(block_rows, n), d))
+    for start in range(0, n, block_rows):
+        stop = min(start + block_rows, n)
+        X_b = X[start:stop]
+        p = expit(X_b @ w + b)
+        s_b = s[start:stop]
+        r = s_b * (p - y[start:stop])
+        h = s_b * p * (1.0 - p)
+        scaled = np.multiply(X_b, h[:, None], out=weighted[: stop - start])
+        gradient[:d] += r @ X_b
+        gradient[d] += r.sum()
+        hessian[:d, :d] += X_b.T @ scaled
+        hessian[d, :d] += h @ X_b
+        hessian[d, d] += h.sum()
+    hessian[:d, d] = hessian[d, :d]
+    return gradient, hessian
+
+
+def _loss(X: np.ndarray, y: np.ndarray, s: np.ndarray, theta: np.ndarray) -> float:
+    """Weighted log-loss, with log(1 + e^z) as max(z, 0) + log1p(e^-|z|)."""
+    # In place, this is about 4x faster than np.logaddexp(0, z).
+    z = X @ theta[:-1] + theta[-1]
+    softplus = np.abs(z)
+    np.negative(softplus, out=softplus)
+    np.exp(softplus, out=softplus)
+    np.log1p(softplus, out=softplus)
+    softplus += np.maximum(z, 0.0)
+    return float(s @ softplus - (s * y) @ z)
+
+
+def _proximal_step(
+    gradient: np.ndarray, hessian: np.ndarray, theta: np.ndarray, l1: float, tol: float
+) -> np.ndarray:
+    """
+    Coordinate descent on ``g.d + d.H.d / 2 + l1 * ||w + d_w||_1``, where the
+    last coordinate (the intercept) is not penalised.
+    """
+    k = len(theta)
+    step = np.zeros(k)
+    Hd = np.zeros(k)
+    for _ in range(1000):
+        largest = 0.0
+        for j in range(k):
+            h = hessian[j, j]
+            if h <= 0.0:
+                continue
+            # Minimise over step[j] with the others fixed.
+            partial = gradient[j] + Hd[j] - h * step[j]
+            if j == k - 1:
+                new = -partial / h
+            else:
+                u = theta[j] - partial / h
+                new = np.sign(u) * max(abs(u) - l1 / h, 0.0) - theta[j]
+            delta = new - step[j]
+            if delta:
+                step[j] = new
+                Hd += delta * hessian[:, j]
+                largest = max(largest, abs(delta))
+        if largest <= tol:
+            break
+    return step
+
+
+class NewtonLogisticRegression(ClassifierMixin, BaseEstimator):
+    """
+    Binary logistic regression fitted by Newton's method (IRLS).
+
+    ``tol`` is the largest coefficient change that counts as converged.
+    ``warm_start`` starts from the previous ``coef_`` / ``intercept_``.
+    ``n_threads`` caps the BLAS thread pool during ``fit``; ``None`` leaves it
+    as configured.  ``block_rows`` is the row block for the Hessian GEMMs.
+    """
+
+    def __init__(
+        self,
+        C: float = 1.0,
+        penalty: str | None = "l2",
+        l1_ratio: float | None = None,
+        tol: float = 1e-8,
+        max_iter: int = 100,
+        warm_start: bool = False,
+        n_threads: int | None = None,
+        block_rows: int = 16_384,
+    ) -> None:
+        self.C = C
+        self.penalty = penalty
+        self.l1_ratio = l1_ratio
+        self.tol = tol
+        self.max_iter = max_iter
+        self.warm_start = warm_start
+        self.n_threads = n_threads
+        self.block_rows = block_rows
+
+    def _penalty_weights(self) -> tuple[float, float]:
+        """(l2, l1) multipliers on the coefficients, relative to ``C * loss``."""
+        if self.penalty not in PENALTIES:
+            raise ValueError(f"penalty must be one of {PENALTIES}, got {self.penalty!r}")
+        if self.penalty is None:
+            return 0.0, 0.0
+        if self.penalty == "l2":
+            return 1.0, 0.0
+        if self.l1_ratio is None or not 0.0 <= self.l1_ratio <= 1.0:
+            raise ValueError("elasticnet penalty needs 0 <= l1_ratio <= 1")
+        return 1.0 - self.l1_ratio, self.l1_ratio
+
+    def fit(
+        self, X: Any, y: Any, sample_weight: Any | None = None
+    ) -> NewtonLogisticRegression:
+        if self.C <= 0:
+            raise ValueError("C must be positive")
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim != 2:
+            raise ValueError("X must be 2-dimensional")
+        y = np.asarray(y)
+        self.classes_ = np.unique(y)
+        if len(self.classes_) != 2:
+            raise ValueError(f"need exactly two classes, got {len(self.classes_)}")
+        target = (y == self.classes_[1]).astype(np.float64)
+        s = (
+            np.ones(len(X))
+            if sample_weight is None
+            else np.asarray(sample_weight, dtype=np.float64)
+        )
+        if s.shape != (len(X),):
+            raise ValueError("sample_weight must have one entry per row")
+        l2, l1 = self._penalty_weights()
+        d = X.shape[1]
+        self.n_features_in_ = d
+
+        theta = np.zeros(d + 1)
+        coef = getattr(self, "coef_", None)
+        if self.warm_start and coef is not None and coef.shape == (1, d):
+            theta[:d] = coef[0]
+            theta[d] = getattr(self, "intercept_", np.zeros(1))[0]
+        ridge = np.full(d + 1, l2)
+        ridge[d] = 0.0
+
+        def objective(t: np.ndarray) -> float:
+            w = t[:d]
+            return (
+                self.C * _loss(X, target, s, t)
+                + 0.5 * l2 * float(w @ w)
+                + l1 * float(np.abs(w).sum())
+            )
+
+        self.history_ = []
+        self.converged_ = False
+        stalled = False
+        limits = threadpool_limits(self.n_threads, user_api="blas") if self.n_threads else None
+        try:
+            # The accepted line-search value is the next iteration's objective.
+            current = objective(theta)
+            for iteration in range(1, self.max_iter + 1):
+                started = time.perf_counter()
+                gradient, hessian = _blocked_newton_terms(X, target, s, theta, self.block_rows)
+                hessian_seconds = time.perf_counter() - started
+                gradient = self.C * gradient + ridge * theta
+                hessian = self.C * hessian + np.diag(ridge)
+
+                if l1 == 0.0:
+                    try:
+                        step = -np.linalg.solve(hessian, gradient)
+                    except np.linalg.LinAlgError:
+                        step = -np.linalg.lstsq(hessian, gradient, rcond=None)[0]
+                    decrease = float(gradient @ step)
+                else:
+                    step = _proximal_step(gradient, hessian, theta, l1, self.tol * 1e-2)
+                    w = theta[:d]
+                    decrease = float(gradient @ step) + l1 * float(
+                        np.abs(w + step[:d]).sum() - np.abs(w).sum()
+                    )
+
+                # Backtrack until the Armijo condition holds.  A step below
+                # ``tol`` is taken as is: at the optimum the objective change is
+                # rounding noise.
+                t = 1.0
+                if float(np.max(np.abs(step), initial=0.0)) <= self.tol:
+                    candidate, value = theta + step, current
+                else:
+                    for _ in range(_MAX_HALVINGS):
+                        candidate = theta + t * step
+                        value = objective(candidate)
+                        if value <= current + _ARMIJO * t * decrease:
+                            break
+                        t *= 0.5
+                    else:
+                        # No acceptable step: stay put and stop, unconverged.
+                        candidate, value, t, stalled = theta, current, 0.0, True
+                change = float(np.max(np.abs(candidate - theta), initial=0.0))
+                theta, current = candidate, value
+                self.history_.append(
+                    {
+                        "iteration": iteration,
+                        "objective": value,
+                        "gradient_norm": float(np.linalg.norm(gradient)),
+                        "step_size": t,
+                        "max_change": change,
+                        "hessian_seconds": hessian_seconds,
+                        "seconds": time.perf_counter() - started,
+                    }
+                )
+                if stalled:
+                    break
+                if change <= self.tol:
+                    self.converged_ = True
+                    break
+        finally:
+            if limits is not None:
+                limits.restore_original_limits()
+
+        if stalled:
+            warnings.warn(
+                f"Newton solver stopped at iteration {len(self.history_)}: the line search "
+                f"found no step that decreases the objective",
+                ConvergenceWarning,
+            )
+        elif not self.converged_:
+            warnings.warn(
+                f"Newton solver did not converge in {self.max_iter} iterations",
+                ConvergenceWarning,
+            )
+        self.coef_ = theta[:d].reshape(1, d)
+        self.intercept_ = theta[d:].copy()
+        self.n_iter_ = np.array([len(self.history_)])
+        return self
+
+    def decision_function(self, X: Any) -> np.ndarray:
+        return np.asarray(X, dtype=np.float64) @ self.coef_[0] + self.intercept_[0]
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        p = expit(self.decision_function(X))
+        return np.column_stack([1.0 - p, p])
+
+    def predict(self, X: Any) -> np.ndarray:
+        return self.classes_[(self.decision_function(X) > 0).astype(np.intp)]
@@ -1,5 +1,20 @@
 from .base_memory import BaseMemory
-from .short_term import ShortTermMemory
+from .log_structured import LogStructuredMemory
 from .long_term import LongTermMemory
+from .short_term import ShortTermMemory
+from .snapshot import SnapshotError, restore_snapshot, save_snapshot
+from .sqlite_memory import SQLiteMemory
+from .tiered import ConsistencyMode, TieredMemory
 
-__all__ = ["BaseMemory", "ShortTermMemory", "LongTermMemory"]
+__all__ = [
+    "BaseMemory",
+    "ConsistencyMode",
+    "LogStructuredMemory",
+    "LongTermMemory",
+    "SQLiteMemory",
+    "ShortTermMemory",
+    "SnapshotError",
+    "TieredMemory",
+    "restore_snapshot",
+    "save_snapshot",
+]
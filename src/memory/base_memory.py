@@ -2,7 +2,8 @@
 from __future__ import annotations
 
 import abc
-from typing import Any, Optional
+from collections.abc import AsyncIterator, Iterable, Mapping
+from typing import Any
 
 
 class BaseMemory(abc.ABC):
@@ -13,7 +14,7 @@ class BaseMemory(abc.ABC):
         """Persist a key-value pair."""
 
     @abc.abstractmethod
-    async def retrieve(self, key: str) -> Optional[Any]:
+    async def retrieve(self, key: str) -> Any | None:
         """Retrieve a value by key, returning None if not found."""
 
     @abc.abstractmethod
@@ -27,3 +28,29 @@ class BaseMemory(abc.ABC):
     @abc.abstractmethod
     async def exists(self, key: str) -> bool:
         """Return True if the key exists."""
+
+    @abc.abstractmethod
+    def scan(self, prefix: str = "") -> AsyncIterator[tuple[str, Any]]:
+        """Asynchronously iterate ``(key, value)`` pairs whose key starts with ``prefix``."""
+
+    async def store_many(self, items: Mapping[str, Any]) -> None:
+        """Persist several key-value pairs.  Backends override this to batch."""
+        for key, value in items.items():
+            await self.store(key, value)
+
+    async def retrieve_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """Retrieve several keys at once; keys that are not found are omitted."""
+        found = {}
+        for key in keys:
+            value = await self.retrieve(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    async def delete_many(self, keys: Iterable[str]) -> None:
+        """Delete several keys.  Backends override this to batch."""
+        for key in keys:
+            await self.delete(key)
+
+    async def close(self) -> None:
+        """Flush buffered writes and release resources.  No-op by default."""
@@ -0,0 +1,353 @@
+"""Log-structured long-term memory: append-only record log + in-memory index.
+
+Every mutation is appended to a single log file as a CRC-checked record;
+an in-memory ``key -> (offset, length)`` index, rebuilt by scanning the log
+on open, lets single-key reads do one positioned read regardless of how many
+keys are stored.  Writes are group-committed: records queue up while the
+previous batch is being written and fsynced in a worker thread, so many
+concurrent ``store`` calls share one ``fsync``.  Overwritten and deleted
+records are reclaimed by a background compaction that rewrites the live set
+to a new file and atomically swaps it in.
+
+Record layout (little endian)::
+
+    crc32 (u32) | key_len (u32) | value_len (u32) | op (u8) | key | value
+
+A torn or corrupt tail left by a crash is detected by the CRC and truncated
+on open.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import struct
+import zlib
+from collections import Counter
+from collections.abc import AsyncIterator, Iterable, Mapping
+from pathlib import Path
+from typing import Any
+
+from src.core.logging_config import get_logger
+from src.memory.base_memory import BaseMemory
+
+logger = get_logger(__name__)
+
+_CRC = struct.Struct("<I")
+_META = struct.Struct("<IIB")
+_HEADER_SIZE = _CRC.size + _META.size
+
+OP_PUT = 1
+OP_DELETE = 2
+
+_fsync = getattr(os, "fdatasync", os.fsync)
+
+
+def _encode_record(op: int, key: bytes, value: bytes) -> bytes:
+    body = _META.pack(len(key), len(value), op) + key + value
+    return _CRC.pack(zlib.crc32(body)) + body
+
+
+class LogStructuredMemory(BaseMemory):
+    """
+    Append-only, crash-safe persistent memory with O(1) single-key operations.
+
+    ``durable_writes=True`` makes ``store``/``delete`` return only after their
+    record is fsynced; with ``False`` they return once the record is queued
+    and durability follows with the next group commit.
+    """
+
+    def __init__(
+        self,
+        storage_path: str = "./data/agent_long_term_memory.log",
+        durable_writes: bool = True,
+        compaction_min_bytes: int = 4 * 1024 * 1024,
+        compaction_dead_ratio: float = 0.5,
+    ) -> None:
+        self._path = Path(storage_path)
+        self._durable_writes = durable_writes
+        self._compaction_min_bytes = compaction_min_bytes
+        self._compaction_dead_ratio = compaction_dead_ratio
+
+        self._index: dict[str, tuple[int, int]] = {}
+        self._dead_bytes = 0
+        self._fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o644)
+        self._end = self._recover()
+        self._durable_end = self._end
+
+        self._lock = asyncio.Lock()
+        self._pending: list[tuple[str, int, bytes]] = []
+        self._pending_values: dict[str, tuple[int, bytes]] = {}
+        self._batch_done: asyncio.Future | None = None
+        self._flush_task: asyncio.Task | None = None
+        self._compact_task: asyncio.Task | None = None
+        self._readers: Counter[int] = Counter()
+        self._retired_fds: set[int] = set()
+        self._write_error: OSError | None = None
+
+    # ------------------------------------------------------------------ open
+
+    def _recover(self) -> int:
+        """Rebuild the index from the log and truncate any torn tail."""
+        offset = 0
+        size = os.fstat(self._fd).st_size
+        with open(self._path, "rb") as fh:
+            while offset + _HEADER_SIZE <= size:
+                header = fh.read(_HEADER_SIZE)
+                (crc,) = _CRC.unpack_from(header)
+                key_len, value_len, op = _META.unpack_from(header, _CRC.size)
+                payload = fh.read(key_len + value_len)
+                if len(payload) < key_len + value_len or zlib.crc32(
+                    header[_CRC.size:] + payload
+                ) != crc:
+                    break
+                key = payload[:key_len].decode("utf-8")
+                record_len = _HEADER_SIZE + key_len + value_len
+                self._retire(key)
+                if op == OP_PUT:
+                    self._index[key] = (offset + _HEADER_SIZE + key_len, value_len)
+                else:
+                    self._dead_bytes += record_len
+                offset += record_len
+        if offset < size:
+            logger.warning(
+                "log_memory_truncated_tail",
+                extra={"path": str(self._path), "valid_bytes": offset, "file_bytes": size},
+            )
+            os.ftruncate(self._fd, offset)
+            _fsync(self._fd)
+        return offset
+
+    def _retire(self, key: str) -> None:
+        """Account the current record for ``key`` (if any) as dead space."""
+        old = self._index.pop(key, None)
+        if old is not None:
+            self._dead_bytes += _HEADER_SIZE + len(key.encode("utf-8")) + old[1]
+
+    # ---------------------------------------------------------------- writes
+
+    async def _append(self, ops: list[tuple[int, str, Any]]) -> None:
+        """Queue ``(op, key, value)`` records under one lock acquisition."""
+        encoded = []
+        for op, key, value in ops:
+            key_bytes = key.encode("utf-8")
+            value_bytes = b""
+            if op == OP_PUT:
+                value_bytes = json.dumps(value, default=str).encode("utf-8")
+            encoded.append((op, key, key_bytes, value_bytes))
+
+        async with self._lock:
+            if self._write_error is not None:
+                raise RuntimeError(
+                    f"Log is read-only after a failed write: {self._write_error}"
+                )
+            for op, key, key_bytes, value_bytes in encoded:
+                record = _encode_record(op, key_bytes, value_bytes)
+                offset = self._end
+                self._end += len(record)
+                self._retire(key)
+                self._pending_values.pop(key, None)
+                if op == OP_PUT:
+                    value_offset = offset + _HEADER_SIZE + len(key_bytes)
+                    self._index[key] = (value_offset, len(value_bytes))
+                    self._pending_values[key] = (offset, value_bytes)
+                else:
+                    self._dead_bytes += len(record)
+                self._pending.append((key, offset, record))
+            if self._batch_done is None:
+                self._batch_done = asyncio.get_running_loop().create_future()
+            batch_done = self._batch_done
+            if self._flush_task is None or self._flush_task.done():
+                self._flush_task = asyncio.create_task(self._flush_loop())
+
+        if self._durable_writes:
+            await asyncio.shield(batch_done)
+
+    async def _flush_loop(self) -> None:
+        while self._pending:
+            batch, batch_done = self._pending, self._batch_done
+            self._pending, self._batch_done = [], None
+            assert batch_done is not None  # Created with the first pending write.
+            data = b"".join(record for _, _, record in batch)
+            try:
+                await asyncio.to_thread(self._write_sync, data, self._durable_end)
+            except OSError as exc:
+                # Offsets already handed out no longer match the file: stop writing.
+                logger.exception("log_memory_write_failed", extra={"error": str(exc)})
+                self._write_error = exc
+                for waiter in (batch_done, self._batch_done):
+                    if waiter is not None:
+                        waiter.set_exception(exc)
+                        waiter.exception()  # Mark retrieved for non-durable writers.
+                self._pending, self._batch_done = [], None
+                return
+            self._durable_end += len(data)
+            for key, offset, _ in batch:
+                pending = self._pending_values.get(key)
+                if pending is not None and pending[0] == offset:
+                    del self._pending_values[key]
+            batch_done.set_result(None)
+        self._maybe_schedule_compaction()
+
+    def _write_sync(self, data: bytes, offset: int) -> None:
+        view = memoryview(data)
+        while view:
+            written = os.pwrite(self._fd, view, offset)
+            view = view[written:]
+            offset += written
+        _fsync(self._fd)
+
+    async def _drain(self) -> None:
+        """Wait until every queued record is on disk.  Caller holds ``_lock``."""
+        if self._flush_task is not None and not self._flush_task.done():
+            await asyncio.shield(self._flush_task)
+
+    # ------------------------------------------------------------ compaction
+
+    def _maybe_schedule_compaction(self) -> None:
+        if (
+            self._dead_bytes >= self._compaction_min_bytes
+            and self._dead_bytes >= self._compaction_dead_ratio * self._end
+            and (self._compact_task is None or self._compact_task.done())
+        ):
+            self._compact_task = asyncio.create_task(self.compact())
+
+    async def compact(self) -> None:
+        """Rewrite the live records to a fresh log and atomically swap it in."""
+        async with self._lock:
+            await self._drain()
+            before = self._end
+            await self._rewrite(dict(self._index))
+            end = self._end
+        logger.info(
+            "log_memory_compacted",
+            extra={"path": str(self._path), "bytes_before": before, "bytes_after": end},
+        )
+
+    async def _rewrite(self, index: dict[str, tuple[int, int]]) -> None:
+        """Swap in a new log holding ``index``'s records.  Caller holds ``_lock``."""
+        fd, new_index, end = await asyncio.to_thread(self._compact_sync, index)
+        old_fd, self._fd = self._fd, fd
+        self._index = new_index
+        self._end = self._durable_end = end
+        self._dead_bytes = 0
+        # In-flight reads keep using the old file until they finish.
+        self._close_when_unread(old_fd)
+
+    def _compact_sync(
+        self, index: dict[str, tuple[int, int]]
+    ) -> tuple[int, dict[str, tuple[int, int]], int]:
+        tmp_path = self._path.with_name(self._path.name + ".compact")
+        new_index: dict[str, tuple[int, int]] = {}
+        offset = 0
+        with open(tmp_path, "wb") as out:
+            for key, (value_offset, value_len) in index.items():
+                key_bytes = key.encode("utf-8")
+                value = os.pread(self._fd, value_len, value_offset)
+                record = _encode_record(OP_PUT, key_bytes, value)
+                out.write(record)
+                new_index[key] = (offset + _HEADER_SIZE + len(key_bytes), value_len)
+                offset += len(record)
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp_path, self._path)
+        dir_fd = os.open(self._path.parent, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+        return os.open(self._path, os.O_RDWR), new_index, offset
+
+    def _close_when_unread(self, fd: int) -> None:
+        if self._readers[fd]:
+            self._retired_fds.add(fd)
+        else:
+            os.close(fd)
+
+    # ------------------------------------------------------------ BaseMemory
+
+    async def store(self, key: str, value: Any) -> None:
+        await self._append([(OP_PUT, key, value)])
+
+    async def store_many(self, items: Mapping[str, Any]) -> None:
+        if items:
+            await self._append([(OP_PUT, k, v) for k, v in items.items()])
+
+    async def retrieve(self, key: str) -> Any | None:
+        return (await self.retrieve_many([key])).get(key)
+
+    async def retrieve_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        raw: dict[str, bytes] = {}
+        to_read: list[tuple[str, int, int]] = []
+        for key in keys:
+            pending = self._pending_values.get(key)
+            if pending is not None:
+                raw[key] = pending[1]
+            elif key in self._index:
+                to_read.append((key, *self._index[key]))
+        if to_read:
+            raw.update(await self._read_many(to_read))
+        return {key: json.loads(value) for key, value in raw.items()}
+
+    async def _read_many(self, locations: list[tuple[str, int, int]]) -> dict[str, bytes]:
+        """Positioned reads for many keys in one worker-thread hop, in file order."""
+        fd = self._fd
+        self._readers[fd] += 1
+        try:
+            return await asyncio.to_thread(
+                lambda: {
+                    key: os.pread(fd, length, offset)
+                    for key, offset, length in sorted(locations, key=lambda loc: loc[1])
+                }
+            )
+        finally:
+            self._readers[fd] -= 1
+            if not self._readers[fd]:
+                del self._readers[fd]
+                if fd in self._retired_fds:
+                    self._retired_fds.discard(fd)
+                    os.close(fd)
+
+    async def delete(self, key: str) -> None:
+        await self.delete_many([key])
+
+    async def delete_many(self, keys: Iterable[str]) -> None:
+        ops = [(OP_DELETE, key, None) for key in dict.fromkeys(keys) if key in self._index]
+        if ops:
+            await self._append(ops)
+
+    async def scan(
+        self, prefix: str = "", batch_size: int = 256
+    ) -> AsyncIterator[tuple[str, Any]]:
+        keys = [key for key in self._index if key.startswith(prefix)]
+        for start in range(0, len(keys), batch_size):
+            found = await self.retrieve_many(keys[start:start + batch_size])
+            for key, value in found.items():
+                yield key, value
+
+    async def clear(self) -> None:
+        async with self._lock:
+            await self._drain()
+            await self._rewrite({})
+
+    async def exists(self, key: str) -> bool:
+        return key in self._index
+
+    async def close(self) -> None:
+        async with self._lock:
+            await self._drain()
+        if self._compact_task is not None:
+            await asyncio.gather(self._compact_task, return_exceptions=True)
+        os.close(self._fd)
+        # Files replaced by compaction whose reads never finished.
+        for fd in self._retired_fds:
+            os.close(fd)
+        self._retired_fds.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "keys": len(self._index),
+            "file_bytes": self._end,
+            "dead_bytes": self._dead_bytes,
+            "pending_records": len(self._pending),
+        }
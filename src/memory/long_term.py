@@ -1,10 +1,11 @@
 """Long-term memory stub — can be backed by any persistent store."""
 from __future__ import annotations
 
-import json
 import asyncio
+import json
+from collections.abc import AsyncIterator, Iterable, Mapping
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any
 
 from src.memory.base_memory import BaseMemory
 
@@ -33,7 +34,7 @@ class LongTermMemory(BaseMemory):
             data[key] = value
             self._save(data)
 
-    async def retrieve(self, key: str) -> Optional[Any]:
+    async def retrieve(self, key: str) -> Any | None:
         async with self._lock:
             return self._load().get(key)
 
@@ -50,3 +51,28 @@ class LongTermMemory(BaseMemory):
     async def exists(self, key: str) -> bool:
         async with self._lock:
             return key in self._load()
+
+    async def store_many(self, items: Mapping[str, Any]) -> None:
+        async with self._lock:
+            data = self._load()
+            data.update(items)
+            self._save(data)
+
+    async def retrieve_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        async with self._lock:
+            data = self._load()
+        return {k: data[k] for k in keys if data.get(k) is not None}
+
+    async def delete_many(self, keys: Iterable[str]) -> None:
+        async with self._lock:
+            data = self._load()
+            for key in keys:
+                data.pop(key, None)
+            self._save(data)
+
+    async def scan(self, prefix: str = "") -> AsyncIterator[tuple[str, Any]]:
+        async with self._lock:
+            data = self._load()
+        for key, value in data.items():
+            if key.startswith(prefix):
+                yield key, value
@@ -1,47 +1,411 @@
-"""In-process short-term memory backed by a bounded dictionary."""
+"""In-process short-term memory: a lock-striped, TTL-aware, byte-bounded LRU."""
 from __future__ import annotations
 
+import abc
 import asyncio
+import heapq
+import sys
+import threading
+import time
 from collections import OrderedDict
-from typing import Any, Optional
+from collections.abc import AsyncIterator, Iterable, Mapping
+from typing import Any
 
+from src.core.metrics import (
+    MEMORY_EVICTIONS,
+    MEMORY_EXPIRATIONS,
+    MEMORY_HITS,
+    MEMORY_MISSES,
+)
 from src.memory.base_memory import BaseMemory
 
+# Each stripe keeps at least this many entries so the per-stripe LRU stays a
+# close approximation of a global LRU; small caches collapse to one stripe.
+_MIN_ENTRIES_PER_STRIPE = 64
+
+# The expiry heap is rebuilt from live entries once it holds more than this
+# many pairs per entry (stale pairs pile up on overwrite, delete and evict).
+_HEAP_SLACK = 2
+
+_hits = MEMORY_HITS.labels(backend="short_term")
+_misses = MEMORY_MISSES.labels(backend="short_term")
+_evicted_count = MEMORY_EVICTIONS.labels(backend="short_term", reason="max_size")
+_evicted_bytes = MEMORY_EVICTIONS.labels(backend="short_term", reason="max_bytes")
+_rejected_oversized = MEMORY_EVICTIONS.labels(backend="short_term", reason="oversized")
+_expired = MEMORY_EXPIRATIONS.labels(backend="short_term")
+
+
+def approx_size(value: Any, _depth: int = 0) -> int:
+    """Cheap recursive estimate of a value's in-memory footprint in bytes."""
+    size = sys.getsizeof(value)
+    if _depth >= 4:
+        return size
+    if isinstance(value, dict):
+        for k, v in value.items():
+            size += approx_size(k, _depth + 1) + approx_size(v, _depth + 1)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += approx_size(item, _depth + 1)
+    return size
+
+
+class LazyValue(abc.ABC):
+    """A stored value that is decoded on first access, e.g. from a snapshot."""
+
+    __slots__ = ()
+
+    @abc.abstractmethod
+    def decode(self) -> Any:
+        """Return the decoded value."""
+
+    @abc.abstractmethod
+    def nbytes(self) -> int:
+        """Size estimate used for the byte budget before decoding."""
+
+
+class _Entry:
+    __slots__ = ("expires_at", "size", "value")
+
+    def __init__(self, value: Any, size: int, expires_at: float | None) -> None:
+        self.value = value
+        self.size = size
+        self.expires_at = expires_at
+
+    def resolve(self) -> Any:
+        if isinstance(self.value, LazyValue):
+            self.value = self.value.decode()
+        return self.value
+
+
+class _ByteBudget:
+    """Bytes held by all stripes together, against the global ``max_bytes``."""
+
+    __slots__ = ("limit", "lock", "used")
+
+    def __init__(self, limit: int) -> None:
+        self.lock = threading.Lock()
+        self.used = 0
+        self.limit = limit
+
+    def add(self, delta: int) -> None:
+        with self.lock:
+            self.used += delta
+
+    @property
+    def exceeded(self) -> bool:
+        return self.used > self.limit
+
+
+class _Stripe:
+    """One independently locked LRU segment."""
+
+    __slots__ = ("budget", "byte_share", "bytes", "entries", "expiry_heap", "lock", "max_entries")
+
+    def __init__(
+        self, max_entries: int, byte_share: int = 0, budget: _ByteBudget | None = None
+    ) -> None:
+        self.lock = threading.Lock()
+        self.entries: OrderedDict[str, _Entry] = OrderedDict()
+        self.bytes = 0
+        self.max_entries = max_entries
+        # Bytes this stripe may hold before it is the first to give some back;
+        # it can borrow beyond that while the global budget has room.
+        self.byte_share = byte_share
+        self.budget = budget
+        # (expires_at, key) pairs; stale pairs are skipped when popped.
+        self.expiry_heap: list[tuple[float, str]] = []
+
+    def _account(self, delta: int) -> None:
+        self.bytes += delta
+        if self.budget is not None:
+            self.budget.add(delta)
+
+    def put(self, key: str, entry: _Entry) -> None:
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self._account(-old.size)
+        budget = self.budget
+        if budget is not None and entry.size > budget.limit:
+            # Could never fit: skip it rather than flush the cache for nothing.
+            # The old value (if any) is dropped too, so it is not served stale.
+            _rejected_oversized.inc()
+            return
+        self.entries[key] = entry
+        self._account(entry.size)
+        if entry.expires_at is not None:
+            heapq.heappush(self.expiry_heap, (entry.expires_at, key))
+            if len(self.expiry_heap) > _HEAP_SLACK * len(self.entries):
+                self._rebuild_expiry_heap()
+        while len(self.entries) > self.max_entries:
+            self._evict_oldest()
+            _evicted_count.inc()
+        # Over budget: give back what this stripe holds beyond its share first,
+        # never the entry just stored.  ``ShortTermMemory`` reclaims the rest.
+        while (
+            budget is not None
+            and budget.exceeded
+            and self.bytes > self.byte_share
+            and len(self.entries) > 1
+        ):
+            self._evict_oldest()
+            _evicted_bytes.inc()
+
+    def get(self, key: str, now: float) -> _Entry | None:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at is not None and entry.expires_at <= now:
+            self.remove(key)
+            _expired.inc()
+            return None
+        self.entries.move_to_end(key)
+        return entry
+
+    def remove(self, key: str) -> None:
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self._account(-entry.size)
+
+    def _rebuild_expiry_heap(self) -> None:
+        self.expiry_heap = [
+            (e.expires_at, k) for k, e in self.entries.items() if e.expires_at is not None
+        ]
+        heapq.heapify(self.expiry_heap)
+
+    def _evict_oldest(self) -> None:
+        _, entry = self.entries.popitem(last=False)
+        self._account(-entry.size)
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.expiry_heap.clear()
+        self._account(-self.bytes)
+
+    def expire(self, now: float) -> int:
+        expired = 0
+        heap = self.expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            entry = self.entries.get(key)
+            if entry is not None and entry.expires_at == expires_at:
+                self.remove(key)
+                expired += 1
+        return expired
+
 
 class ShortTermMemory(BaseMemory):
     """
-    Fast, in-process memory with an optional max-size eviction policy (LRU).
-    Suitable for within-session context.
+    Fast, in-process memory with LRU eviction by entry count and by
+    approximate byte size, plus optional per-key TTLs.
+
+    Keys are spread over independently locked stripes so concurrent callers
+    (including worker threads) rarely contend; each stripe enforces its share
+    of ``max_size``, so eviction approximates a global LRU.  ``max_bytes`` is
+    one budget shared by all stripes: a stripe may hold more than its share
+    while there is room, and when the budget is exceeded the stripes over
+    their share give bytes back first.  Only a value larger than
+    ``max_bytes`` itself is not cached at all.
+    Expired entries are dropped lazily on access and, when
+    ``sweep_interval`` is set, by a periodic background sweep.  Suitable for
+    within-session context.
     """
 
-    def __init__(self, max_size: int = 1000) -> None:
-        self._store: OrderedDict[str, Any] = OrderedDict()
+    def __init__(
+        self,
+        max_size: int = 1000,
+        max_bytes: int | None = None,
+        default_ttl: float | None = None,
+        stripes: int = 16,
+        sweep_interval: float | None = 30.0,
+    ) -> None:
         self._max_size = max_size
-        self._lock = asyncio.Lock()
-
-    async def store(self, key: str, value: Any) -> None:
-        async with self._lock:
-            if key in self._store:
-                self._store.move_to_end(key)
-            self._store[key] = value
-            if len(self._store) > self._max_size:
-                self._store.popitem(last=False)
-
-    async def retrieve(self, key: str) -> Optional[Any]:
-        async with self._lock:
-            value = self._store.get(key)
-            if value is not None:
-                self._store.move_to_end(key)
-            return value
+        self._max_bytes = max_bytes
+        self._default_ttl = default_ttl
+        self._sweep_interval = sweep_interval
+        self._sweeper: asyncio.Task | None = None
+
+        count = max(1, min(stripes, max_size // _MIN_ENTRIES_PER_STRIPE))
+        self._budget = _ByteBudget(max_bytes) if max_bytes is not None else None
+        self._stripes = [
+            _Stripe(
+                max_entries=_share(max_size, count, i),
+                byte_share=_share(max_bytes, count, i) if max_bytes is not None else 0,
+                budget=self._budget,
+            )
+            for i in range(count)
+        ]
+
+    def _stripe(self, key: str) -> _Stripe:
+        return self._stripes[hash(key) % len(self._stripes)]
+
+    def _put(self, key: str, entry: _Entry) -> None:
+        stripe = self._stripe(key)
+        with stripe.lock:
+            stripe.put(key, entry)
+        if self._budget is not None and self._budget.exceeded:
+            self._reclaim(stripe)
+
+    def _reclaim(self, writer: _Stripe) -> None:
+        """Evict from the other stripes, those over their share first, until within budget."""
+        budget = self._budget
+        if budget is None:
+            return
+        for over_share_only in (True, False):
+            for stripe in self._stripes:
+                if stripe is writer:
+                    continue  # Already at or below its share, or holding only the new entry.
+                with stripe.lock:
+                    while budget.exceeded and stripe.entries and (
+                        not over_share_only or stripe.bytes > stripe.byte_share
+                    ):
+                        stripe._evict_oldest()
+                        _evicted_bytes.inc()
+                if not budget.exceeded:
+                    return
+
+    def _entry(self, value: Any, ttl: float | None) -> _Entry:
+        ttl = ttl if ttl is not None else self._default_ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        if expires_at is not None:
+            self._ensure_sweeper()
+        size = value.nbytes() if isinstance(value, LazyValue) else approx_size(value)
+        return _Entry(value, size, expires_at)
+
+    def _ensure_sweeper(self) -> None:
+        if self._sweep_interval is None or (self._sweeper and not self._sweeper.done()):
+            return
+        try:
+            self._sweeper = asyncio.get_running_loop().create_task(self._sweep_forever())
+        except RuntimeError:
+            pass  # No running loop (e.g. a worker thread); lazy expiry still applies.
+
+    async def _sweep_forever(self) -> None:
+        interval = self._sweep_interval or 0.0  # Only started when an interval is set.
+        while True:
+            await asyncio.sleep(interval)
+            self.expire()
+
+    def expire(self) -> int:
+        """Drop every expired entry now; returns how many were removed."""
+        now = time.monotonic()
+        removed = 0
+        for stripe in self._stripes:
+            with stripe.lock:
+                removed += stripe.expire(now)
+        if removed:
+            _expired.inc(removed)
+        return removed
+
+    async def store(self, key: str, value: Any, ttl: float | None = None) -> None:
+        self._put(key, self._entry(value, ttl))
+
+    async def store_many(self, items: Mapping[str, Any], ttl: float | None = None) -> None:
+        for key, value in items.items():
+            self._put(key, self._entry(value, ttl))
+
+    async def retrieve(self, key: str) -> Any | None:
+        stripe = self._stripe(key)
+        with stripe.lock:
+            entry = stripe.get(key, time.monotonic())
+            value = entry.resolve() if entry is not None else None
+        if entry is None:
+            _misses.inc()
+            return None
+        _hits.inc()
+        return value
+
+    async def retrieve_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        now = time.monotonic()
+        found = {}
+        requested = 0
+        for key in keys:
+            requested += 1
+            stripe = self._stripe(key)
+            with stripe.lock:
+                entry = stripe.get(key, now)
+                if entry is not None:
+                    found[key] = entry.resolve()
+        _hits.inc(len(found))
+        _misses.inc(requested - len(found))
+        return found
 
     async def delete(self, key: str) -> None:
-        async with self._lock:
-            self._store.pop(key, None)
+        stripe = self._stripe(key)
+        with stripe.lock:
+            stripe.remove(key)
+
+    async def delete_many(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            await self.delete(key)
 
     async def clear(self) -> None:
-        async with self._lock:
-            self._store.clear()
+        for stripe in self._stripes:
+            with stripe.lock:
+                stripe.clear()
 
     async def exists(self, key: str) -> bool:
-        async with self._lock:
-            return key in self._store
+        stripe = self._stripe(key)
+        with stripe.lock:
+            entry = stripe.entries.get(key)
+            return entry is not None and (
+                entry.expires_at is None or entry.expires_at > time.monotonic()
+            )
+
+    async def scan(self, prefix: str = "") -> AsyncIterator[tuple[str, Any]]:
+        now = time.monotonic()
+        for stripe in self._stripes:
+            with stripe.lock:
+                matches = [
+                    (k, e.resolve())
+                    for k, e in stripe.entries.items()
+                    if k.startswith(prefix) and (e.expires_at is None or e.expires_at > now)
+                ]
+            for item in matches:
+                yield item
+
+    async def close(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+
+    def entries(self) -> list[tuple[str, Any, float | None]]:
+        """
+        Live ``(key, value, ttl_remaining)`` triples, least recently used first.
+
+        Stripes keep independent LRU lists, so they are merged by relative
+        position to approximate a global order.  Values not yet decoded are
+        returned as-is (``LazyValue``).
+        """
+        now = time.monotonic()
+        ranked: list[tuple[float, tuple[str, Any, float | None]]] = []
+        for stripe in self._stripes:
+            with stripe.lock:
+                live = [
+                    (key, e.value, None if e.expires_at is None else e.expires_at - now)
+                    for key, e in stripe.entries.items()
+                    if e.expires_at is None or e.expires_at > now
+                ]
+            ranked.extend(((i + 1) / len(live), item) for i, item in enumerate(live))
+        ranked.sort(key=lambda pair: pair[0])
+        return [item for _, item in ranked]
+
+    def load(self, items: Iterable[tuple[str, Any, float | None]]) -> int:
+        """Insert ``(key, value, ttl)`` triples in order, oldest first; returns the count."""
+        count = 0
+        for key, value, ttl in items:
+            self._put(key, self._entry(value, ttl))
+            count += 1
+        return count
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": sum(len(s.entries) for s in self._stripes),
+            "bytes": sum(s.bytes for s in self._stripes),
+            "stripes": len(self._stripes),
+        }
+
+
+def _share(total: int, parts: int, index: int) -> int:
+    """Split ``total`` into ``parts`` near-equal integer shares."""
+    return total // parts + (1 if index < total % parts else 0)
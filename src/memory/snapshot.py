@@ -0,0 +1,156 @@
+"""Binary snapshots of ShortTermMemory for warm restarts.
+
+A ``TieredMemory`` is snapshotted through its cache tier: only the cached
+entries are written (negative-cache markers are skipped), and restoring
+warms the cache without writing to the backing store.
+
+A snapshot preserves LRU order and remaining TTLs.  Restoring memory-maps
+the file and decodes only the keys; each value stays as a slice of the
+mapping and is JSON-decoded the first time it is read, so even a large
+snapshot loads in a fraction of the time a full decode would take.
+
+File layout (little endian)::
+
+    header:  magic (8s) | version (u16) | count (u64) | index_len (u64) | written_at (f64)
+    index:   count x [ key_len (u32) | value_offset (u64) | value_len (u32) | expires_at (f64) | key ]
+    values:  concatenated JSON documents, addressed relative to the end of the index
+
+Entries are written least recently used first.  ``expires_at`` is wall-clock
+time (0 for no expiry) so TTLs keep counting down across the restart.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import mmap
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Any
+
+from src.core.logging_config import get_logger
+from src.memory.short_term import LazyValue, ShortTermMemory
+from src.memory.tiered import TieredMemory
+
+logger = get_logger(__name__)
+
+_MAGIC = b"STMSNAP\0"
+_VERSION = 1
+_HEADER = struct.Struct("<8sHQQd")
+_INDEX_ENTRY = struct.Struct("<IQId")
+
+
+class SnapshotError(ValueError):
+    """The snapshot file is truncated, corrupt or of an unknown version."""
+
+
+class _MappedJSON(LazyValue):
+    """A JSON document inside a memory-mapped snapshot, decoded on demand."""
+
+    __slots__ = ("_buf", "_end", "_start")
+
+    def __init__(self, buf: mmap.mmap, start: int, end: int) -> None:
+        self._buf = buf
+        self._start = start
+        self._end = end
+
+    def raw(self) -> bytes:
+        return self._buf[self._start:self._end]
+
+    def decode(self) -> Any:
+        return json.loads(self.raw())
+
+    def nbytes(self) -> int:
+        return self._end - self._start
+
+
+def _encode(value: Any) -> bytes:
+    if isinstance(value, _MappedJSON):
+        return value.raw()  # Never read since the last restore: copy it verbatim.
+    if isinstance(value, LazyValue):
+        value = value.decode()
+    return json.dumps(value, default=str).encode("utf-8")
+
+
+def _write_sync(path: Path, entries: list[tuple[str, Any, float | None]]) -> None:
+    now = time.time()
+    index = bytearray()
+    values: list[bytes] = []
+    offset = 0
+    for key, value, ttl in entries:
+        key_bytes = key.encode("utf-8")
+        blob = _encode(value)
+        expires_at = now + ttl if ttl is not None else 0.0
+        index += _INDEX_ENTRY.pack(len(key_bytes), offset, len(blob), expires_at)
+        index += key_bytes
+        values.append(blob)
+        offset += len(blob)
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as out:
+        out.write(_HEADER.pack(_MAGIC, _VERSION, len(entries), len(index), now))
+        out.write(index)
+        out.writelines(values)
+        out.flush()
+        os.fsync(out.fileno())
+    os.replace(tmp_path, path)
+
+
+def _read_sync(path: Path) -> list[tuple[str, Any, float | None]]:
+    with open(path, "rb") as fh:
+        if os.fstat(fh.fileno()).st_size < _HEADER.size:
+            raise SnapshotError(f"{path} is too short to be a snapshot")
+        buf = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, count, index_len, _ = _HEADER.unpack_from(buf, 0)
+    if magic != _MAGIC or version != _VERSION:
+        raise SnapshotError(f"{path} is not a version {_VERSION} snapshot")
+    values_start = _HEADER.size + index_len
+    if values_start > len(buf):
+        raise SnapshotError(f"{path} is truncated")
+
+    now = time.time()
+    items = []
+    pos = _HEADER.size
+    try:
+        for _ in range(count):
+            key_len, offset, length, expires_at = _INDEX_ENTRY.unpack_from(buf, pos)
+            pos += _INDEX_ENTRY.size
+            key = buf[pos:pos + key_len].decode("utf-8")
+            pos += key_len
+            start = values_start + offset
+            if pos > values_start or start + length > len(buf):
+                raise SnapshotError(f"{path} is truncated")
+            if expires_at and expires_at <= now:
+                continue
+            ttl = expires_at - now if expires_at else None
+            items.append((key, _MappedJSON(buf, start, start + length), ttl))
+    except (struct.error, UnicodeDecodeError) as exc:
+        raise SnapshotError(f"{path} has a corrupt index: {exc}") from exc
+    return items
+
+
+async def save_snapshot(memory: ShortTermMemory | TieredMemory, path: str | Path) -> int:
+    """Write ``memory``'s live entries to ``path`` atomically; returns the entry count."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    entries = memory.entries()
+    await asyncio.to_thread(_write_sync, path, entries)
+    logger.info("memory_snapshot_saved", extra={"path": str(path), "entries": len(entries)})
+    return len(entries)
+
+
+async def restore_snapshot(memory: ShortTermMemory | TieredMemory, path: str | Path) -> int:
+    """
+    Load a snapshot written by :func:`save_snapshot` into ``memory``.
+
+    Returns the number of entries restored; a missing file restores nothing.
+    Raises :class:`SnapshotError` if the file is not a valid snapshot.
+    """
+    path = Path(path)
+    if not path.exists():
+        return 0
+    items = await asyncio.to_thread(_read_sync, path)
+    restored = memory.load(items)
+    logger.info("memory_snapshot_restored", extra={"path": str(path), "entries": restored})
+    return restored
@@ -0,0 +1,241 @@
+"""Embedded SQLite (WAL mode) long-term memory with off-loop I/O.
+
+All SQLite calls run on a small dedicated thread pool, each thread owning
+its own connection, so the event loop never blocks on disk.  Concurrent
+``store``/``delete`` calls are coalesced: mutations queue up while the
+previous transaction commits and are then written together in a single
+transaction (group commit).
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+import threading
+from collections.abc import AsyncIterator, Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from src.core.logging_config import get_logger
+from src.memory.base_memory import BaseMemory
+
+logger = get_logger(__name__)
+
+_SCHEMA = "CREATE TABLE IF NOT EXISTS memory (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+
+_DELETE = object()
+
+# Stay well below SQLite's bound-parameter limit for ``IN (...)`` lookups.
+_MAX_IN_PARAMS = 500
+
+
+class SQLiteMemory(BaseMemory):
+    """
+    SQLite-backed persistent memory.  ``synchronous`` maps to SQLite's
+    ``PRAGMA synchronous`` (``NORMAL`` is durable across application crashes
+    in WAL mode; ``FULL`` also survives power loss).
+    """
+
+    def __init__(
+        self,
+        storage_path: str = "./data/agent_long_term_memory.sqlite3",
+        pool_size: int = 4,
+        synchronous: str = "NORMAL",
+    ) -> None:
+        self._path = storage_path
+        self._synchronous = synchronous
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=pool_size, thread_name_prefix="sqlite-memory"
+        )
+        # key -> JSON-encoded value, or _DELETE, for mutations not yet committed.
+        self._pending: dict[str, Any] = {}
+        self._batch_done: asyncio.Future | None = None
+        self._commit_task: asyncio.Task | None = None
+        conn = self._connect()
+        try:
+            conn.execute(_SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={self._synchronous}")
+        return conn
+
+    def _conn(self) -> sqlite3.Connection:
+        """The calling pool thread's own connection, opened on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    # ---------------------------------------------------------------- writes
+
+    async def _enqueue(self, mutations: Mapping[str, str | object]) -> None:
+        # The latest mutation per key wins inside a batch.
+        self._pending.update(mutations)
+        if self._batch_done is None:
+            self._batch_done = asyncio.get_running_loop().create_future()
+        batch_done = self._batch_done
+        if self._commit_task is None or self._commit_task.done():
+            self._commit_task = asyncio.create_task(self._commit_loop())
+        await asyncio.shield(batch_done)
+
+    async def _commit_loop(self) -> None:
+        while self._pending:
+            batch, batch_done = self._pending, self._batch_done
+            self._pending, self._batch_done = {}, None
+            assert batch_done is not None  # Created with the first pending write.
+            try:
+                await self._run(self._commit_sync, batch)
+            except Exception as exc:
+                logger.exception("sqlite_memory_commit_failed", extra={"error": str(exc)})
+                batch_done.set_exception(exc)
+                continue
+            batch_done.set_result(None)
+
+    def _commit_sync(self, batch: dict[str, Any]) -> None:
+        upserts = [(k, v) for k, v in batch.items() if v is not _DELETE]
+        deletes = [(k,) for k, v in batch.items() if v is _DELETE]
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if upserts:
+                conn.executemany(
+                    "INSERT INTO memory (key, value) VALUES (?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                    upserts,
+                )
+            if deletes:
+                conn.executemany("DELETE FROM memory WHERE key = ?", deletes)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    # ----------------------------------------------------------------- reads
+
+    def _retrieve_sync(self, key: str) -> str | None:
+        row = self._conn().execute("SELECT value FROM memory WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _retrieve_many_sync(self, keys: list[str]) -> dict[str, str]:
+        conn = self._conn()
+        found: dict[str, str] = {}
+        for start in range(0, len(keys), _MAX_IN_PARAMS):
+            chunk = keys[start:start + _MAX_IN_PARAMS]
+            placeholders = ",".join("?" * len(chunk))
+            found.update(
+                conn.execute(
+                    f"SELECT key, value FROM memory WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+            )
+        return found
+
+    def _scan_page_sync(
+        self, prefix: str, after: str | None, limit: int
+    ) -> list[tuple[str, str]]:
+        """One keyset-paginated page of the primary-key range covering ``prefix``."""
+        sql = "SELECT key, value FROM memory WHERE key >= ?"
+        params: list[Any] = [prefix]
+        if after is not None:
+            sql += " AND key > ?"
+            params.append(after)
+        upper = _prefix_upper_bound(prefix)
+        if upper is not None:
+            sql += " AND key < ?"
+            params.append(upper)
+        sql += " ORDER BY key LIMIT ?"
+        params.append(limit)
+        return self._conn().execute(sql, params).fetchall()
+
+    # ------------------------------------------------------------ BaseMemory
+
+    async def store(self, key: str, value: Any) -> None:
+        await self._enqueue({key: json.dumps(value, default=str)})
+
+    async def store_many(self, items: Mapping[str, Any]) -> None:
+        if items:
+            await self._enqueue({k: json.dumps(v, default=str) for k, v in items.items()})
+
+    async def retrieve(self, key: str) -> Any | None:
+        raw = self._pending.get(key)
+        if raw is None:
+            raw = await self._run(self._retrieve_sync, key)
+        elif raw is _DELETE:
+            return None
+        return json.loads(raw) if raw is not None else None
+
+    async def retrieve_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        raw: dict[str, str] = {}
+        missing = []
+        for key in keys:
+            pending = self._pending.get(key)
+            if pending is None:
+                missing.append(key)
+            elif pending is not _DELETE:
+                raw[key] = pending
+        if missing:
+            raw.update(await self._run(self._retrieve_many_sync, missing))
+        return {key: json.loads(value) for key, value in raw.items()}
+
+    async def delete(self, key: str) -> None:
+        await self._enqueue({key: _DELETE})
+
+    async def delete_many(self, keys: Iterable[str]) -> None:
+        mutations = dict.fromkeys(keys, _DELETE)
+        if mutations:
+            await self._enqueue(mutations)
+
+    async def scan(
+        self, prefix: str = "", page_size: int = 256
+    ) -> AsyncIterator[tuple[str, Any]]:
+        # Uncommitted writes are flushed first so the range query sees them.
+        await self._drain()
+        after: str | None = None
+        while True:
+            page = await self._run(self._scan_page_sync, prefix, after, page_size)
+            for key, raw in page:
+                yield key, json.loads(raw)
+            if len(page) < page_size:
+                return
+            after = page[-1][0]
+
+    async def clear(self) -> None:
+        await self._drain()
+        await self._run(lambda: self._conn().execute("DELETE FROM memory"))
+
+    async def exists(self, key: str) -> bool:
+        if key in self._pending:
+            return self._pending[key] is not _DELETE
+        return await self._run(self._retrieve_sync, key) is not None
+
+    async def _drain(self) -> None:
+        if self._commit_task is not None and not self._commit_task.done():
+            await asyncio.shield(self._commit_task)
+
+    async def close(self) -> None:
+        await self._drain()
+        self._executor.shutdown(wait=True)
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+
+
+def _prefix_upper_bound(prefix: str) -> str | None:
+    """Smallest string greater than every string starting with ``prefix``."""
+    while prefix and prefix[-1] == chr(0x10FFFF):
+        prefix = prefix[:-1]
+    if not prefix:
+        return None
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
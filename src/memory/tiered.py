@@ -0,0 +1,244 @@
+"""Tiered memory: ShortTermMemory as a read-through cache over a durable store.
+
+Reads are served from the in-process LRU when possible and fall through to
+the backing store on a miss, populating the cache on the way back.  Misses
+are cached too (negative caching, with a short TTL) so repeated lookups of
+absent keys do not hit the backing store.
+
+Writes go to the cache immediately.  In ``WRITE_THROUGH`` mode they are also
+written to the backing store before returning; in ``WRITE_BEHIND`` mode they
+are buffered and flushed in batches through ``store_many``/``delete_many``,
+either when the buffer fills up or after ``flush_interval`` seconds.  A
+failed background flush keeps the batch queued and is retried with
+exponential backoff.
+
+``clear`` flushes buffered writes, which were already acknowledged, and then
+only drops the cache; the backing store is never cleared through a
+``TieredMemory``.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+from collections.abc import AsyncIterator, Iterable, Mapping
+from enum import Enum
+from typing import Any
+
+from src.core.logging_config import get_logger
+from src.memory.base_memory import BaseMemory
+from src.memory.short_term import ShortTermMemory
+
+logger = get_logger(__name__)
+
+# Cached in the front tier to remember that the backing store has no value.
+_ABSENT = object()
+# Buffered in the write-behind queue for a pending delete.
+_DELETED = object()
+
+# Background flush retry delays, doubling from ``flush_interval`` (at least
+# the minimum) up to the maximum.
+_MIN_RETRY_DELAY = 0.01
+_MAX_RETRY_DELAY = 5.0
+
+
+class ConsistencyMode(str, Enum):
+    WRITE_THROUGH = "write_through"
+    WRITE_BEHIND = "write_behind"
+
+
+class TieredMemory(BaseMemory):
+    """Read-through, write-through/write-behind composite of two memories."""
+
+    def __init__(
+        self,
+        front: ShortTermMemory,
+        back: BaseMemory,
+        mode: ConsistencyMode = ConsistencyMode.WRITE_BEHIND,
+        flush_interval: float = 0.05,
+        flush_batch_size: int = 256,
+        max_pending: int = 10_000,
+        negative_ttl: float | None = 5.0,
+    ) -> None:
+        self._front = front
+        self._back = back
+        self._mode = ConsistencyMode(mode)
+        self._flush_interval = flush_interval
+        self._flush_batch_size = flush_batch_size
+        self._max_pending = max_pending
+        self._negative_ttl = negative_ttl
+        # Mutations not yet handed to the backing store, and the batch in flight.
+        self._dirty: dict[str, Any] = {}
+        self._in_flight: dict[str, Any] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flusher: asyncio.Task | None = None
+        # Keys written while each read-through is waiting on the backing store;
+        # those keys are not cached from the (possibly stale) lookup.
+        self._reads: dict[int, set[str]] = {}
+        self._read_ids = itertools.count()
+
+    @property
+    def pending_writes(self) -> int:
+        return len(self._dirty) + len(self._in_flight)
+
+    # ------------------------------------------------------------- snapshots
+
+    def entries(self) -> list[tuple[str, Any, float | None]]:
+        """Cached ``(key, value, ttl_remaining)`` triples, for ``save_snapshot``."""
+        return [item for item in self._front.entries() if item[1] is not _ABSENT]
+
+    def load(self, items: Iterable[tuple[str, Any, float | None]]) -> int:
+        """Warm the cache from ``restore_snapshot``; the backing store is not written."""
+        return self._front.load(items)
+
+    # ----------------------------------------------------------------- reads
+
+    def _buffered(self, key: str) -> Any:
+        """The not-yet-durable value for ``key``: a value, ``_DELETED`` or ``None``."""
+        if key in self._dirty:
+            return self._dirty[key]
+        return self._in_flight.get(key)
+
+    def _mark_written(self, keys: Iterable[str]) -> None:
+        for written in self._reads.values():
+            written.update(keys)
+
+    async def _read_through(self, keys: list[str]) -> dict[str, Any]:
+        """Load ``keys`` from the backing store and cache whatever no write raced with."""
+        read_id = next(self._read_ids)
+        written = self._reads[read_id] = set()
+        try:
+            loaded = await self._back.retrieve_many(keys)
+        finally:
+            del self._reads[read_id]
+        await self._front.store_many({k: v for k, v in loaded.items() if k not in written})
+        if self._negative_ttl is not None:
+            absent = [k for k in keys if k not in loaded and k not in written]
+            if absent:
+                await self._front.store_many(
+                    dict.fromkeys(absent, _ABSENT), ttl=self._negative_ttl
+                )
+        return loaded
+
+    async def retrieve(self, key: str) -> Any | None:
+        cached = await self._front.retrieve(key)
+        if cached is _ABSENT:
+            return None
+        if cached is not None:
+            return cached
+        buffered = self._buffered(key)
+        if buffered is _DELETED:
+            return None
+        if buffered is not None:
+            return buffered
+        return (await self._read_through([key])).get(key)
+
+    async def retrieve_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        keys = list(keys)
+        cached = await self._front.retrieve_many(keys)
+        found = {k: v for k, v in cached.items() if v is not _ABSENT}
+        missing = []
+        for key in keys:
+            if key in cached:
+                continue
+            buffered = self._buffered(key)
+            if buffered is None:
+                missing.append(key)
+            elif buffered is not _DELETED:
+                found[key] = buffered
+        if missing:
+            found.update(await self._read_through(missing))
+        return found
+
+    async def exists(self, key: str) -> bool:
+        return await self.retrieve(key) is not None
+
+    async def scan(self, prefix: str = "") -> AsyncIterator[tuple[str, Any]]:
+        # The backing store is authoritative once buffered writes are flushed.
+        await self.flush()
+        async for item in self._back.scan(prefix):
+            yield item
+
+    # ---------------------------------------------------------------- writes
+
+    async def store(self, key: str, value: Any) -> None:
+        await self.store_many({key: value})
+
+    async def store_many(self, items: Mapping[str, Any]) -> None:
+        self._mark_written(items)
+        await self._front.store_many(items)
+        if self._mode is ConsistencyMode.WRITE_THROUGH:
+            await self._back.store_many(items)
+        else:
+            await self._buffer(items)
+
+    async def delete(self, key: str) -> None:
+        await self.delete_many([key])
+
+    async def delete_many(self, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        self._mark_written(keys)
+        await self._front.delete_many(keys)
+        if self._mode is ConsistencyMode.WRITE_THROUGH:
+            await self._back.delete_many(keys)
+        else:
+            await self._buffer(dict.fromkeys(keys, _DELETED))
+
+    async def _buffer(self, mutations: Mapping[str, Any]) -> None:
+        self._dirty.update(mutations)
+        if self.pending_writes >= self._max_pending:
+            # Backpressure: the writer waits for the backing store to catch up.
+            await self.flush()
+        elif self._flusher is None or self._flusher.done():
+            delay = 0.0 if len(self._dirty) >= self._flush_batch_size else self._flush_interval
+            self._flusher = asyncio.create_task(self._flush_later(delay))
+
+    async def _flush_later(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        retry_delay = max(self._flush_interval, _MIN_RETRY_DELAY)
+        while True:
+            try:
+                await self.flush()
+                return
+            except Exception:  # noqa: BLE001
+                # Logged by flush(), which requeued the batch; retry with backoff.
+                await asyncio.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, _MAX_RETRY_DELAY)
+
+    async def flush(self) -> None:
+        """Write every buffered mutation to the backing store."""
+        async with self._flush_lock:
+            while self._dirty:
+                batch, self._dirty = self._dirty, {}
+                self._in_flight = batch
+                puts = {k: v for k, v in batch.items() if v is not _DELETED}
+                deletes = [k for k, v in batch.items() if v is _DELETED]
+                try:
+                    if puts:
+                        await self._back.store_many(puts)
+                    if deletes:
+                        await self._back.delete_many(deletes)
+                except Exception as exc:
+                    logger.exception(
+                        "tiered_memory_flush_failed",
+                        extra={"batch_size": len(batch), "error": str(exc)},
+                    )
+                    # Requeue, keeping any newer mutation written meanwhile.
+                    self._dirty = {**batch, **self._dirty}
+                    raise
+                finally:
+                    self._in_flight = {}
+
+    async def clear(self) -> None:
+        """Flush buffered writes, then drop the cache; the backing store keeps its data."""
+        # Dropping acknowledged writes would resurrect the values they replaced.
+        await self.flush()
+        async with self._flush_lock:
+            await self._front.clear()
+
+    async def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+        await self.flush()
+        await self._front.close()
+        await self._back.close()
@@ -1,4 +1,17 @@
-from .message_schema import A2AMessage, AgentResponse, MessageType
 from .a2a_protocol import A2AProtocol
+from .message_schema import A2AMessage, AgentResponse, MessageType, Priority
+from .scatter_gather import BroadcastOptions, ScatterGather, register_aggregator
+from .transport import BaseTransport, InProcessTransport
 
-__all__ = ["A2AMessage", "AgentResponse", "MessageType", "A2AProtocol"]
+__all__ = [
+    "A2AMessage",
+    "A2AProtocol",
+    "AgentResponse",
+    "BaseTransport",
+    "BroadcastOptions",
+    "InProcessTransport",
+    "MessageType",
+    "Priority",
+    "ScatterGather",
+    "register_aggregator",
+]
@@ -5,7 +5,9 @@ import asyncio
 from typing import TYPE_CHECKING
 
 from src.core.logging_config import get_logger
-from src.protocol.message_schema import A2AMessage, AgentResponse, MessageType
+from src.core.tracing import span
+from src.protocol.message_schema import A2AMessage, AgentResponse
+from src.protocol.transport import BaseTransport, InProcessTransport
 
 if TYPE_CHECKING:
     from src.agents.registry import AgentRegistry
@@ -17,12 +19,16 @@ class A2AProtocol:
     """
     Handles message routing between agents through the registry.
     Provides validation, timeout enforcement, and error normalisation.
+    Delivery itself is delegated to a pluggable ``BaseTransport``.
     """
 
     DEFAULT_TIMEOUT_SECONDS = 30.0
 
-    def __init__(self, registry: "AgentRegistry") -> None:
+    def __init__(
+        self, registry: AgentRegistry, transport: BaseTransport | None = None
+    ) -> None:
         self._registry = registry
+        self._transport = transport or InProcessTransport()
 
     async def dispatch(
         self, message: A2AMessage, timeout: float = DEFAULT_TIMEOUT_SECONDS
@@ -45,16 +51,19 @@ class A2AProtocol:
                 },
             )
 
-            response = await asyncio.wait_for(target.handle(message), timeout=timeout)
+            with span("protocol_dispatch", message):
+                response = await asyncio.wait_for(
+                    self._transport.send(target, message), timeout=timeout
+                )
             return response
 
-        except asyncio.TimeoutError:
+        except TimeoutError:
             logger.error(
                 "a2a_timeout",
                 extra={"message_id": message.message_id, "timeout": timeout},
             )
             return self._error_response(message, f"Agent timed out after {timeout}s")
-        except Exception as exc:  # noqa: BLE001
+        except Exception as exc:
             logger.exception(
                 "a2a_dispatch_error",
                 extra={"message_id": message.message_id, "error": str(exc)},
@@ -64,7 +73,7 @@ class A2AProtocol:
     def _resolve_target(self, message: A2AMessage):
         if message.recipient_id:
             return self._registry.get(message.recipient_id)
-        # Broadcast to first coordinator
+        # Unaddressed messages, including BROADCAST fan-outs, go to the coordinator
         coordinators = self._registry.get_by_type("coordinator")
         return coordinators[0] if coordinators else None
 
@@ -2,9 +2,9 @@
 from __future__ import annotations
 
 import uuid
-from datetime import datetime, timezone
+from datetime import UTC, datetime
 from enum import Enum
-from typing import Any, Optional
+from typing import Any
 
 from pydantic import BaseModel, ConfigDict, Field, field_serializer
 
@@ -18,6 +18,12 @@ class MessageType(str, Enum):
     ERROR = "error"
 
 
+class Priority(str, Enum):
+    INTERACTIVE = "interactive"
+    NORMAL = "normal"
+    BULK = "bulk"
+
+
 class A2AMessage(BaseModel):
     """Envelope for all inter-agent communication."""
 
@@ -25,12 +31,13 @@ class A2AMessage(BaseModel):
 
     message_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     sender_id: str
-    recipient_id: Optional[str] = None
+    recipient_id: str | None = None
     message_type: MessageType
-    payload: Optional[dict[str, Any]] = None
-    correlation_id: Optional[str] = None
-    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    payload: dict[str, Any] | None = None
+    correlation_id: str | None = None
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(UTC))
     ttl_seconds: int = Field(default=60, ge=1)
+    priority: Priority = Priority.NORMAL
 
     @field_serializer("timestamp")
     def serialize_timestamp(self, v: datetime) -> str:
@@ -45,9 +52,9 @@ class AgentResponse(BaseModel):
     agent_id: str
     message_id: str
     success: bool
-    payload: Optional[dict[str, Any]] = None
-    error: Optional[str] = None
-    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    payload: dict[str, Any] | None = None
+    error: str | None = None
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(UTC))
 
     @field_serializer("timestamp")
     def serialize_timestamp(self, v: datetime) -> str:
@@ -0,0 +1,233 @@
+"""Scatter-gather fan-out for BROADCAST messages.
+
+A broadcast is sent concurrently to every agent matching a type or a
+capability.  Each target is bounded by its own timeout; the gather step can
+stop early once ``first_k`` successful responses have arrived, and the
+partial ``AgentResponse`` objects are folded into one payload by a named,
+pluggable aggregator.
+"""
+from __future__ import annotations
+
+import asyncio
+import uuid
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from pydantic import BaseModel, Field, model_validator
+
+from src.core.logging_config import get_logger
+from src.protocol.message_schema import A2AMessage, AgentResponse, MessageType
+
+if TYPE_CHECKING:
+    from src.agents.base_agent import BaseAgent
+
+logger = get_logger(__name__)
+
+Aggregator = Callable[[list[AgentResponse]], dict[str, Any]]
+
+BROADCAST_OPTIONS_KEY = "broadcast"
+
+
+class BroadcastOptions(BaseModel):
+    """Fan-out options carried under ``payload["broadcast"]``."""
+
+    target_type: str | None = None
+    capability: str | None = None
+    message_type: MessageType = MessageType.TASK_REQUEST
+    per_target_timeout: float = Field(default=5.0, gt=0)
+    first_k: int | None = Field(default=None, ge=1)
+    quorum: int = Field(default=1, ge=1)
+    aggregator: str = "collect"
+
+    @model_validator(mode="after")
+    def _first_k_reaches_quorum(self) -> BroadcastOptions:
+        # Stopping after first_k successes could never meet a larger quorum.
+        if self.first_k is not None and self.first_k < self.quorum:
+            raise ValueError(f"first_k ({self.first_k}) must be >= quorum ({self.quorum})")
+        return self
+
+
+def _successful(responses: list[AgentResponse]) -> list[AgentResponse]:
+    return [r for r in responses if r.success]
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def collect_aggregator(responses: list[AgentResponse]) -> dict[str, Any]:
+    """Return every partial response keyed by agent ID."""
+    return {
+        "responses": {
+            r.agent_id: {"success": r.success, "payload": r.payload, "error": r.error}
+            for r in responses
+        }
+    }
+
+
+def first_success_aggregator(responses: list[AgentResponse]) -> dict[str, Any]:
+    """Return the payload of the earliest successful response."""
+    winners = _successful(responses)
+    if not winners:
+        return {"result": None}
+    return {"result": winners[0].payload, "winner": winners[0].agent_id}
+
+
+def mean_aggregator(responses: list[AgentResponse]) -> dict[str, Any]:
+    """Average every numeric payload field shared by the successful responses."""
+    winners = [r.payload or {} for r in _successful(responses)]
+    if not winners:
+        return {"mean": {}}
+    shared = set(winners[0]).intersection(*winners[1:])
+    means = {
+        key: sum(p[key] for p in winners) / len(winners)
+        for key in sorted(shared)
+        if all(_is_number(p[key]) for p in winners)
+    }
+    return {"mean": means}
+
+
+AGGREGATORS: dict[str, Aggregator] = {
+    "collect": collect_aggregator,
+    "first_success": first_success_aggregator,
+    "mean": mean_aggregator,
+}
+
+
+def register_aggregator(name: str, aggregator: Aggregator) -> None:
+    """Make an aggregator available to every ``ScatterGather`` by name."""
+    AGGREGATORS[name] = aggregator
+
+
+class ScatterGather:
+    """
+    Concurrent fan-out of one message to many agents, with aggregation.
+
+    ``aggregators`` are private to this instance and take precedence;
+    other names are looked up in the module registry at run time, so
+    ``register_aggregator`` also applies to existing instances.
+    """
+
+    def __init__(
+        self,
+        agent_id: str,
+        aggregators: dict[str, Aggregator] | None = None,
+    ) -> None:
+        self._agent_id = agent_id
+        self._aggregators = dict(aggregators or {})
+
+    async def run(
+        self,
+        message: A2AMessage,
+        targets: list[BaseAgent],
+        options: BroadcastOptions,
+    ) -> AgentResponse:
+        aggregator = self._aggregators.get(options.aggregator) or AGGREGATORS.get(
+            options.aggregator
+        )
+        if aggregator is None:
+            return self._response(
+                message, False, error=f"Unknown aggregator '{options.aggregator}'"
+            )
+        if not targets:
+            return self._response(message, False, error="No agents matched the broadcast.")
+
+        forwarded = {
+            k: v for k, v in (message.payload or {}).items() if k != BROADCAST_OPTIONS_KEY
+        }
+        logger.info(
+            "broadcast_scatter",
+            extra={
+                "message_id": message.message_id,
+                "target_count": len(targets),
+                "first_k": options.first_k,
+            },
+        )
+
+        tasks = [
+            asyncio.create_task(self._call(target, message, forwarded, options))
+            for target in targets
+        ]
+        responses: list[AgentResponse] = []
+        succeeded = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                response = await next_done
+                responses.append(response)
+                if response.success:
+                    succeeded += 1
+                if options.first_k is not None and succeeded >= options.first_k:
+                    break
+        finally:
+            pending = [t for t in tasks if not t.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        payload = aggregator(responses)
+        payload[BROADCAST_OPTIONS_KEY] = {
+            "targets": len(targets),
+            "succeeded": succeeded,
+            "failed": len(responses) - succeeded,
+            "cancelled": len(targets) - len(responses),
+        }
+        success = succeeded >= options.quorum
+        return self._response(
+            message,
+            success,
+            payload=payload,
+            error=None if success else f"Quorum not met: {succeeded}/{options.quorum} succeeded",
+        )
+
+    async def _call(
+        self,
+        target: BaseAgent,
+        parent: A2AMessage,
+        payload: dict[str, Any],
+        options: BroadcastOptions,
+    ) -> AgentResponse:
+        message = parent.model_copy(
+            update={
+                "message_id": str(uuid.uuid4()),
+                "sender_id": self._agent_id,
+                "recipient_id": target.agent_id,
+                "message_type": options.message_type,
+                "payload": payload,
+                "correlation_id": parent.correlation_id or parent.message_id,
+            }
+        )
+        try:
+            return await asyncio.wait_for(
+                target.handle(message), timeout=options.per_target_timeout
+            )
+        except TimeoutError:
+            error = f"Agent timed out after {options.per_target_timeout}s"
+        except Exception as exc:  # noqa: BLE001
+            error = str(exc)
+        logger.warning(
+            "broadcast_target_failed",
+            extra={
+                "message_id": message.message_id,
+                "target_agent_id": target.agent_id,
+                "error": error,
+            },
+        )
+        return AgentResponse(
+            agent_id=target.agent_id, message_id=message.message_id, success=False, error=error
+        )
+
+    def _response(
+        self,
+        message: A2AMessage,
+        success: bool,
+        payload: dict[str, Any] | None = None,
+        error: str | None = None,
+    ) -> AgentResponse:
+        return AgentResponse(
+            agent_id=self._agent_id,
+            message_id=message.message_id,
+            success=success,
+            payload=payload,
+            error=error,
+        )
@@ -0,0 +1,378 @@
+"""Length-prefixed binary A2A transport over Unix or TCP sockets.
+
+Wire format, per frame::
+
+    +----------------+-----------+--------------------+-----------------+
+    | length (u32be) | kind (u8) | request id (u64be) | body (length B) |
+    +----------------+-----------+--------------------+-----------------+
+
+Bodies are the JSON encoding of the Pydantic schemas.  Every request carries
+an ID so many requests can be in flight on one connection at once
+(pipelining) and responses may return out of order.  A frame the server
+cannot process (an unknown kind, or a body over ``MAX_FRAME_BYTES``) is
+answered with a ``FRAME_ERROR`` carrying the same ID and a UTF-8 reason,
+which fails that request on the client with ``FrameError`` right away.
+
+``AgentServer`` exposes the agents of a local registry on an address;
+``SocketTransport`` keeps a small pool of pipelined connections per address
+and can discover a server's agents as ``RemoteAgent`` proxies that register
+in any other registry like local agents.
+
+Addresses are ``unix:/path/to.sock`` or ``tcp://host:port``.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import struct
+from typing import TYPE_CHECKING, Any
+
+from src.agents.remote_agent import RemoteAgent
+from src.core.logging_config import get_logger
+from src.protocol.message_schema import A2AMessage, AgentResponse
+from src.protocol.transport import BaseTransport
+
+if TYPE_CHECKING:
+    from src.agents.base_agent import BaseAgent
+    from src.agents.registry import AgentRegistry
+
+logger = get_logger(__name__)
+
+_HEADER = struct.Struct(">IBQ")
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+
+FRAME_REQUEST = 1
+FRAME_RESPONSE = 2
+FRAME_LIST = 3
+FRAME_LIST_REPLY = 4
+FRAME_ERROR = 5
+
+
+class FrameError(ValueError):
+    """A frame that could not be processed; ``request_id`` is the frame's ID."""
+
+    def __init__(self, message: str, request_id: int) -> None:
+        super().__init__(message)
+        self.request_id = request_id
+
+
+def _parse_address(address: str) -> tuple[str, Any]:
+    if address.startswith("unix:"):
+        return "unix", address[len("unix:"):].removeprefix("//")
+    if address.startswith("tcp://"):
+        host, _, port = address[len("tcp://"):].rpartition(":")
+        return "tcp", (host, int(port))
+    raise ValueError(f"Unsupported transport address '{address}'.")
+
+
+def _encode_frame(kind: int, request_id: int, body: bytes) -> bytes:
+    if len(body) > MAX_FRAME_BYTES:
+        raise ValueError(f"Frame of {len(body)} bytes exceeds {MAX_FRAME_BYTES}.")
+    return _HEADER.pack(len(body), kind, request_id) + body
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> tuple[int, int, bytes]:
+    length, kind, request_id = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    if length > MAX_FRAME_BYTES:
+        raise FrameError(f"Frame of {length} bytes exceeds {MAX_FRAME_BYTES}.", request_id)
+    return kind, request_id, await reader.readexactly(length)
+
+
+async def _open(address: str) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    family, target = _parse_address(address)
+    if family == "unix":
+        return await asyncio.open_unix_connection(target)
+    return await asyncio.open_connection(*target)
+
+
+class _Connection:
+    """One socket with many pipelined requests matched back by request ID."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._reader = reader
+        self._writer = writer
+        self._pending: dict[int, asyncio.Future] = {}
+        self._next_id = 0
+        self._closed = False
+        self._reader_task = asyncio.create_task(self._read_loop())
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    async def request(self, kind: int, body: bytes) -> tuple[int, bytes]:
+        if self._closed:
+            raise ConnectionError("Connection is closed.")
+        self._next_id += 1
+        request_id = self._next_id
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            self._writer.write(_encode_frame(kind, request_id, body))
+            await self._writer.drain()
+            return await future
+        finally:
+            self._pending.pop(request_id, None)
+            if not future.done():
+                future.cancel()
+            elif not future.cancelled():
+                # The write failed after the reader already failed this request.
+                future.exception()
+
+    async def _read_loop(self) -> None:
+        error: Exception = ConnectionError("Connection closed by peer.")
+        try:
+            while True:
+                kind, request_id, body = await _read_frame(self._reader)
+                future = self._pending.get(request_id)
+                if future is None or future.done():
+                    continue
+                if kind == FRAME_ERROR:
+                    future.set_exception(FrameError(body.decode("utf-8", "replace"), request_id))
+                else:
+                    future.set_result((kind, body))
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError) as exc:
+            if not isinstance(exc, asyncio.IncompleteReadError):
+                error = exc
+        finally:
+            self._closed = True
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(error)
+
+    async def close(self) -> None:
+        self._closed = True
+        self._reader_task.cancel()
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+        await asyncio.gather(self._reader_task, return_exceptions=True)
+
+
+class _ConnectionPool:
+    """Up to ``size`` connections to one address; picks the least loaded."""
+
+    def __init__(self, address: str, size: int) -> None:
+        self._address = address
+        self._size = size
+        self._connections: list[_Connection] = []
+        self._lock = asyncio.Lock()
+
+    @property
+    def size(self) -> int:
+        return len(self._connections)
+
+    async def acquire(self) -> _Connection:
+        self._connections = [c for c in self._connections if not c.closed]
+        idle = min(self._connections, key=lambda c: c.in_flight, default=None)
+        if idle is not None and (idle.in_flight == 0 or len(self._connections) >= self._size):
+            return idle
+        async with self._lock:
+            if len(self._connections) < self._size:
+                connection = _Connection(*await _open(self._address))
+                self._connections.append(connection)
+                return connection
+        return min(self._connections, key=lambda c: c.in_flight)
+
+    async def close(self) -> None:
+        await asyncio.gather(*(c.close() for c in self._connections))
+        self._connections.clear()
+
+
+class SocketTransport(BaseTransport):
+    """Pooled, pipelined socket transport; local agents are still called in-process."""
+
+    def __init__(self, pool_size: int = 4) -> None:
+        self._pool_size = pool_size
+        self._pools: dict[str, _ConnectionPool] = {}
+
+    def _pool(self, address: str) -> _ConnectionPool:
+        pool = self._pools.get(address)
+        if pool is None:
+            pool = self._pools[address] = _ConnectionPool(address, self._pool_size)
+        return pool
+
+    def connection_count(self, address: str) -> int:
+        return self._pools[address].size if address in self._pools else 0
+
+    async def send(self, target: BaseAgent, message: A2AMessage) -> AgentResponse:
+        if isinstance(target, RemoteAgent):
+            return await self.request(target.address, message)
+        return await target.handle(message)
+
+    async def request(self, address: str, message: A2AMessage) -> AgentResponse:
+        connection = await self._pool(address).acquire()
+        _, body = await connection.request(FRAME_REQUEST, message.model_dump_json().encode())
+        return AgentResponse.model_validate_json(body)
+
+    async def discover(self, address: str) -> list[RemoteAgent]:
+        """Fetch the agents hosted at ``address`` as registrable proxies."""
+        connection = await self._pool(address).acquire()
+        _, body = await connection.request(FRAME_LIST, b"")
+        return [
+            RemoteAgent(
+                address=address,
+                transport=self,
+                agent_id=info["agent_id"],
+                agent_type=info["agent_type"],
+                capabilities=info["capabilities"],
+            )
+            for info in json.loads(body)
+        ]
+
+    async def register_remote_agents(
+        self, registry: AgentRegistry, address: str
+    ) -> list[RemoteAgent]:
+        agents = await self.discover(address)
+        for agent in agents:
+            await registry.register(agent)
+        logger.info(
+            "remote_agents_registered",
+            extra={"address": address, "count": len(agents)},
+        )
+        return agents
+
+    async def close(self) -> None:
+        await asyncio.gather(*(p.close() for p in self._pools.values()))
+        self._pools.clear()
+
+
+class AgentServer:
+    """Serves the agents of a local registry to ``SocketTransport`` clients."""
+
+    def __init__(self, registry: AgentRegistry, address: str) -> None:
+        self._registry = registry
+        self._address = address
+        self._server: asyncio.Server | None = None
+        self._connections: set[asyncio.Task] = set()
+
+    @property
+    def address(self) -> str:
+        """Bound address; resolves ``tcp://host:0`` to the actual port once started."""
+        family, _ = _parse_address(self._address)
+        if family == "tcp" and self._server is not None:
+            host, port = self._server.sockets[0].getsockname()[:2]
+            return f"tcp://{host}:{port}"
+        return self._address
+
+    async def start(self) -> None:
+        family, target = _parse_address(self._address)
+        if family == "unix":
+            self._server = await asyncio.start_unix_server(self._serve, path=target)
+        else:
+            self._server = await asyncio.start_server(self._serve, *target)
+        logger.info("agent_server_started", extra={"address": self.address})
+
+    async def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.close()
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        await self._server.wait_closed()
+        self._server = None
+        logger.info("agent_server_stopped", extra={"address": self._address})
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        connection = asyncio.current_task()
+        assert connection is not None  # asyncio runs each client callback as a task.
+        self._connections.add(connection)
+        in_flight: set[asyncio.Task] = set()
+        try:
+            while True:
+                kind, request_id, body = await _read_frame(reader)
+                if kind == FRAME_LIST:
+                    reply = json.dumps(self._registry.list_agents()).encode()
+                    writer.write(_encode_frame(FRAME_LIST_REPLY, request_id, reply))
+                elif kind == FRAME_REQUEST:
+                    task = asyncio.create_task(self._handle(writer, request_id, body))
+                    in_flight.add(task)
+                    task.add_done_callback(in_flight.discard)
+                else:
+                    self._reject(writer, request_id, f"Unknown frame kind {kind}.")
+        except FrameError as exc:
+            # The oversized body was not read, so the stream cannot be resynced:
+            # answer the request, then drop the connection.
+            self._reject(writer, exc.request_id, str(exc))
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            for task in in_flight:
+                task.cancel()
+            writer.close()
+            self._connections.discard(connection)
+
+    def _reject(self, writer: asyncio.StreamWriter, request_id: int, reason: str) -> None:
+        logger.warning(
+            "agent_server_frame_rejected", extra={"request_id": request_id, "reason": reason}
+        )
+        if not writer.is_closing():
+            writer.write(_encode_frame(FRAME_ERROR, request_id, reason.encode()))
+
+    async def _handle(self, writer: asyncio.StreamWriter, request_id: int, body: bytes) -> None:
+        # The frame's request ID is what the client matches on, so a body
+        # that does not parse still gets an error response.
+        message_id = f"request-{request_id}"
+        try:
+            message = A2AMessage.model_validate_json(body)
+            message_id = message.message_id
+            agent = self._registry.get(message.recipient_id) if message.recipient_id else None
+            if agent is None:
+                raise LookupError(f"No agent found for recipient '{message.recipient_id}'")
+            response = await agent.handle(message)
+        except Exception as exc:
+            logger.exception(
+                "agent_server_error",
+                extra={"message_id": message_id, "error": str(exc)},
+            )
+            response = AgentResponse(
+                agent_id="agent_server",
+                message_id=message_id,
+                success=False,
+                error=str(exc),
+            )
+        if not writer.is_closing():
+            writer.write(
+                _encode_frame(FRAME_RESPONSE, request_id, response.model_dump_json().encode())
+            )
+            await writer.drain()
+
+
+async def _serve_forever(address: str, task_agents: int) -> None:
+    from src.agents.registry import AgentRegistry
+    from src.agents.task_agent import TaskAgent
+
+    registry = AgentRegistry()
+    for _ in range(task_agents):
+        await registry.register(TaskAgent())
+    server = AgentServer(registry, address)
+    await server.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+        await registry.shutdown_all()
+
+
+def main() -> None:
+    """Host TaskAgents in a separate process: ``python -m src.protocol.socket_transport``."""
+    from src.core.logging_config import configure_logging
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--address", default="tcp://127.0.0.1:7100")
+    parser.add_argument("--task-agents", type=int, default=1)
+    args = parser.parse_args()
+    configure_logging()
+    asyncio.run(_serve_forever(args.address, args.task_agents))
+
+
+if __name__ == "__main__":
+    main()
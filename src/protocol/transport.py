@@ -0,0 +1,34 @@
+"""Transport abstraction underneath ``A2AProtocol``.
+
+A transport delivers an already-resolved message to its target agent.  The
+default ``InProcessTransport`` simply awaits ``target.handle``; the socket
+transport in ``src.protocol.socket_transport`` carries messages to agents
+hosted in other processes or on other nodes.
+"""
+from __future__ import annotations
+
+import abc
+from typing import TYPE_CHECKING
+
+from src.protocol.message_schema import A2AMessage, AgentResponse
+
+if TYPE_CHECKING:
+    from src.agents.base_agent import BaseAgent
+
+
+class BaseTransport(abc.ABC):
+    """Delivers a message to a resolved agent and returns its response."""
+
+    @abc.abstractmethod
+    async def send(self, target: BaseAgent, message: A2AMessage) -> AgentResponse:
+        """Deliver ``message`` to ``target``."""
+
+    async def close(self) -> None:
+        """Release any connections held by the transport."""
+
+
+class InProcessTransport(BaseTransport):
+    """Direct coroutine call on an agent living in the same event loop."""
+
+    async def send(self, target: BaseAgent, message: A2AMessage) -> AgentResponse:
+        return await target.handle(message)
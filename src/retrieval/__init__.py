@@ -1,4 +1,23 @@
 from .base_vector_store import BaseVectorStore
 from .chroma_adapter import ChromaAdapterStub
+from .embedding import (
+    CachedEmbedder,
+    EmbeddingCache,
+    HashingEmbedder,
+    shared_embedding_cache,
+)
+from .ivf_index import IVFIndex
+from .ivf_store import IVFVectorStore
+from .numpy_store import NumpyVectorStore
 
-__all__ = ["BaseVectorStore", "ChromaAdapterStub"]
+__all__ = [
+    "BaseVectorStore",
+    "CachedEmbedder",
+    "ChromaAdapterStub",
+    "EmbeddingCache",
+    "HashingEmbedder",
+    "IVFIndex",
+    "IVFVectorStore",
+    "NumpyVectorStore",
+    "shared_embedding_cache",
+]
@@ -2,7 +2,8 @@
 from __future__ import annotations
 
 import abc
-from typing import Any, Optional
+from collections.abc import Sequence
+from typing import Any
 
 
 class BaseVectorStore(abc.ABC):
@@ -12,12 +13,17 @@ class BaseVectorStore(abc.ABC):
     """
 
     @abc.abstractmethod
-    async def add(self, doc_id: str, text: str, metadata: Optional[dict] = None) -> None:
+    async def add(self, doc_id: str, text: str, metadata: dict | None = None) -> None:
         """Add or update a document embedding."""
 
     @abc.abstractmethod
-    async def query(self, query_text: str, top_k: int = 5) -> list[dict[str, Any]]:
-        """Return the top-k most similar documents."""
+    async def query(
+        self, query_text: str, top_k: int = 5, where: dict | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Return the top-k most similar documents, optionally restricted to
+        those whose metadata equals every item in ``where``.
+        """
 
     @abc.abstractmethod
     async def delete(self, doc_id: str) -> None:
@@ -26,3 +32,20 @@ class BaseVectorStore(abc.ABC):
     @abc.abstractmethod
     async def clear(self) -> None:
         """Drop all documents from the store."""
+
+    async def add_many(
+        self,
+        doc_ids: Sequence[str],
+        texts: Sequence[str],
+        metadatas: Sequence[dict | None] | None = None,
+    ) -> None:
+        """Add or update many documents.  Override to embed and index in bulk."""
+        metadatas = metadatas if metadatas is not None else [None] * len(doc_ids)
+        for doc_id, text, metadata in zip(doc_ids, texts, metadatas):
+            await self.add(doc_id, text, metadata)
+
+    async def query_many(
+        self, query_texts: Sequence[str], top_k: int = 5, where: dict | None = None
+    ) -> list[list[dict[str, Any]]]:
+        """Run several queries; results are in the same order as ``query_texts``."""
+        return [await self.query(text, top_k, where) for text in query_texts]
@@ -5,7 +5,7 @@ Replace the stub methods with real ChromaDB client calls once
 """
 from __future__ import annotations
 
-from typing import Any, Optional
+from typing import Any
 
 from src.core.logging_config import get_logger
 from src.retrieval.base_vector_store import BaseVectorStore
@@ -31,13 +31,20 @@ class ChromaAdapterStub(BaseVectorStore):
             extra={"collection": collection_name, "mode": "stub"},
         )
 
-    async def add(self, doc_id: str, text: str, metadata: Optional[dict] = None) -> None:
+    async def add(self, doc_id: str, text: str, metadata: dict | None = None) -> None:
         self._store[doc_id] = {"text": text, "metadata": metadata or {}}
         logger.debug("chroma_add", extra={"doc_id": doc_id})
 
-    async def query(self, query_text: str, top_k: int = 5) -> list[dict[str, Any]]:
-        # Stub: return all docs up to top_k (no real embedding)
-        results = list(self._store.values())[:top_k]
+    async def query(
+        self, query_text: str, top_k: int = 5, where: dict | None = None
+    ) -> list[dict[str, Any]]:
+        # Stub: return all matching docs up to top_k (no real embedding)
+        docs = list(self._store.values())
+        if where:
+            docs = [
+                d for d in docs if all(d["metadata"].get(k) == v for k, v in where.items())
+            ]
+        results = list(docs)[:top_k]
         logger.debug(
             "chroma_query",
             extra={"query": query_text, "results_count": len(results)},
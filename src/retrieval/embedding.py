@@ -0,0 +1,188 @@
+"""Deterministic local text embedder based on feature hashing.
+
+Tokens (lower-cased words, plus adjacent-word bigrams) are hashed into a
+fixed number of signed buckets, and the resulting vector is L2-normalised so
+a dot product is a cosine similarity.  No model download or server needed;
+the same text always maps to the same vector in every process.
+
+``CachedEmbedder`` wraps any embedder with an LRU cache keyed by a content
+hash of the text; by default every wrapper in the process shares one cache.
+The cache is meant for queries: bulk document ingest embeds through
+``CachedEmbedder.uncached`` so it cannot evict the hot query vectors.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from functools import lru_cache
+from itertools import pairwise
+from typing import Protocol
+
+import numpy as np
+
+from src.core.metrics import MEMORY_HITS, MEMORY_MISSES
+
+_TOKEN_RE = re.compile(r"\w+")
+
+_cache_hits = MEMORY_HITS.labels(backend="embedding_cache")
+_cache_misses = MEMORY_MISSES.labels(backend="embedding_cache")
+
+
+class Embedder(Protocol):
+    dim: int
+
+    @property
+    def fingerprint(self) -> str:
+        """Identifies the embedding function, so cached vectors are never mixed up."""
+
+    def embed(self, text: str) -> np.ndarray: ...
+
+    def embed_many(self, texts: Iterable[str]) -> np.ndarray: ...
+
+
+@lru_cache(maxsize=65536)
+def _bucket(token: str, dim: int) -> tuple[int, float]:
+    digest = int.from_bytes(
+        hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+    return digest % dim, -1.0 if digest >> 63 else 1.0
+
+
+class HashingEmbedder:
+    """Feature-hashing embedder producing unit-length float32 vectors."""
+
+    def __init__(self, dim: int = 384, bigrams: bool = True) -> None:
+        self.dim = dim
+        self._bigrams = bigrams
+
+    @property
+    def fingerprint(self) -> str:
+        return f"hashing:{self.dim}:{int(self._bigrams)}"
+
+    def _features(self, text: str) -> list[str]:
+        words = _TOKEN_RE.findall(text.lower())
+        if self._bigrams:
+            words += [f"{a} {b}" for a, b in pairwise(words)]
+        return words
+
+    def embed(self, text: str) -> np.ndarray:
+        return self.embed_many([text])[0]
+
+    def embed_many(self, texts: Iterable[str]) -> np.ndarray:
+        texts = list(texts)
+        rows, columns, signs = [], [], []
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                index, sign = _bucket(feature, self.dim)
+                rows.append(row)
+                columns.append(index)
+                signs.append(sign)
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        np.add.at(matrix, (rows, columns), np.asarray(signs, dtype=np.float32))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+
+class EmbeddingCache:
+    """Thread-safe LRU of embedding vectors keyed by (embedder, text digest)."""
+
+    def __init__(self, max_entries: int = 10_000) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, bytes], np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def digest(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    def get_many(self, keys: list[tuple[str, bytes]]) -> list[np.ndarray | None]:
+        found = []
+        with self._lock:
+            for key in keys:
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                found.append(vector)
+        hits = sum(vector is not None for vector in found)
+        _cache_hits.inc(hits)
+        _cache_misses.inc(len(keys) - hits)
+        return found
+
+    def put_many(self, keys: list[tuple[str, bytes]], vectors: np.ndarray) -> None:
+        with self._lock:
+            for key, vector in zip(keys, vectors):
+                vector = vector.copy()
+                vector.flags.writeable = False
+                self._entries[key] = vector
+                self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_shared_cache = EmbeddingCache()
+
+
+def shared_embedding_cache() -> EmbeddingCache:
+    """The process-wide cache used by ``CachedEmbedder`` unless one is given."""
+    return _shared_cache
+
+
+class CachedEmbedder:
+    """Embedder wrapper that only embeds texts missing from an ``EmbeddingCache``."""
+
+    def __init__(self, embedder: Embedder, cache: EmbeddingCache | None = None) -> None:
+        self._embedder = embedder
+        self._cache = cache if cache is not None else _shared_cache
+        self.dim = embedder.dim
+
+    @property
+    def fingerprint(self) -> str:
+        return self._embedder.fingerprint
+
+    @property
+    def uncached(self) -> Embedder:
+        """The wrapped embedder, for texts that should not enter the cache."""
+        return self._embedder
+
+    def embed(self, text: str) -> np.ndarray:
+        return self.embed_many([text])[0]
+
+    def embed_many(self, texts: Iterable[str]) -> np.ndarray:
+        texts = list(texts)
+        fingerprint = self._embedder.fingerprint
+        keys = [(fingerprint, EmbeddingCache.digest(text)) for text in texts]
+        cached = self._cache.get_many(keys)
+        matrix = np.empty((len(texts), self.dim), dtype=np.float32)
+        missing = []
+        for row, vector in enumerate(cached):
+            if vector is None:
+                missing.append(row)
+            else:
+                matrix[row] = vector
+        if missing:
+            # Duplicate texts within the batch are embedded once.
+            unique = {keys[row]: texts[row] for row in missing}
+            fresh = self._embedder.embed_many(unique.values())
+            by_key = dict(zip(unique, fresh))
+            for row in missing:
+                matrix[row] = by_key[keys[row]]
+            self._cache.put_many(list(unique), fresh)
+        return matrix
+
+
+def with_cache(embedder: Embedder) -> CachedEmbedder:
+    """``embedder`` backed by the shared cache, unless it already has a cache."""
+    if isinstance(embedder, CachedEmbedder):
+        return embedder
+    return CachedEmbedder(embedder)
@@ -0,0 +1,309 @@
+"""Inverted-file (IVF) approximate nearest-neighbour index, optionally with
+product quantization (IVF-PQ), for inner-product search over unit vectors.
+
+Vectors are clustered into ``nlist`` coarse cells by k-means.  A query only
+scans the ``nprobe`` cells whose centroids score highest, so ``nprobe`` is
+the recall/latency knob.  With ``pq_m`` set, each vector is stored as the
+product-quantized residual to its cell centroid (``pq_m`` bytes per vector)
+and scored with per-query lookup tables (asymmetric distance computation);
+with ``pq_m=None`` cells hold the raw float32 vectors (IVF-Flat).
+
+``save`` writes one ``.npy`` file per array; ``load`` maps them read-only
+with ``np.load(mmap_mode="r")``, so opening a large index is instant and
+processes on one host share its pages.  Vectors added after a load go to
+in-memory chunks and are merged into a cell on its next probe.  ``remove``
+tombstones ids: they are filtered out of every search and dropped from the
+cells by ``compact``, which runs on ``write`` and once tombstones outnumber
+live vectors.
+
+Saved files are never rewritten in place (truncating a file another process
+has mapped crashes it with SIGBUS): ``replace_directory`` writes into a
+sibling temporary directory and renames it over the target, so existing
+mappings keep the old, unlinked files.
+"""
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from itertools import pairwise
+from pathlib import Path
+from typing import Literal
+
+import numpy as np
+
+_KSUB = 256  # Centroids per PQ subspace, so each sub-code fits in a uint8.
+_ASSIGN_CHUNK = 8192
+
+
+@contextmanager
+def replace_directory(directory: str | Path) -> Iterator[Path]:
+    """
+    Yield an empty sibling directory to write into; on success it replaces
+    ``directory`` by rename, and the previous contents are unlinked.
+    """
+    directory = Path(directory)
+    directory.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f".{directory.name}.new-", dir=directory.parent))
+    try:
+        yield staging
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    retired = None
+    if directory.exists():
+        retired = Path(tempfile.mkdtemp(prefix=f".{directory.name}.old-", dir=directory.parent))
+        os.replace(directory, retired / directory.name)
+    os.replace(staging, directory)
+    if retired is not None:
+        shutil.rmtree(retired, ignore_errors=True)
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the nearest (L2) centroid for each vector, in bounded-memory chunks."""
+    half_norms = 0.5 * np.einsum("ij,ij->i", centroids, centroids)
+    out = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), _ASSIGN_CHUNK):
+        chunk = vectors[start:start + _ASSIGN_CHUNK]
+        out[start:start + len(chunk)] = np.argmax(chunk @ centroids.T - half_norms, axis=1)
+    return out
+
+
+def _pq_encode(residuals: np.ndarray, codebooks: np.ndarray) -> np.ndarray:
+    """Nearest codebook entry per sub-vector: one uint8 code per subspace."""
+    sub = residuals.reshape(len(residuals), len(codebooks), -1)
+    return np.stack(
+        [_assign(sub[:, m], codebooks[m]) for m in range(len(codebooks))], axis=1
+    ).astype(np.uint8)
+
+
+def kmeans(
+    vectors: np.ndarray, k: int, iterations: int = 20, seed: int = 0
+) -> np.ndarray:
+    """Lloyd's k-means; empty clusters are re-seeded from random points."""
+    rng = np.random.default_rng(seed)
+    k = min(k, len(vectors))
+    centroids = vectors[rng.choice(len(vectors), k, replace=False)].astype(np.float32)
+    for _ in range(iterations):
+        labels = _assign(vectors, centroids)
+        counts = np.bincount(labels, minlength=k)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, vectors)
+        empty = counts == 0
+        centroids[~empty] = sums[~empty] / counts[~empty, None]
+        if empty.any():
+            centroids[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+    return centroids
+
+
+class IVFIndex:
+    """IVF / IVF-PQ index mapping int64 ids to approximate inner-product search."""
+
+    def __init__(
+        self, dim: int, nlist: int = 256, nprobe: int = 8, pq_m: int | None = 16
+    ) -> None:
+        if pq_m is not None and dim % pq_m:
+            raise ValueError(f"dim ({dim}) must be divisible by pq_m ({pq_m})")
+        self.dim = dim
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.pq_m = pq_m
+        self.centroids: np.ndarray | None = None
+        self.codebooks: np.ndarray | None = None  # (pq_m, ksub, dim // pq_m)
+        # Per cell: a list of (ids, codes) chunks, merged lazily on probe.
+        self._lists: list[list[tuple[np.ndarray, np.ndarray]]] = []
+        self._removed: set[int] = set()
+        self._removed_sorted = np.empty(0, np.int64)
+        self.ntotal = 0  # Live vectors; tombstoned ones are not counted.
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    # -------------------------------------------------------------- training
+
+    def train(self, vectors: np.ndarray, iterations: int = 20, seed: int = 0) -> None:
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        centroids = self.centroids = kmeans(vectors, self.nlist, iterations, seed)
+        self.nlist = len(centroids)
+        self._lists = [[] for _ in range(self.nlist)]
+        if self.pq_m is not None:
+            residuals = vectors - centroids[_assign(vectors, centroids)]
+            sub = residuals.reshape(len(vectors), self.pq_m, -1)
+            self.codebooks = np.stack(
+                [kmeans(sub[:, m], _KSUB, iterations, seed + m) for m in range(self.pq_m)]
+            )
+
+    def _trained_centroids(self) -> np.ndarray:
+        if self.centroids is None:
+            raise RuntimeError("IVFIndex must be trained before vectors are added")
+        return self.centroids
+
+    def _no_codes(self) -> np.ndarray:
+        """An empty codes array of the right shape for this index."""
+        if self.pq_m is None:
+            return np.empty((0, self.dim), np.float32)
+        return np.empty((0, self.pq_m), np.uint8)
+
+    # ----------------------------------------------------------------- adds
+
+    def add(self, ids: np.ndarray, vectors: np.ndarray) -> None:
+        centroids = self._trained_centroids()
+        ids = np.asarray(ids, dtype=np.int64)
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if self._removed and not self._removed.isdisjoint(ids.tolist()):
+            # A re-added id must not be filtered out with its old vector.
+            self.compact()
+        cells = _assign(vectors, centroids)
+        if self.codebooks is None:
+            codes = vectors
+        else:
+            codes = _pq_encode(vectors - centroids[cells], self.codebooks)
+        order = np.argsort(cells, kind="stable")
+        bounds = np.searchsorted(cells[order], np.arange(self.nlist + 1))
+        for cell in np.flatnonzero(np.diff(bounds)):
+            rows = order[bounds[cell]:bounds[cell + 1]]
+            self._lists[cell].append((ids[rows], codes[rows]))
+        self.ntotal += len(ids)
+
+    def remove(self, ids: np.ndarray) -> None:
+        """Tombstone ``ids``, which must currently be in the index."""
+        fresh = set(np.asarray(ids, dtype=np.int64).tolist()) - self._removed
+        if not fresh:
+            return
+        self._removed |= fresh
+        self._removed_sorted = np.sort(np.fromiter(self._removed, np.int64, len(self._removed)))
+        self.ntotal -= len(fresh)
+        if len(self._removed) > max(self.ntotal, 1024):
+            self.compact()
+
+    def compact(self) -> None:
+        """Drop tombstoned ids from the cells that hold them."""
+        if not self._removed:
+            return
+        for cell in range(len(self._lists)):
+            ids, codes = self._cell(cell)
+            if not len(ids):
+                continue
+            keep = ~np.isin(ids, self._removed_sorted)
+            if not keep.all():
+                self._lists[cell][:] = [(ids[keep], codes[keep])] if keep.any() else []
+        self._removed = set()
+        self._removed_sorted = np.empty(0, np.int64)
+
+    def _cell(self, cell: int) -> tuple[np.ndarray, np.ndarray]:
+        chunks = self._lists[cell]
+        if len(chunks) > 1:
+            chunks[:] = [
+                (np.concatenate([c[0] for c in chunks]), np.concatenate([c[1] for c in chunks]))
+            ]
+        return chunks[0] if chunks else (np.empty(0, np.int64), self._no_codes())
+
+    # --------------------------------------------------------------- search
+
+    def search(
+        self, queries: np.ndarray, k: int, nprobe: int | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate top-``k`` inner products for each query row.
+
+        Returns ``(scores, ids)`` of shape ``(len(queries), k)``, best first;
+        slots with no candidate hold ``-inf`` and id ``-1``.
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        nq = len(queries)
+        out_scores = np.full((nq, k), -np.inf, dtype=np.float32)
+        out_ids = np.full((nq, k), -1, dtype=np.int64)
+        if self.centroids is None or not self.ntotal:
+            return out_scores, out_ids
+
+        nprobe = min(nprobe or self.nprobe, self.nlist)
+        coarse = queries @ self.centroids.T
+        probes = np.argpartition(-coarse, nprobe - 1, axis=1)[:, :nprobe]
+        codebooks = self.codebooks
+        if codebooks is not None:
+            pq_m = len(codebooks)
+            # lut[q, m, j] = <query sub-vector m, codebook m centroid j>
+            lut = np.einsum(
+                "qmd,mjd->qmj", queries.reshape(nq, pq_m, -1), codebooks
+            ).reshape(nq, -1)
+            # Offset of each sub-code's table within a query's flattened lut row.
+            lut_offsets = np.arange(pq_m) * codebooks.shape[1]
+
+        for qi in range(nq):
+            id_parts, score_parts = [], []
+            for cell in probes[qi]:
+                ids, codes = self._cell(cell)
+                if not len(ids):
+                    continue
+                if codebooks is None:
+                    scores = codes @ queries[qi]
+                else:
+                    approx = np.take(lut[qi], codes + lut_offsets).sum(axis=1)
+                    scores = coarse[qi, cell] + approx
+                id_parts.append(ids)
+                score_parts.append(scores)
+            if not id_parts:
+                continue
+            ids = np.concatenate(id_parts)
+            scores = np.concatenate(score_parts)
+            if self._removed:
+                live = ~np.isin(ids, self._removed_sorted)
+                ids, scores = ids[live], scores[live]
+                if not len(ids):
+                    continue
+            top = min(k, len(ids))
+            best = np.argpartition(-scores, top - 1)[:top]
+            best = best[np.argsort(-scores[best], kind="stable")]
+            out_scores[qi, :top] = scores[best]
+            out_ids[qi, :top] = ids[best]
+        return out_scores, out_ids
+
+    # ---------------------------------------------------------- persistence
+
+    def save(self, directory: str | Path) -> None:
+        """Write the index to ``directory``, replacing any previous save atomically."""
+        with replace_directory(directory) as staging:
+            self.write(staging)
+
+    def write(self, directory: Path) -> None:
+        """Compact, then write the index files into an existing, empty ``directory``."""
+        centroids = self._trained_centroids()
+        self.compact()
+        cells = [self._cell(cell) for cell in range(self.nlist)]
+        sizes = np.array([len(ids) for ids, _ in cells], dtype=np.int64)
+        np.save(directory / "centroids.npy", centroids)
+        if self.codebooks is not None:
+            np.save(directory / "codebooks.npy", self.codebooks)
+        np.save(directory / "offsets.npy", np.concatenate([[0], np.cumsum(sizes)]))
+        np.save(directory / "ids.npy", np.concatenate([np.empty(0, np.int64)] + [
+            ids for ids, _ in cells
+        ]))
+        np.save(directory / "codes.npy", np.concatenate([self._no_codes()] + [
+            codes for _, codes in cells
+        ]))
+        # Written last: its presence marks a complete index.
+        meta = {"dim": self.dim, "nlist": self.nlist, "nprobe": self.nprobe, "pq_m": self.pq_m}
+        (directory / "index.json").write_text(json.dumps(meta), encoding="utf-8")
+
+    @classmethod
+    def load(cls, directory: str | Path, mmap: bool = True) -> IVFIndex:
+        directory = Path(directory)
+        meta = json.loads((directory / "index.json").read_text(encoding="utf-8"))
+        mode: Literal["r"] | None = "r" if mmap else None
+        index = cls(meta["dim"], meta["nlist"], meta["nprobe"], meta["pq_m"])
+        index.centroids = np.load(directory / "centroids.npy")
+        if index.pq_m is not None:
+            index.codebooks = np.load(directory / "codebooks.npy")
+        offsets = np.load(directory / "offsets.npy")
+        ids = np.load(directory / "ids.npy", mmap_mode=mode)
+        codes = np.load(directory / "codes.npy", mmap_mode=mode)
+        index._lists = [
+            [(ids[lo:hi], codes[lo:hi])] if hi > lo else []
+            for lo, hi in pairwise(offsets)
+        ]
+        index.ntotal = int(offsets[-1])
+        return index
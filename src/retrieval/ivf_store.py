@@ -0,0 +1,234 @@
+"""Vector store backed by an approximate IVF / IVF-PQ index.
+
+Until ``train_size`` documents have been added there is nothing to cluster,
+so documents are kept in a small exact-search buffer.  Once it fills up the
+index is trained on the buffered embeddings and every later document is
+added to it incrementally.  ``add_many`` and ``query_many`` embed, encode
+and search whole batches at once.  Deletes and updates remove the old vector
+from the buffer or tombstone it in the index, so it never takes a result
+slot.  Filtered queries over-fetch, and search again with twice the ``k``
+until ``top_k`` matches are found or the probed cells run out.
+"""
+from __future__ import annotations
+
+import json
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from src.core.logging_config import get_logger
+from src.retrieval.base_vector_store import BaseVectorStore
+from src.retrieval.embedding import Embedder, HashingEmbedder, with_cache
+from src.retrieval.ivf_index import IVFIndex, replace_directory
+
+logger = get_logger(__name__)
+
+
+class IVFVectorStore(BaseVectorStore):
+    """Approximate cosine-similarity search that scales to millions of documents."""
+
+    def __init__(
+        self,
+        embedder: Embedder | None = None,
+        nlist: int = 256,
+        nprobe: int = 8,
+        pq_m: int | None = 16,
+        train_size: int | None = None,
+        overfetch: int = 4,
+    ) -> None:
+        self._embedder = with_cache(embedder or HashingEmbedder())
+        self._index = IVFIndex(self._embedder.dim, nlist=nlist, nprobe=nprobe, pq_m=pq_m)
+        self._train_size = train_size or nlist * 39
+        self._overfetch = overfetch
+        self._next_id = 0
+        self._docs: dict[int, tuple[str, str, dict]] = {}
+        self._internal: dict[str, int] = {}
+        self._buffer_ids: list[int] = []
+        self._buffer_vectors: list[np.ndarray] = []
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    @property
+    def index(self) -> IVFIndex:
+        return self._index
+
+    def _add_vectors(self, ids: list[int], vectors: np.ndarray) -> None:
+        if self._index.is_trained:
+            self._index.add(np.asarray(ids), vectors)
+            return
+        self._buffer_ids.extend(ids)
+        self._buffer_vectors.extend(vectors)
+        if len(self._buffer_ids) >= self._train_size:
+            self.train()
+
+    def _forget(self, internal_ids: list[int]) -> None:
+        """Drop the vectors of replaced or deleted documents."""
+        if not internal_ids:
+            return
+        if self._index.is_trained:
+            self._index.remove(np.asarray(internal_ids))
+            return
+        gone = set(internal_ids)
+        kept = [row for row, internal in enumerate(self._buffer_ids) if internal not in gone]
+        self._buffer_ids = [self._buffer_ids[row] for row in kept]
+        self._buffer_vectors = [self._buffer_vectors[row] for row in kept]
+
+    def train(self) -> None:
+        """Train the index on the buffered documents and move them into it."""
+        if self._index.is_trained or not self._buffer_ids:
+            return
+        vectors = np.stack(self._buffer_vectors)
+        self._index.train(vectors)
+        self._index.add(np.asarray(self._buffer_ids), vectors)
+        logger.info(
+            "ivf_store_trained",
+            extra={"documents": len(self._buffer_ids), "nlist": self._index.nlist},
+        )
+        self._buffer_ids, self._buffer_vectors = [], []
+
+    def _search(self, queries: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        if self._index.is_trained or not self._buffer_ids:
+            return self._index.search(queries, k)
+        scores = queries @ np.stack(self._buffer_vectors).T
+        order = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+        return np.take_along_axis(scores, order, axis=1), np.asarray(self._buffer_ids)[order]
+
+    def _results(
+        self, scores: np.ndarray, ids: np.ndarray, top_k: int, where: dict | None
+    ) -> list[dict[str, Any]]:
+        results = []
+        for score, internal in zip(scores, ids):
+            doc = self._docs.get(int(internal))
+            if doc is None:
+                continue
+            doc_id, text, metadata = doc
+            if where and any(metadata.get(k) != v for k, v in where.items()):
+                continue
+            results.append(
+                {"id": doc_id, "text": text, "metadata": metadata, "score": float(score)}
+            )
+            if len(results) == top_k:
+                break
+        return results
+
+    async def add(self, doc_id: str, text: str, metadata: dict | None = None) -> None:
+        await self.add_many([doc_id], [text], [metadata])
+
+    async def add_many(
+        self,
+        doc_ids: Sequence[str],
+        texts: Sequence[str],
+        metadatas: Sequence[dict | None] | None = None,
+    ) -> None:
+        if not doc_ids:
+            return
+        metadatas = metadatas if metadatas is not None else [None] * len(doc_ids)
+        # The last occurrence of a repeated id wins, as with sequential adds.
+        positions = list({doc_id: i for i, doc_id in enumerate(doc_ids)}.values())
+        internal_ids, replaced = [], []
+        for i in positions:
+            old = self._internal.get(doc_ids[i])
+            if old is not None:
+                del self._docs[old]
+                replaced.append(old)
+            internal = self._next_id
+            self._next_id += 1
+            self._docs[internal] = (doc_ids[i], texts[i], metadatas[i] or {})
+            self._internal[doc_ids[i]] = internal
+            internal_ids.append(internal)
+        self._forget(replaced)
+        # Documents bypass the query cache; ingesting them would evict it.
+        vectors = self._embedder.uncached.embed_many([texts[i] for i in positions])
+        self._add_vectors(internal_ids, vectors)
+
+    async def query(
+        self, query_text: str, top_k: int = 5, where: dict | None = None
+    ) -> list[dict[str, Any]]:
+        return (await self.query_many([query_text], top_k, where))[0]
+
+    async def query_many(
+        self, query_texts: Sequence[str], top_k: int = 5, where: dict | None = None
+    ) -> list[list[dict[str, Any]]]:
+        if not query_texts:
+            return []
+        queries = self._embedder.embed_many(query_texts)
+        fetch = top_k * self._overfetch if where else top_k
+        results: list[list[dict[str, Any]]] = [[] for _ in query_texts]
+        pending = list(range(len(query_texts)))
+        while pending:
+            scores, ids = self._search(queries[pending], fetch)
+            short = []
+            for row, s, i in zip(pending, scores, ids):
+                results[row] = self._results(s, i, top_k, where)
+                # A full row of candidates may hide more matches further down.
+                if len(results[row]) < top_k and len(i) == fetch and i[-1] != -1:
+                    short.append(row)
+            pending, fetch = short, fetch * 2
+        return results
+
+    async def delete(self, doc_id: str) -> None:
+        internal = self._internal.pop(doc_id, None)
+        if internal is not None:
+            del self._docs[internal]
+            self._forget([internal])
+
+    async def clear(self) -> None:
+        index = self._index
+        self._index = IVFIndex(index.dim, nlist=index.nlist, nprobe=index.nprobe, pq_m=index.pq_m)
+        self._docs.clear()
+        self._internal.clear()
+        self._buffer_ids, self._buffer_vectors = [], []
+
+    # ---------------------------------------------------------- persistence
+
+    def save(self, directory: str | Path) -> None:
+        """
+        Persist the index (memory-mappable ``.npy`` files) and documents.
+
+        An untrained store keeps its buffer as is; it trains once
+        ``train_size`` documents have been added, before or after a reload.
+        The directory is replaced as a whole, never rewritten in place.
+        """
+        index = self._index
+        config = {
+            "nlist": index.nlist,
+            "nprobe": index.nprobe,
+            "pq_m": index.pq_m,
+            "train_size": self._train_size,
+        }
+        docs = [[internal, *doc] for internal, doc in self._docs.items()]
+        with replace_directory(directory) as staging:
+            if index.is_trained:
+                index.write(staging)
+            elif self._buffer_ids:
+                np.save(staging / "buffer_ids.npy", np.asarray(self._buffer_ids, dtype=np.int64))
+                np.save(staging / "buffer_vectors.npy", np.stack(self._buffer_vectors))
+            (staging / "documents.json").write_text(
+                json.dumps(
+                    {"config": config, "next_id": self._next_id, "documents": docs},
+                    default=str,
+                ),
+                encoding="utf-8",
+            )
+
+    @classmethod
+    def load(
+        cls, directory: str | Path, embedder: Embedder | None = None, overfetch: int = 4
+    ) -> IVFVectorStore:
+        """Open a saved store; index arrays are memory-mapped, not read."""
+        directory = Path(directory)
+        saved = json.loads((directory / "documents.json").read_text(encoding="utf-8"))
+        store = cls(embedder=embedder, overfetch=overfetch, **saved.get("config", {}))
+        if (directory / "index.json").exists():
+            store._index = IVFIndex.load(directory, mmap=True)
+        elif (directory / "buffer_ids.npy").exists():
+            store._buffer_ids = np.load(directory / "buffer_ids.npy").tolist()
+            store._buffer_vectors = list(np.load(directory / "buffer_vectors.npy"))
+        store._next_id = saved["next_id"]
+        for internal, doc_id, text, metadata in saved["documents"]:
+            store._docs[internal] = (doc_id, text, metadata)
+            store._internal[doc_id] = internal
+        return store
@@ -0,0 +1,172 @@
+"""In-process vector store backed by a single NumPy matrix.
+
+Embeddings live in one contiguous, preallocated float32 matrix that doubles
+in capacity when full.  Deletes only tombstone a row (it is masked out of
+search), and tombstoned rows are reclaimed by an in-place compaction once
+they make up half of the matrix.  A query is one matrix-vector product
+followed by ``argpartition`` to pick the top-k without a full sort;
+``add_many`` and ``query_many`` embed and score a whole batch at once.
+"""
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+
+from src.core.logging_config import get_logger
+from src.retrieval.base_vector_store import BaseVectorStore
+from src.retrieval.embedding import Embedder, HashingEmbedder, with_cache
+
+logger = get_logger(__name__)
+
+
+class NumpyVectorStore(BaseVectorStore):
+    """Exact cosine-similarity search over locally embedded documents."""
+
+    def __init__(
+        self,
+        embedder: Embedder | None = None,
+        initial_capacity: int = 1024,
+        compaction_min_rows: int = 1024,
+    ) -> None:
+        self._embedder = with_cache(embedder or HashingEmbedder())
+        self._compaction_min_rows = compaction_min_rows
+        self._vectors = np.zeros((max(1, initial_capacity), self._embedder.dim), np.float32)
+        self._alive = np.zeros(len(self._vectors), dtype=bool)
+        self._size = 0  # Rows in use, live or tombstoned.
+        self._ids: list[str | None] = []
+        self._texts: list[str | None] = []
+        self._metadata: list[dict | None] = []
+        self._row_of: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def _grow(self, needed: int) -> None:
+        capacity = len(self._vectors)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        vectors = np.zeros((capacity, self._embedder.dim), np.float32)
+        vectors[:self._size] = self._vectors[:self._size]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:self._size] = self._alive[:self._size]
+        self._vectors, self._alive = vectors, alive
+
+    def _row_for(self, doc_id: str, text: str, metadata: dict | None) -> int:
+        """Row holding ``doc_id``, appending one if new.  Capacity must already fit."""
+        row = self._row_of.get(doc_id)
+        if row is None:
+            row = self._size
+            self._size += 1
+            self._ids.append(doc_id)
+            self._texts.append(text)
+            self._metadata.append(metadata or {})
+            self._row_of[doc_id] = row
+        else:
+            self._texts[row] = text
+            self._metadata[row] = metadata or {}
+        return row
+
+    def _candidates(self, where: dict | None) -> np.ndarray:
+        """Boolean mask of live rows whose metadata matches every ``where`` item."""
+        mask = self._alive[:self._size].copy()
+        if where:
+            for row in np.flatnonzero(mask):
+                meta = self._metadata[row] or {}
+                if any(meta.get(k) != v for k, v in where.items()):
+                    mask[row] = False
+        return mask
+
+    def _top_k(self, scores: np.ndarray, top_k: int) -> list[dict[str, Any]]:
+        k = min(top_k, int(np.isfinite(scores).sum()))
+        if k <= 0:
+            return []
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [
+            {
+                "id": self._ids[row],
+                "text": self._texts[row],
+                "metadata": self._metadata[row],
+                "score": float(scores[row]),
+            }
+            for row in best
+        ]
+
+    async def add(self, doc_id: str, text: str, metadata: dict | None = None) -> None:
+        await self.add_many([doc_id], [text], [metadata])
+
+    async def add_many(
+        self,
+        doc_ids: Sequence[str],
+        texts: Sequence[str],
+        metadatas: Sequence[dict | None] | None = None,
+    ) -> None:
+        if not doc_ids:
+            return
+        metadatas = metadatas if metadatas is not None else [None] * len(doc_ids)
+        # The last occurrence of a repeated id wins, as with sequential adds.
+        latest = {doc_id: i for i, doc_id in enumerate(doc_ids)}
+        positions = list(latest.values())
+        # Documents bypass the query cache; ingesting them would evict it.
+        vectors = self._embedder.uncached.embed_many([texts[i] for i in positions])
+        self._grow(self._size + len(positions))
+        rows = [self._row_for(doc_ids[i], texts[i], metadatas[i]) for i in positions]
+        self._vectors[rows] = vectors
+        self._alive[rows] = True
+
+    async def query(
+        self, query_text: str, top_k: int = 5, where: dict | None = None
+    ) -> list[dict[str, Any]]:
+        return (await self.query_many([query_text], top_k, where))[0]
+
+    async def query_many(
+        self, query_texts: Sequence[str], top_k: int = 5, where: dict | None = None
+    ) -> list[list[dict[str, Any]]]:
+        if not self._size:
+            return [[] for _ in query_texts]
+        queries = self._embedder.embed_many(query_texts)
+        scores = queries @ self._vectors[:self._size].T
+        scores[:, ~self._candidates(where)] = -np.inf
+        results = [self._top_k(row, top_k) for row in scores]
+        logger.debug(
+            "numpy_store_query",
+            extra={"queries": len(query_texts), "indexed": len(self)},
+        )
+        return results
+
+    async def delete(self, doc_id: str) -> None:
+        row = self._row_of.pop(doc_id, None)
+        if row is None:
+            return
+        self._alive[row] = False
+        self._ids[row] = self._texts[row] = self._metadata[row] = None
+        dead = self._size - len(self._row_of)
+        if dead >= self._compaction_min_rows and dead * 2 >= self._size:
+            self.compact()
+
+    def compact(self) -> None:
+        """Squeeze out tombstoned rows, preserving insertion order."""
+        live = np.flatnonzero(self._alive[:self._size])
+        count = len(live)
+        self._vectors[:count] = self._vectors[live]
+        self._vectors[count:self._size] = 0.0
+        self._alive[:count] = True
+        self._alive[count:self._size] = False
+        self._ids = [self._ids[row] for row in live]
+        self._texts = [self._texts[row] for row in live]
+        self._metadata = [self._metadata[row] for row in live]
+        self._row_of = {
+            doc_id: row for row, doc_id in enumerate(self._ids) if doc_id is not None
+        }
+        self._size = count
+
+    async def clear(self) -> None:
+        self._vectors[:self._size] = 0.0
+        self._alive[:] = False
+        self._size = 0
+        self._ids, self._texts, self._metadata = [], [], []
+        self._row_of.clear()
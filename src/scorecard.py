@@ -0,0 +1,254 @@
+"""Points-based credit scorecard built from Weight-of-Evidence bins.
+
+``build_scorecard`` bins each feature so that the default rate is monotonic
+across bins, replaces values with the bin's Weight of Evidence (WoE), fits a
+logistic regression on the WoE values and scales the result to integer
+points per bin.  Pre-binning and event counting are vectorized; only the
+bin-merging step loops, over a few dozen bins.
+
+Scoring with a ``Scorecard`` needs no floating-point model: each feature is
+binned and the integer points are summed from a lookup table.  A value's
+bin is the number of edges at or below it (what ``searchsorted(side="right")``
+returns).  With the handful of edges a scorecard has, counting them with one
+vectorized comparison per edge is several times faster than the binary
+search, so ``searchsorted`` is only used for long edge lists.  A request
+for a few rows costs more in numpy call overhead than in arithmetic, so
+small batches are scored with ``bisect`` over plain Python lists.  The points
+table (``Scorecard.table()``) is the whole model, which makes it easy to
+audit.
+
+Missing values have no bin: the training pipeline drops rows with missing
+features, so ``build_scorecard`` and ``Scorecard.score`` reject NaN with a
+``ValueError`` rather than silently scoring it as some bin.
+
+Scaling follows the usual convention: ``base_score`` points at good:bad odds
+of ``base_odds``, and every ``pdo`` points double the odds.
+"""
+from __future__ import annotations
+
+import math
+from bisect import bisect_right
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+
+# Added to good/bad counts so a bin without events has a finite WoE.
+_SMOOTHING = 0.5
+
+# Up to this many edges, bin by counting comparisons instead of searchsorted.
+_COMPARE_MAX_EDGES = 32
+
+# Batches up to this many rows are scored in pure Python.
+_SMALL_BATCH = 16
+
+
+def bin_index(edges: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Bin of each value: the number of ``edges`` that are <= it."""
+    if len(edges) > _COMPARE_MAX_EDGES:
+        return np.searchsorted(edges, values, side="right")
+    idx = np.zeros(len(values), dtype=np.uint8)
+    for edge in edges:
+        idx += values >= edge
+    return idx
+
+
+def _reject_missing(X: np.ndarray, feature_names: Sequence[Any]) -> None:
+    """Raise ``ValueError`` naming the features of ``X`` that contain NaN."""
+    missing = np.isnan(X).any(axis=0)
+    if missing.any():
+        names = [str(feature_names[int(j)]) for j in np.flatnonzero(missing)]
+        raise ValueError(f"scorecard features must not be missing (NaN): {', '.join(names)}")
+
+
+def _merge(edges: list[float], total: list[float], bad: list[float], i: int) -> None:
+    """Merge bin ``i + 1`` into bin ``i``."""
+    total[i] += total.pop(i + 1)
+    bad[i] += bad.pop(i + 1)
+    del edges[i]
+
+
+def monotonic_bins(
+    x: np.ndarray,
+    y: np.ndarray,
+    max_bins: int = 8,
+    min_bin_share: float = 0.05,
+    prebins: int = 20,
+) -> np.ndarray:
+    """
+    Interior bin edges for ``x`` with a monotonic default rate.
+
+    Starts from ``prebins`` quantile bins, merges adjacent bins that break
+    monotonicity (in the direction of the overall trend), then bins smaller
+    than ``min_bin_share`` of the rows, then the most similar neighbours
+    until at most ``max_bins`` remain.  Bins are ``edges[k-1] <= x < edges[k]``.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.unique(np.quantile(x, np.linspace(0, 1, prebins + 1)[1:-1]))
+    idx = bin_index(edges, x)
+    total_arr = np.bincount(idx, minlength=len(edges) + 1).astype(np.float64)
+    bad_arr = np.bincount(idx, weights=y, minlength=len(edges) + 1)
+    edges_l, total, bad = edges.tolist(), total_arr.tolist(), bad_arr.tolist()
+
+    # Empty bins (possible when a quantile lands on a repeated value).
+    i = 0
+    while i < len(total) and len(total) > 1:
+        if total[i] == 0:
+            _merge(edges_l, total, bad, i - 1 if i > 0 else i)
+        else:
+            i += 1
+
+    corr = np.corrcoef(idx, y)[0, 1] if len(total) > 1 else 0.0
+    direction = 1.0 if not np.isfinite(corr) or corr >= 0 else -1.0
+
+    def rates() -> np.ndarray:
+        return np.asarray(bad) / np.asarray(total)
+
+    # Pool adjacent violators until the default rate is monotonic.
+    while len(total) > 1:
+        violations = np.flatnonzero(np.diff(rates()) * direction < 0)
+        if not len(violations):
+            break
+        _merge(edges_l, total, bad, int(violations[0]))
+
+    n = float(len(x))
+    while len(total) > 1 and min(total) < min_bin_share * n:
+        k = int(np.argmin(total))
+        r = rates()
+        if k == 0:
+            _merge(edges_l, total, bad, 0)
+        elif k == len(total) - 1 or abs(r[k] - r[k - 1]) <= abs(r[k + 1] - r[k]):
+            _merge(edges_l, total, bad, k - 1)
+        else:
+            _merge(edges_l, total, bad, k)
+
+    while len(total) > max_bins:
+        _merge(edges_l, total, bad, int(np.argmin(np.abs(np.diff(rates())))))
+
+    return np.asarray(edges_l, dtype=np.float64)
+
+
+def woe_table(
+    x: np.ndarray, y: np.ndarray, edges: np.ndarray
+) -> tuple[np.ndarray, float]:
+    """WoE (ln %good / %bad) for each bin of ``edges``, and the information value."""
+    idx = bin_index(edges, x)
+    bins = len(edges) + 1
+    total = np.bincount(idx, minlength=bins).astype(np.float64)
+    bad = np.bincount(idx, weights=np.asarray(y, dtype=np.float64), minlength=bins)
+    good = total - bad
+    dist_good = (good + _SMOOTHING) / (good.sum() + _SMOOTHING * bins)
+    dist_bad = (bad + _SMOOTHING) / (bad.sum() + _SMOOTHING * bins)
+    woe = np.log(dist_good / dist_bad)
+    return woe, float(np.sum((dist_good - dist_bad) * woe))
+
+
+class Scorecard:
+    """Integer points per bin per feature, plus base points."""
+
+    def __init__(
+        self,
+        feature_names: Sequence[str],
+        edges: Sequence[np.ndarray],
+        points: Sequence[np.ndarray],
+        base_points: int,
+        factor: float,
+        offset: float,
+        woe: Sequence[np.ndarray] | None = None,
+        information_value: Sequence[float] | None = None,
+    ) -> None:
+        self.feature_names = list(feature_names)
+        self.edges = [np.asarray(e, dtype=np.float64) for e in edges]
+        self.points = [np.asarray(p, dtype=np.int32) for p in points]
+        self.base_points = int(base_points)
+        self.factor = factor
+        self.offset = offset
+        self.woe = [np.asarray(w) for w in woe] if woe is not None else None
+        self.information_value = list(information_value) if information_value else None
+        self._edge_lists = [e.tolist() for e in self.edges]
+        self._point_lists = [p.tolist() for p in self.points]
+
+    def score(self, X: np.ndarray) -> np.ndarray:
+        """
+        Integer score per row of ``X`` (columns in ``feature_names`` order).
+
+        Raises ``ValueError`` if any value is NaN.
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        _reject_missing(X, self.feature_names)
+        if len(X) <= _SMALL_BATCH:
+            tables = list(zip(self._edge_lists, self._point_lists))
+            return np.array(
+                [
+                    self.base_points
+                    + sum(points[bisect_right(edges, v)] for (edges, points), v in zip(tables, row))
+                    for row in X.tolist()
+                ],
+                dtype=np.int32,
+            )
+        # Column-major so each feature's values are contiguous.
+        X = np.asfortranarray(X)
+        total = np.full(len(X), self.base_points, dtype=np.int32)
+        for j, (edges, points) in enumerate(zip(self.edges, self.points)):
+            total += np.take(points, bin_index(edges, X[:, j]))
+        return total
+
+    def default_probability(self, scores: np.ndarray) -> np.ndarray:
+        """Probability of default implied by the points scaling."""
+        log_odds_good = (np.asarray(scores, dtype=np.float64) - self.offset) / self.factor
+        return 1.0 / (1.0 + np.exp(log_odds_good))
+
+    def table(self) -> list[dict[str, Any]]:
+        """One row per (feature, bin): range, WoE and points, for review."""
+        rows = []
+        for j, name in enumerate(self.feature_names):
+            bounds = [-math.inf, *self.edges[j].tolist(), math.inf]
+            for k, points in enumerate(self.points[j].tolist()):
+                row = {"feature": name, "lower": bounds[k], "upper": bounds[k + 1], "points": points}
+                if self.woe is not None:
+                    row["woe"] = float(self.woe[j][k])
+                rows.append(row)
+        return rows
+
+
+def build_scorecard(
+    X: np.ndarray,
+    y: np.ndarray,
+    feature_names: Sequence[Any] | None = None,
+    max_bins: int = 8,
+    min_bin_share: float = 0.05,
+    base_score: float = 600.0,
+    base_odds: float = 50.0,
+    pdo: float = 20.0,
+    C: float = 1.0,
+) -> Scorecard:
+    """Bin, WoE-transform, fit and scale a scorecard on training data."""
+    if feature_names is None:
+        feature_names = list(getattr(X, "columns", range(np.shape(X)[1])))
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    _reject_missing(X, feature_names)
+
+    edges, woes, ivs = [], [], []
+    woe_matrix = np.empty_like(X)
+    for j in range(X.shape[1]):
+        feature_edges = monotonic_bins(X[:, j], y, max_bins=max_bins, min_bin_share=min_bin_share)
+        woe, iv = woe_table(X[:, j], y, feature_edges)
+        woe_matrix[:, j] = woe[bin_index(feature_edges, X[:, j])]
+        edges.append(feature_edges)
+        woes.append(woe)
+        ivs.append(iv)
+
+    model = LogisticRegression(C=C, max_iter=1000).fit(woe_matrix, y)
+    beta, intercept = model.coef_[0], float(model.intercept_[0])
+
+    # score = offset + factor * ln(good:bad odds), and ln(good:bad) = -logit(default).
+    factor = pdo / math.log(2)
+    offset = base_score - factor * math.log(base_odds)
+    points = [np.rint(-factor * beta[j] * woes[j]).astype(np.int32) for j in range(X.shape[1])]
+    base_points = round(offset - factor * intercept)
+    return Scorecard(
+        feature_names, edges, points, base_points, factor, offset, woe=woes, information_value=ivs
+    )
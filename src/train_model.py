@@ -1,11 +1,22 @@
-import pandas as pd
-import numpy as np
+import argparse
+from pathlib import Path
 
-from sklearn.model_selection import train_test_split
+import joblib
+import numpy as np
+import pandas as pd
 from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import accuracy_score, confusion_matrix, classification_report
+from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 
+from src.drift_monitor import ReferenceProfile
+from src.logistic_solver import NewtonLogisticRegression
+from src.scorecard import build_scorecard
+from src.similar_applicants import SimilarApplicantIndex
+
+MODEL_ARTIFACT_PATH = "models/credit_model.joblib"
+SCORECARD_ARTIFACT_PATH = "models/scorecard.joblib"
+
 
 def load_and_preprocess_data(file_path):
     """
@@ -44,12 +55,18 @@ def load_and_preprocess_data(file_path):
     return X, y
 
 
-def train_model(X_train, y_train):
+def train_model(X_train, y_train, solver="lbfgs", sample_weight=None):
     """
     Train Logistic Regression model.
+
+    ``solver="newton"`` uses the in-house ``NewtonLogisticRegression``
+    (same objective, per-iteration history in ``model.history_``).
     """
-    model = LogisticRegression(max_iter=1000)
-    model.fit(X_train, y_train)
+    if solver == "newton":
+        model = NewtonLogisticRegression()
+    else:
+        model = LogisticRegression(max_iter=1000)
+    model.fit(X_train, y_train, sample_weight=sample_weight)
     return model
 
 
@@ -68,7 +85,40 @@ def evaluate_model(model, X_test, y_test):
     print(classification_report(y_test, y_pred))
 
 
+def export_model(model, scaler, X_train, y_train, path=MODEL_ARTIFACT_PATH):
+    """
+    Save the model, scaler, a similar-applicant index and the drift
+    reference distribution as one artifact.
+    """
+    X_train_scaled = scaler.transform(X_train)
+    index = SimilarApplicantIndex(
+        scaled_features=X_train_scaled,
+        outcomes=np.asarray(y_train),
+        feature_names=list(X_train.columns),
+        raw_features=X_train.to_numpy(),
+    )
+    artifact = {
+        "model": model,
+        "scaler": scaler,
+        "features": list(X_train.columns),
+        "similar_applicants": index,
+        "drift_reference": ReferenceProfile.fit(
+            X_train.to_numpy(),
+            list(X_train.columns),
+            scores=model.predict_proba(X_train_scaled)[:, 1],
+        ),
+    }
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    joblib.dump(artifact, path)
+    print(f"\nModel artifact saved to {path}")
+    return artifact
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Train and export the credit model.")
+    parser.add_argument("--solver", choices=["lbfgs", "newton"], default="lbfgs")
+    args = parser.parse_args()
+
     # File path (update if needed)
     file_path = "data/default of credit card clients.xls"
 
@@ -86,7 +136,10 @@ def main():
     X_test_scaled = scaler.transform(X_test)
 
     # Train model
-    model = train_model(X_train_scaled, y_train)
+    model = train_model(X_train_scaled, y_train, solver=args.solver)
+    if args.solver == "newton":
+        print("\nNewton iterations:")
+        print(pd.DataFrame(model.history_).to_string(index=False))
 
     # Evaluate model
     evaluate_model(model, X_test_scaled, y_test)
@@ -100,6 +153,17 @@ def main():
     print("\nModel Coefficients (Interpretability):")
     print(coef_df)
 
+    # Persist model, scaler and similar-applicant index for the ScoringAgent
+    export_model(model, scaler, X_train, y_train)
+
+    # Points-based scorecard on WoE bins, for review alongside the model
+    scorecard = build_scorecard(X_train, y_train)
+    print("\nScorecard (points per bin):")
+    print(pd.DataFrame(scorecard.table()).to_string(index=False))
+    print("Base points:", scorecard.base_points)
+    joblib.dump(scorecard, SCORECARD_ARTIFACT_PATH)
+    print(f"Scorecard saved to {SCORECARD_ARTIFACT_PATH}")
+
 
 if __name__ == "__main__":
     main()
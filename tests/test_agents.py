@@ -1,11 +1,15 @@
 """Tests for BaseAgent, AgentRegistry, CoordinatorAgent, and TaskAgent."""
 from __future__ import annotations
 
+import asyncio
+
 import pytest
 
-from src.agents.registry import AgentRegistry
 from src.agents.coordinator_agent import CoordinatorAgent
+from src.agents.hedging import HedgePolicy, LatencyTracker
+from src.agents.registry import AgentRegistry
 from src.agents.task_agent import TaskAgent
+from src.core.metrics import HEDGE_FIRED, HEDGE_WON
 from src.protocol.message_schema import A2AMessage, MessageType
 
 
@@ -83,3 +87,155 @@ async def test_health_check(populated_registry):
     health = await task.health_check()
     assert health["status"] == "healthy"
     assert health["agent_type"] == "task"
+
+
+@pytest.fixture
+async def hedged_registry():
+    r = AgentRegistry()
+    coordinator = CoordinatorAgent(
+        registry=r,
+        hedge_policy=HedgePolicy(initial_delay_seconds=0.01, budget_ratio=0.5, budget_burst=1.0),
+    )
+    replicas = [TaskAgent(), TaskAgent()]
+    await r.register(coordinator)
+    for replica in replicas:
+        await r.register(replica)
+    yield coordinator, replicas
+    await r.shutdown_all()
+
+
+def _stall(agent, cancelled: list):
+    async def stalled_handle(message):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(agent.agent_id)
+            raise
+
+    return stalled_handle
+
+
+@pytest.mark.asyncio
+async def test_hedge_wins_when_primary_stalls(hedged_registry, monkeypatch):
+    coordinator, replicas = hedged_registry
+    cancelled: list[str] = []
+    monkeypatch.setattr(replicas[0], "handle", _stall(replicas[0], cancelled))
+    fired, won = HEDGE_FIRED._value.get(), HEDGE_WON._value.get()
+    msg = A2AMessage(
+        sender_id="test",
+        message_type=MessageType.TASK_REQUEST,
+        payload={"task_type": "echo", "data": {}},
+    )
+    response = await asyncio.wait_for(coordinator.handle(msg), timeout=1)
+    assert response.success is True
+    assert response.agent_id == replicas[1].agent_id
+    # The loser has been cancelled and reaped by the time the response returns.
+    assert cancelled == [replicas[0].agent_id]
+    assert HEDGE_FIRED._value.get() == fired + 1
+    assert HEDGE_WON._value.get() == won + 1
+
+
+@pytest.mark.asyncio
+async def test_hedge_budget_caps_duplicates(hedged_registry, monkeypatch):
+    coordinator, replicas = hedged_registry
+    slow_primary_calls = 0
+
+    async def slow_handle(message):
+        nonlocal slow_primary_calls
+        slow_primary_calls += 1
+        await asyncio.sleep(0.03)
+        return await TaskAgent.handle(replicas[0], message)
+
+    monkeypatch.setattr(replicas[0], "handle", slow_handle)
+    monkeypatch.setattr(replicas[1], "handle", slow_handle)
+    fired = HEDGE_FIRED._value.get()
+    for _ in range(4):
+        msg = A2AMessage(
+            sender_id="test",
+            message_type=MessageType.TASK_REQUEST,
+            payload={"task_type": "echo", "data": {}},
+        )
+        assert (await coordinator.handle(msg)).success is True
+    # Burst of one token plus 0.5 per request: at most 2 hedges over 4 requests.
+    assert HEDGE_FIRED._value.get() - fired <= 2
+    assert slow_primary_calls <= 6
+
+
+@pytest.mark.asyncio
+async def test_hedge_survives_a_cancelled_primary(hedged_registry, monkeypatch):
+    coordinator, replicas = hedged_registry
+
+    async def cancelled_handle(message):
+        await asyncio.sleep(0.03)
+        raise asyncio.CancelledError
+
+    async def slow_handle(message):
+        await asyncio.sleep(0.05)
+        return await TaskAgent.handle(replicas[1], message)
+
+    monkeypatch.setattr(replicas[0], "handle", cancelled_handle)
+    monkeypatch.setattr(replicas[1], "handle", slow_handle)
+    msg = A2AMessage(
+        sender_id="test",
+        message_type=MessageType.TASK_REQUEST,
+        payload={"task_type": "echo", "data": {}},
+    )
+    response = await asyncio.wait_for(coordinator.handle(msg), timeout=1)
+    assert response.success is True
+    assert response.agent_id == replicas[1].agent_id
+
+
+def test_latency_tracker_percentile():
+    tracker = LatencyTracker(window=100)
+    for ms in range(1, 101):
+        tracker.observe(ms / 1000)
+    assert tracker.percentile(0.95) == pytest.approx(0.096)
+    assert tracker.percentile(0.5) == pytest.approx(0.051)
+
+
+@pytest.mark.asyncio
+async def test_task_agent_lists_results_by_prefix(populated_registry):
+    _, _, task = populated_registry
+    ids = []
+    for i in range(3):
+        msg = A2AMessage(
+            sender_id="test",
+            message_type=MessageType.TASK_REQUEST,
+            payload={"task_type": "echo", "data": {"i": i}},
+        )
+        await task.handle(msg)
+        ids.append(msg.message_id)
+    query = A2AMessage(
+        sender_id="test",
+        message_type=MessageType.MEMORY_QUERY,
+        payload={"prefix": "task:"},
+    )
+    response = await task.handle(query)
+    assert set(response.payload["items"]) == {f"task:{i}" for i in ids}
+
+
+@pytest.mark.asyncio
+async def test_task_agent_restarts_warm_from_snapshot(tmp_path):
+    path = str(tmp_path / "task_agent.snap")
+    first = AgentRegistry()
+    task = TaskAgent(snapshot_path=path)
+    await first.register(task)
+    msg = A2AMessage(
+        sender_id="test",
+        message_type=MessageType.TASK_REQUEST,
+        payload={"task_type": "echo", "data": {"x": 1}},
+    )
+    await task.handle(msg)
+    await first.shutdown_all()
+
+    second = AgentRegistry()
+    restarted = TaskAgent(snapshot_path=path)
+    await second.register(restarted)
+    query = A2AMessage(
+        sender_id="test",
+        message_type=MessageType.MEMORY_QUERY,
+        payload={"key": f"task:{msg.message_id}"},
+    )
+    response = await restarted.handle(query)
+    assert response.payload["value"]["input"] == {"x": 1}
+    await second.shutdown_all()
@@ -0,0 +1,83 @@
+"""Tests for the app factory, readiness probe and request metrics."""
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+import httpx
+import pytest
+from prometheus_client import CollectorRegistry, multiprocess
+
+from src.api.main import create_app
+from src.api.metrics_middleware import UNMATCHED_ENDPOINT
+from src.core.config import Settings
+from src.core.metrics import MULTIPROC_DIR_ENV, REQUEST_COUNT
+
+
+def _settings(**overrides) -> Settings:
+    return Settings(log_async=False, log_level="WARNING", **overrides)
+
+
+def _client(app) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_ready_only_after_lifespan_startup():
+    app = create_app(_settings())
+    async with _client(app) as client:
+        assert (await client.get("/api/v1/ready")).status_code == 503
+        async with app.router.lifespan_context(app):
+            response = await client.get("/api/v1/ready")
+            assert response.status_code == 200
+            assert response.json() == {"status": "ready"}
+        assert (await client.get("/api/v1/ready")).status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_tasks_route_uses_the_app_state_orchestrator():
+    app = create_app(_settings(warmup_enabled=False))
+    async with app.router.lifespan_context(app), _client(app) as client:
+        response = await client.post(
+            "/api/v1/tasks",
+            json={"task_type": "analyse", "data": {"x": 1}},
+            headers={"X-Correlation-ID": "trace-1"},
+        )
+        assert response.status_code == 200
+        assert response.json()["success"] is True
+
+
+def _requests(endpoint: str, method: str) -> float:
+    return REQUEST_COUNT.labels(endpoint=endpoint, method=method)._value.get()
+
+
+@pytest.mark.asyncio
+async def test_middleware_labels_requests_by_route_template():
+    app = create_app(_settings(warmup_enabled=False))
+    template = "/api/v1/agents/{agent_id}/health"
+    before = _requests(template, "GET"), _requests(UNMATCHED_ENDPOINT, "GET")
+    async with app.router.lifespan_context(app), _client(app) as client:
+        agent_id = (await client.get("/api/v1/agents")).json()["agents"][0]["agent_id"]
+        assert (await client.get(f"/api/v1/agents/{agent_id}/health")).status_code == 200
+        assert (await client.get("/api/v1/agents/missing/health")).status_code == 404
+        assert (await client.get("/no/such/route")).status_code == 404
+    assert _requests(template, "GET") == before[0] + 2
+    assert _requests(UNMATCHED_ENDPOINT, "GET") == before[1] + 1
+
+
+def test_multiprocess_mode_aggregates_across_workers(tmp_path):
+    script = (
+        "from src.core.metrics import REQUEST_COUNT;"
+        "REQUEST_COUNT.labels(endpoint='/mp', method='GET').inc(3)"
+    )
+    env = {**os.environ, MULTIPROC_DIR_ENV: str(tmp_path), "PYTHONPATH": os.getcwd()}
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", script], env=env, check=True)
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path=str(tmp_path))
+    value = registry.get_sample_value(
+        "agent_api_requests_total", {"endpoint": "/mp", "method": "GET"}
+    )
+    assert value == 6
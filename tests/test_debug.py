@@ -0,0 +1,100 @@
+"""Tests for the sampling profiler, task dumps, loop lag monitor and debug router."""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from src.api.debug_router import debug_router, get_debug_token
+from src.core.profiler import LoopLagMonitor, SamplingProfiler, collapse, task_stacks
+
+
+def _spin_until(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_profiler_returns_collapsed_stacks_for_busy_threads():
+    stop = threading.Event()
+    worker = threading.Thread(target=_spin_until, args=(stop,), name="busy-worker")
+    worker.start()
+    try:
+        counts = SamplingProfiler(interval=0.001).sample(0.1, thread_ids={worker.ident})
+    finally:
+        stop.set()
+        worker.join()
+
+    assert counts
+    stack, _ = counts.most_common(1)[0]
+    assert stack.startswith("busy-worker;")
+    assert "_spin_until" in stack
+    line = collapse(counts).splitlines()[0]
+    assert line.rsplit(" ", 1)[1].isdigit()
+
+
+@pytest.mark.asyncio
+async def test_task_stacks_follow_the_await_chain():
+    async def inner_wait(event):
+        await event.wait()
+
+    async def outer(event):
+        await inner_wait(event)
+
+    event = asyncio.Event()
+    task = asyncio.create_task(outer(event), name="waiting-task")
+    await asyncio.sleep(0)
+    try:
+        [dump] = [t for t in task_stacks() if t["name"] == "waiting-task"]
+        assert "outer" in dump["stack"][0]
+        assert any("inner_wait" in frame for frame in dump["stack"])
+    finally:
+        event.set()
+        await task
+
+
+@pytest.mark.asyncio
+async def test_loop_lag_monitor_captures_the_blocking_frame():
+    monitor = LoopLagMonitor(interval=0.01, stall_threshold=0.05)
+    await monitor.start()
+    try:
+        await asyncio.sleep(0.03)
+        time.sleep(0.2)  # noqa: ASYNC251 - block the loop the way a sync handler would.
+        await asyncio.sleep(0.03)
+    finally:
+        await monitor.stop()
+
+    snapshot = monitor.snapshot()
+    assert snapshot["max_lag_seconds"] >= 0.15
+    assert snapshot["stalls"]
+    assert any(
+        "test_loop_lag_monitor_captures_the_blocking_frame" in frame
+        for frame in snapshot["stalls"][0]["stack"]
+    )
+
+
+def _client(token):
+    app = FastAPI()
+    app.include_router(debug_router)
+    app.dependency_overrides[get_debug_token] = lambda: token
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_debug_router_requires_the_token():
+    async with _client(None) as client:
+        assert (await client.get("/api/v1/debug/tasks")).status_code == 404
+    async with _client("s3cret") as client:
+        assert (await client.get("/api/v1/debug/tasks")).status_code == 401
+        response = await client.get(
+            "/api/v1/debug/tasks", headers={"Authorization": "Bearer wrong"}
+        )
+        assert response.status_code == 401
+        response = await client.get(
+            "/api/v1/debug/tasks", headers={"Authorization": "Bearer s3cret"}
+        )
+        assert response.status_code == 200
+        assert response.json()["count"] >= 1
@@ -0,0 +1,71 @@
+"""Tests for the streaming PSI drift monitor."""
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.core.metrics import DRIFT_PSI
+from src.drift_monitor import SCORE, DriftMonitor, ReferenceProfile, psi
+
+FEATURES = ["LIMIT_BAL", "AGE", "PAY_0"]
+
+
+def _sample(n: int, seed: int, age_shift: float = 0.0) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    X = np.column_stack(
+        [
+            rng.lognormal(11, 0.6, n),
+            rng.normal(36 + age_shift, 9, n),
+            rng.integers(-2, 4, n),
+        ]
+    )
+    scores = 1 / (1 + np.exp(-(X[:, 2] - 1)))
+    return X, scores
+
+
+@pytest.fixture
+def reference() -> ReferenceProfile:
+    X, scores = _sample(20_000, seed=0)
+    return ReferenceProfile.fit(X, FEATURES, scores)
+
+
+def test_reference_bins_have_expected_shares(reference):
+    assert reference.variables == FEATURES + [SCORE]
+    assert len(reference.edges["AGE"]) == 9
+    np.testing.assert_allclose(reference.expected["AGE"], 0.1, atol=0.01)
+    # PAY_0 takes six values, so its deciles collapse to fewer distinct edges.
+    assert len(reference.edges["PAY_0"]) < 9
+    assert reference.expected["PAY_0"].sum() == pytest.approx(1.0)
+
+
+def test_psi_flags_only_the_shifted_feature(reference):
+    stable = DriftMonitor(reference, half_life_rows=None, min_rows=0)
+    shifted = DriftMonitor(reference, half_life_rows=None, min_rows=0)
+    for batch in range(20):
+        stable.update(*_sample(500, seed=100 + batch))
+        shifted.update(*_sample(500, seed=100 + batch, age_shift=8.0))
+
+    assert max(stable.psi().values()) < 0.02
+    values = shifted.psi()
+    assert values["AGE"] > 0.25
+    assert max(v for name, v in values.items() if name != "AGE") < 0.02
+    shifted.publish()
+    assert DRIFT_PSI.labels(variable="AGE")._value.get() == pytest.approx(values["AGE"])
+
+
+def test_decay_forgets_old_traffic_in_constant_memory(reference):
+    monitor = DriftMonitor(reference, half_life_rows=2_000, min_rows=0)
+    size = monitor._counts.nbytes
+    monitor.update(*_sample(10_000, seed=1, age_shift=10.0))
+    assert monitor.psi()["AGE"] > 0.25
+    for batch in range(20):
+        monitor.update(*_sample(1_000, seed=200 + batch))
+    assert monitor.psi()["AGE"] < 0.05
+    # Steady state is about half_life / ln 2 rows, plus up to one batch.
+    assert monitor.rows < 2_000 / np.log(2) + 1_000
+    assert monitor._counts.nbytes == size
+
+
+def test_psi_of_identical_distributions_is_zero():
+    shares = np.array([0.2, 0.3, 0.5])
+    assert psi(shares, shares) == 0.0
@@ -0,0 +1,97 @@
+"""Tests for the structured JSON logging pipeline."""
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import sys
+
+import pytest
+
+from src.core.logging_config import (
+    _DroppingQueueHandler,
+    _JSONFormatter,
+    configure_logging,
+    get_logger,
+    shutdown_logging,
+)
+from src.core.metrics import LOG_RECORDS_DROPPED
+
+
+@pytest.fixture
+def restore_root_logger():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield
+    shutdown_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+def _dropped(reason: str) -> float:
+    return LOG_RECORDS_DROPPED.labels(reason=reason)._value.get()
+
+
+def test_json_formatter_merges_extra_fields_only():
+    record = logging.LogRecord("svc", logging.INFO, __file__, 1, "event_%s", ("x",), None)
+    record.message_id = "m-1"
+    entry = json.loads(_JSONFormatter().format(record))
+    assert entry["message"] == "event_x"
+    assert entry["message_id"] == "m-1"
+    assert "lineno" not in entry and "args" not in entry
+
+
+def test_async_logging_writes_from_background_thread(capsys, restore_root_logger):
+    configure_logging("INFO", asynchronous=True)
+    logger = get_logger("test.async")
+    logger.info("a2a_dispatch", extra={"message_id": "m-1"})
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("dispatch_failed")
+    shutdown_logging()
+
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [line["message"] for line in lines] == ["a2a_dispatch", "dispatch_failed"]
+    assert lines[0]["message_id"] == "m-1"
+    assert "ValueError: boom" in lines[1]["exc_info"]
+
+    logger.info("after_shutdown")  # Falls back to writing synchronously.
+    assert json.loads(capsys.readouterr().out)["message"] == "after_shutdown"
+
+
+def test_sampling_drops_hot_events_and_counts_them(capsys, restore_root_logger):
+    before = _dropped("sampled")
+    configure_logging("INFO", sample_rates={"task_agent_received": 0.0})
+    logger = get_logger("test.sampling")
+    for _ in range(5):
+        logger.info("task_agent_received")
+    logger.info("task_agent_startup")
+    out = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)["message"] for line in out] == ["task_agent_startup"]
+    assert _dropped("sampled") == before + 5
+
+
+def test_full_queue_drops_instead_of_blocking():
+    before = _dropped("queue_full")
+    handler = _DroppingQueueHandler(queue.Queue(maxsize=1))
+    record = logging.LogRecord("svc", logging.INFO, __file__, 1, "event", None, None)
+    handler.handle(record)
+    handler.handle(record)
+    assert _dropped("queue_full") == before + 1
+
+
+def test_prepare_leaves_the_callers_record_untouched():
+    handler = _DroppingQueueHandler(queue.Queue())
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.LogRecord(
+            "svc", logging.ERROR, __file__, 1, "failed %s", ("job",), sys.exc_info()
+        )
+    prepared = handler.prepare(record)
+    assert prepared is not record
+    assert prepared.msg == "failed job" and prepared.args is None
+    assert prepared.exc_info is None and "ValueError: boom" in prepared.exc_text
+    assert record.msg == "failed %s" and record.args == ("job",)
+    assert record.exc_info is not None
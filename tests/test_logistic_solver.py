@@ -0,0 +1,123 @@
+"""Tests for the Newton (IRLS) logistic regression solver."""
+from __future__ import annotations
+
+import warnings
+from itertools import pairwise
+
+import numpy as np
+import pytest
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.linear_model import LogisticRegression
+
+from src.logistic_solver import NewtonLogisticRegression, _loss
+from src.train_model import train_model
+
+
+def _problem(n: int = 5_000, seed: int = 0) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 5))
+    logit = X @ np.array([1.0, -0.5, 0.2, 0.0, 0.0]) - 1.0
+    y = (rng.random(n) < 1 / (1 + np.exp(-logit))).astype(int)
+    return X, y, rng.uniform(0.5, 2.0, n)
+
+
+def _sklearn(**kwargs) -> LogisticRegression:
+    return LogisticRegression(tol=1e-10, max_iter=10_000, **kwargs)
+
+
+@pytest.mark.parametrize("C", [1.0, 0.01])
+def test_l2_matches_sklearn_with_sample_weights(C):
+    X, y, weights = _problem()
+    ours = NewtonLogisticRegression(C=C).fit(X, y, sample_weight=weights)
+    ref = _sklearn(C=C).fit(X, y, sample_weight=weights)
+    np.testing.assert_allclose(ours.coef_, ref.coef_, atol=1e-6)
+    np.testing.assert_allclose(ours.intercept_, ref.intercept_, atol=1e-6)
+    np.testing.assert_allclose(ours.predict_proba(X), ref.predict_proba(X), atol=1e-6)
+    assert ours.converged_
+    assert ours.n_iter_[0] <= 10
+
+
+def test_elasticnet_matches_sklearn_and_zeroes_weak_features():
+    X, y, weights = _problem()
+    ours = NewtonLogisticRegression(C=0.005, penalty="elasticnet", l1_ratio=0.5)
+    ours.fit(X, y, sample_weight=weights)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        ref = _sklearn(C=0.005, penalty="elasticnet", l1_ratio=0.5, solver="saga")
+        ref.fit(X, y, sample_weight=weights)
+    np.testing.assert_allclose(ours.coef_, ref.coef_, atol=1e-5)
+    assert np.all(ours.coef_[0, 3:] == 0.0)
+
+
+def test_blocked_hessian_does_not_change_the_solution():
+    X, y, weights = _problem()
+    whole = NewtonLogisticRegression(block_rows=len(X)).fit(X, y, sample_weight=weights)
+    blocked = NewtonLogisticRegression(block_rows=333, n_threads=1).fit(X, y, sample_weight=weights)
+    np.testing.assert_allclose(blocked.coef_, whole.coef_, atol=1e-10)
+
+
+def test_history_records_a_decreasing_objective():
+    X, y, _ = _problem()
+    model = NewtonLogisticRegression().fit(X, y)
+    history = model.history_
+    assert len(history) == model.n_iter_[0]
+    objectives = [row["objective"] for row in history]
+    assert all(b <= a for a, b in pairwise(objectives))
+    assert history[-1]["max_change"] <= model.tol
+    assert all(row["seconds"] >= row["hessian_seconds"] >= 0 for row in history)
+
+
+def test_warm_start_resumes_from_previous_fit():
+    X, y, _ = _problem()
+    model = NewtonLogisticRegression(warm_start=True).fit(X, y)
+    first = model.coef_.copy()
+    model.fit(X, y)
+    assert model.n_iter_[0] == 1
+    np.testing.assert_allclose(model.coef_, first, atol=1e-10)
+
+
+def test_max_iter_warns_when_not_converged():
+    X, y, _ = _problem()
+    with pytest.warns(ConvergenceWarning):
+        model = NewtonLogisticRegression(max_iter=1).fit(X, y)
+    assert not model.converged_
+
+
+def test_failed_line_search_is_not_reported_as_converged(monkeypatch):
+    import src.logistic_solver as solver
+
+    X, y, _ = _problem()
+    # An Armijo constant this large rejects every step length.
+    monkeypatch.setattr(solver, "_ARMIJO", 1e12)
+    monkeypatch.setattr(solver, "_MAX_HALVINGS", 3)
+    with pytest.warns(ConvergenceWarning, match="line search"):
+        model = NewtonLogisticRegression().fit(X, y)
+    assert not model.converged_
+    assert model.n_iter_[0] == 1
+    assert model.history_[-1]["step_size"] == 0.0
+    np.testing.assert_array_equal(model.coef_, 0.0)
+
+
+def test_rejects_invalid_input():
+    X, y, _ = _problem(100)
+    with pytest.raises(ValueError):
+        NewtonLogisticRegression().fit(X, np.zeros(100))
+    with pytest.raises(ValueError):
+        NewtonLogisticRegression(penalty="elasticnet").fit(X, y)
+    with pytest.raises(ValueError):
+        NewtonLogisticRegression().fit(X, y, sample_weight=np.ones(3))
+
+
+def test_loss_is_stable_for_large_margins():
+    X = np.array([[800.0], [-800.0]])
+    theta = np.array([1.0, 0.0])
+    assert _loss(X, np.array([1.0, 0.0]), np.ones(2), theta) == pytest.approx(0.0)
+    assert _loss(X, np.array([0.0, 1.0]), np.ones(2), theta) == pytest.approx(1600.0)
+
+
+def test_train_model_can_use_the_newton_solver():
+    X, y, weights = _problem()
+    model = train_model(X, y, solver="newton", sample_weight=weights)
+    assert isinstance(model, NewtonLogisticRegression)
+    ref = train_model(X, y, sample_weight=weights)
+    np.testing.assert_allclose(model.coef_, ref.coef_, atol=1e-3)
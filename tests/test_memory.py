@@ -1,10 +1,17 @@
-"""Tests for ShortTermMemory and LongTermMemory."""
+"""Tests for the in-process and persistent memory backends."""
 from __future__ import annotations
 
+import asyncio
+import os
+
 import pytest
 
-from src.memory.short_term import ShortTermMemory
+from src.agents.task_agent import TaskAgent
+from src.memory.log_structured import LogStructuredMemory
 from src.memory.long_term import LongTermMemory
+from src.memory.short_term import ShortTermMemory
+from src.memory.sqlite_memory import SQLiteMemory
+from src.memory.tiered import ConsistencyMode, TieredMemory
 
 
 @pytest.mark.asyncio
@@ -67,3 +74,453 @@ async def test_long_term_clear(tmp_path):
     await mem.store("a", 1)
     await mem.clear()
     assert await mem.exists("a") is False
+
+
+@pytest.mark.asyncio
+async def test_log_structured_store_retrieve_delete(tmp_path):
+    mem = LogStructuredMemory(storage_path=str(tmp_path / "lt.log"))
+    await mem.store("greeting", {"text": "hello"})
+    await mem.store("greeting", {"text": "hi"})
+    assert await mem.retrieve("greeting") == {"text": "hi"}
+    await mem.delete("greeting")
+    assert await mem.exists("greeting") is False
+    assert await mem.retrieve("greeting") is None
+    await mem.close()
+
+
+@pytest.mark.asyncio
+async def test_log_structured_index_rebuilt_on_open(tmp_path):
+    path = str(tmp_path / "lt.log")
+    mem = LogStructuredMemory(storage_path=path)
+    await mem.store("a", 1)
+    await mem.store("b", 2)
+    await mem.delete("a")
+    await mem.close()
+
+    reopened = LogStructuredMemory(storage_path=path)
+    assert await reopened.exists("a") is False
+    assert await reopened.retrieve("b") == 2
+    await reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_log_structured_truncates_torn_tail(tmp_path):
+    path = tmp_path / "lt.log"
+    mem = LogStructuredMemory(storage_path=str(path))
+    await mem.store("kept", "yes")
+    await mem.store("torn", "x" * 100)
+    await mem.close()
+    os.truncate(path, path.stat().st_size - 10)
+
+    reopened = LogStructuredMemory(storage_path=str(path))
+    assert await reopened.retrieve("kept") == "yes"
+    assert await reopened.exists("torn") is False
+    await reopened.store("after", 1)
+    await reopened.close()
+    final = LogStructuredMemory(storage_path=str(path))
+    assert await final.retrieve("after") == 1
+    await final.close()
+
+
+@pytest.mark.asyncio
+async def test_log_structured_group_commit(tmp_path, monkeypatch):
+    mem = LogStructuredMemory(storage_path=str(tmp_path / "lt.log"))
+    batches = []
+    write_sync = mem._write_sync
+
+    def counting_write(data, offset):
+        batches.append(len(data))
+        write_sync(data, offset)
+
+    monkeypatch.setattr(mem, "_write_sync", counting_write)
+    await asyncio.gather(*(mem.store(f"k{i}", i) for i in range(100)))
+    assert len(batches) < 100
+    assert [await mem.retrieve(f"k{i}") for i in (0, 50, 99)] == [0, 50, 99]
+    await mem.close()
+
+
+@pytest.mark.asyncio
+async def test_log_structured_compaction_reclaims_space(tmp_path):
+    path = str(tmp_path / "lt.log")
+    mem = LogStructuredMemory(storage_path=path, compaction_min_bytes=1)
+    for i in range(50):
+        await mem.store("hot", i)
+    await mem.store("cold", "keep")
+    await mem.compact()
+    stats = mem.stats()
+    assert stats["dead_bytes"] == 0
+    assert stats["keys"] == 2
+    assert await mem.retrieve("hot") == 49
+    await mem.close()
+    reopened = LogStructuredMemory(storage_path=path)
+    assert await reopened.retrieve("cold") == "keep"
+    await reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_store_retrieve_delete(tmp_path):
+    path = str(tmp_path / "lt.sqlite3")
+    mem = SQLiteMemory(storage_path=path)
+    await mem.store("greeting", {"text": "hello"})
+    assert await mem.retrieve("greeting") == {"text": "hello"}
+    await mem.delete("greeting")
+    assert await mem.exists("greeting") is False
+    await mem.store("kept", 1)
+    await mem.close()
+
+    reopened = SQLiteMemory(storage_path=path)
+    assert await reopened.retrieve("kept") == 1
+    await reopened.clear()
+    assert await reopened.exists("kept") is False
+    await reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_coalesces_concurrent_stores(tmp_path, monkeypatch):
+    mem = SQLiteMemory(storage_path=str(tmp_path / "lt.sqlite3"))
+    batches = []
+    commit_sync = mem._commit_sync
+
+    def counting_commit(batch):
+        batches.append(len(batch))
+        commit_sync(batch)
+
+    monkeypatch.setattr(mem, "_commit_sync", counting_commit)
+    await asyncio.gather(*(mem.store(f"k{i}", i) for i in range(100)))
+    assert sum(batches) == 100
+    assert len(batches) < 100
+    assert await mem.retrieve("k99") == 99
+    await mem.close()
+
+
+@pytest.fixture(params=["short_term", "long_term", "log_structured", "sqlite", "tiered"])
+async def any_memory(request, tmp_path):
+    factories = {
+        "short_term": lambda: ShortTermMemory(),
+        "long_term": lambda: LongTermMemory(storage_path=str(tmp_path / "lt.json")),
+        "log_structured": lambda: LogStructuredMemory(storage_path=str(tmp_path / "lt.log")),
+        "sqlite": lambda: SQLiteMemory(storage_path=str(tmp_path / "lt.sqlite3")),
+        "tiered": lambda: TieredMemory(
+            ShortTermMemory(), LongTermMemory(storage_path=str(tmp_path / "lt.json"))
+        ),
+    }
+    mem = factories[request.param]()
+    yield mem
+    await mem.close()
+
+
+@pytest.mark.asyncio
+async def test_bulk_operations(any_memory):
+    await any_memory.store_many({"a": 1, "b": {"x": 2}, "c": 3})
+    assert await any_memory.retrieve_many(["a", "b", "missing"]) == {"a": 1, "b": {"x": 2}}
+    await any_memory.delete_many(["a", "c"])
+    assert await any_memory.retrieve_many(["a", "b", "c"]) == {"b": {"x": 2}}
+
+
+@pytest.mark.asyncio
+async def test_prefix_scan(any_memory):
+    await any_memory.store_many({"task:1": 1, "task:2": 2, "tasks": 0, "other:1": 9})
+    found = {k: v async for k, v in any_memory.scan("task:")}
+    assert found == {"task:1": 1, "task:2": 2}
+    everything = {k async for k, _ in any_memory.scan()}
+    assert everything == {"task:1", "task:2", "tasks", "other:1"}
+
+
+@pytest.mark.asyncio
+async def test_short_term_ttl_expiry(monkeypatch):
+    from src.memory import short_term
+
+    now = [1000.0]
+    monkeypatch.setattr(short_term.time, "monotonic", lambda: now[0])
+    mem = ShortTermMemory(sweep_interval=None)
+    await mem.store("session", "s", ttl=10)
+    await mem.store("pinned", "p")
+    assert await mem.retrieve("session") == "s"
+    now[0] += 11
+    assert await mem.exists("session") is False
+    assert await mem.retrieve("session") is None
+    await mem.store("other", "o", ttl=5)
+    now[0] += 6
+    assert mem.expire() == 1
+    assert await mem.retrieve("pinned") == "p"
+
+
+@pytest.mark.asyncio
+async def test_short_term_byte_budget_eviction():
+    mem = ShortTermMemory(max_size=1000, max_bytes=20_000, stripes=1)
+    for i in range(10):
+        await mem.store(f"small{i}", i)
+    await mem.store("huge", "x" * 19_900)
+    assert await mem.retrieve("huge") is not None
+    assert mem.stats()["bytes"] <= 20_000
+    assert await mem.exists("small0") is False
+
+
+@pytest.mark.asyncio
+async def test_short_term_oversized_value_is_skipped_without_evicting():
+    mem = ShortTermMemory(max_size=1000, max_bytes=20_000, stripes=1)
+    for i in range(50):
+        await mem.store(f"small{i}", i)
+    await mem.store("huge", "old")
+    await mem.store("huge", "x" * 30_000)
+    assert await mem.retrieve("huge") is None
+    assert mem.stats()["entries"] == 50
+    assert await mem.retrieve("small0") == 0
+
+
+@pytest.mark.asyncio
+async def test_short_term_byte_budget_is_shared_across_stripes():
+    mem = ShortTermMemory(max_size=1000, max_bytes=64_000, sweep_interval=None)
+    assert mem.stats()["stripes"] == 15
+    # Larger than one stripe's share (about 4.3 kB) but well within the budget.
+    await mem.store("result", "r" * 5_000)
+    assert await mem.retrieve("result") == "r" * 5_000
+    # Hash skew must not evict while the cache as a whole has room.
+    values = {f"v{i}": f"{i:04d}" * 240 for i in range(55)}
+    await mem.store_many(values)
+    assert await mem.retrieve_many(values) == values
+    assert await mem.retrieve("result") is not None
+    # Past the budget, older entries go and the total stays within it.
+    await mem.store_many({f"w{i}": f"{i:04d}" * 240 for i in range(20)})
+    assert mem.stats()["bytes"] <= 64_000
+    assert await mem.retrieve("w19") is not None
+
+
+@pytest.mark.asyncio
+async def test_short_term_expiry_heap_stays_bounded():
+    mem = ShortTermMemory(sweep_interval=None, stripes=1)
+    for i in range(20_000):
+        await mem.store(f"k{i % 5}", i, ttl=60)
+    stripe = mem._stripes[0]
+    assert len(stripe.entries) == 5
+    assert len(stripe.expiry_heap) <= 2 * len(stripe.entries)
+    assert await mem.retrieve("k4") == 19_999
+
+
+@pytest.mark.asyncio
+async def test_short_term_is_striped_and_counts_hits():
+    from src.core.metrics import MEMORY_HITS, MEMORY_MISSES
+
+    mem = ShortTermMemory(max_size=8192)
+    assert mem.stats()["stripes"] == 16
+    hits = MEMORY_HITS.labels(backend="short_term")._value.get()
+    misses = MEMORY_MISSES.labels(backend="short_term")._value.get()
+    await mem.store_many({f"k{i}": i for i in range(4096)})
+    assert await mem.retrieve_many([f"k{i}" for i in range(4096)]) == {
+        f"k{i}": i for i in range(4096)
+    }
+    assert await mem.retrieve("nope") is None
+    assert MEMORY_HITS.labels(backend="short_term")._value.get() == hits + 4096
+    assert MEMORY_MISSES.labels(backend="short_term")._value.get() == misses + 1
+
+
+@pytest.mark.asyncio
+async def test_tiered_write_behind_batches_and_reads_through(tmp_path):
+    back = LongTermMemory(storage_path=str(tmp_path / "lt.json"))
+    mem = TieredMemory(ShortTermMemory(), back, flush_interval=60)
+    await asyncio.gather(*(mem.store(f"k{i}", i) for i in range(50)))
+    await mem.delete("k0")
+    assert await back.retrieve("k1") is None
+    assert mem.pending_writes == 50
+    assert await mem.retrieve("k1") == 1
+    assert await mem.retrieve("k0") is None
+
+    await mem.flush()
+    assert mem.pending_writes == 0
+    assert await back.retrieve("k49") == 49
+    assert await back.exists("k0") is False
+
+    # A cold cache over the same store reads through and then serves from memory.
+    front = ShortTermMemory()
+    cold = TieredMemory(front, back)
+    assert await cold.retrieve("k7") == 7
+    assert await front.retrieve("k7") == 7
+    await mem.close()
+
+
+@pytest.mark.asyncio
+async def test_tiered_negative_cache_and_write_through(tmp_path):
+    back = LongTermMemory(storage_path=str(tmp_path / "lt.json"))
+    lookups = []
+    original = back.retrieve_many
+
+    async def counting_retrieve_many(keys):
+        keys = list(keys)
+        lookups.append(keys)
+        return await original(keys)
+
+    back.retrieve_many = counting_retrieve_many
+    mem = TieredMemory(ShortTermMemory(), back, mode=ConsistencyMode.WRITE_THROUGH)
+    assert await mem.retrieve_many(["ghost"]) == {}
+    assert await mem.retrieve_many(["ghost"]) == {}
+    assert await mem.exists("ghost") is False
+    assert lookups == [["ghost"]]
+
+    await mem.store("ghost", "here")
+    assert await back.retrieve("ghost") == "here"
+    assert await mem.retrieve("ghost") == "here"
+    await mem.close()
+
+
+@pytest.mark.asyncio
+async def test_snapshot_round_trip_keeps_lru_order_and_ttls(tmp_path):
+    from src.memory.snapshot import restore_snapshot, save_snapshot
+
+    path = tmp_path / "stm.snap"
+    mem = ShortTermMemory(max_size=3, sweep_interval=None)
+    await mem.store("a", {"n": 1})
+    await mem.store("b", [2, 3])
+    await mem.store("c", "three", ttl=60)
+    await mem.retrieve("a")  # LRU order is now b, c, a.
+    assert await save_snapshot(mem, path) == 3
+
+    restored = ShortTermMemory(max_size=3, sweep_interval=None)
+    assert await restore_snapshot(restored, path) == 3
+    assert [key for key, _, _ in restored.entries()] == ["b", "c", "a"]
+    _, _, ttl = restored.entries()[1]
+    assert 0 < ttl <= 60
+    await restored.store("d", 4)  # Evicts the least recently used entry.
+    assert await restored.retrieve("b") is None
+    assert await restored.retrieve("a") == {"n": 1}
+    assert await restored.retrieve("c") == "three"
+
+
+@pytest.mark.asyncio
+async def test_snapshot_rejects_corrupt_file(tmp_path):
+    from src.memory.snapshot import SnapshotError, restore_snapshot
+
+    path = tmp_path / "stm.snap"
+    path.write_bytes(b"not a snapshot at all, just junk bytes")
+    with pytest.raises(SnapshotError):
+        await restore_snapshot(ShortTermMemory(), path)
+    assert await restore_snapshot(ShortTermMemory(), tmp_path / "missing.snap") == 0
+
+
+@pytest.mark.parametrize(
+    "backend, cls",
+    [("json", LongTermMemory), ("log", LogStructuredMemory), ("sqlite", SQLiteMemory)],
+)
+@pytest.mark.asyncio
+async def test_orchestrator_selects_long_term_backend(tmp_path, backend, cls):
+    from src.core.config import Settings
+    from src.core.orchestrator import Orchestrator
+
+    settings = Settings(
+        long_term_memory_backend=backend, long_term_memory_path=str(tmp_path / "store")
+    )
+    mem = Orchestrator(settings)._build_long_term_memory()
+    assert isinstance(mem, cls)
+    await mem.store("k", 1)
+    assert await mem.retrieve("k") == 1
+    await mem.close()
+
+
+def test_orchestrator_rejects_unknown_long_term_backend():
+    from src.core.config import Settings
+    from src.core.orchestrator import Orchestrator
+
+    with pytest.raises(ValueError, match="long_term_memory_backend"):
+        Orchestrator(Settings(long_term_memory_backend="redis"))._build_long_term_memory()
+
+
+@pytest.mark.asyncio
+async def test_tiered_clear_and_agent_shutdown_keep_the_durable_store(tmp_path):
+    path = str(tmp_path / "lt.log")
+    mem = TieredMemory(ShortTermMemory(), LogStructuredMemory(storage_path=path))
+    await mem.store_many({"kept": 1, "overwritten": "v1", "deleted": "x"})
+    await mem.flush()
+    await mem.store_many({"overwritten": "v2", "unflushed": 2})
+    await mem.delete("deleted")
+    await mem.clear()
+    assert mem.pending_writes == 0
+    assert await mem.retrieve_many(["kept", "overwritten", "deleted", "unflushed"]) == {
+        "kept": 1,
+        "overwritten": "v2",
+        "unflushed": 2,
+    }
+
+    agent = TaskAgent(memory=mem)
+    await mem.store("result", {"ok": True})
+    await agent.shutdown()
+    reopened = LogStructuredMemory(storage_path=path)
+    assert await reopened.retrieve_many(["kept", "result"]) == {"kept": 1, "result": {"ok": True}}
+    await reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_tiered_read_through_only_skips_keys_written_meanwhile():
+    back = ShortTermMemory()
+    await back.store_many({"a": "old", "b": "old"})
+    release = asyncio.Event()
+    original = back.retrieve_many
+
+    async def slow_retrieve_many(keys):
+        keys = list(keys)
+        await release.wait()
+        return await original(keys)
+
+    back.retrieve_many = slow_retrieve_many
+    front = ShortTermMemory()
+    mem = TieredMemory(front, back, flush_interval=60)
+    read = asyncio.create_task(mem.retrieve_many(["a", "b"]))
+    await asyncio.sleep(0)
+    await mem.store("b", "new")
+    release.set()
+    await read
+    # "a" was untouched by the write and is cached; "b" keeps the newer value.
+    assert await front.retrieve("a") == "old"
+    assert await mem.retrieve("b") == "new"
+    await mem.close()
+
+
+@pytest.mark.asyncio
+async def test_tiered_background_flush_retries_after_failure():
+    back = ShortTermMemory()
+    original = back.store_many
+    calls = []
+
+    async def flaky_store_many(items):
+        calls.append(dict(items))
+        if len(calls) == 1:
+            raise OSError("disk full")
+        await original(items)
+
+    back.store_many = flaky_store_many
+    mem = TieredMemory(ShortTermMemory(), back, flush_interval=0.01)
+    await mem.store("k", 1)
+    for _ in range(100):
+        if await back.retrieve("k") == 1:
+            break
+        await asyncio.sleep(0.01)
+    assert await back.retrieve("k") == 1
+    assert len(calls) == 2
+    assert mem.pending_writes == 0
+    await mem.close()
+
+
+@pytest.mark.asyncio
+async def test_snapshot_of_tiered_memory_covers_only_its_cache(tmp_path):
+    from src.memory.snapshot import restore_snapshot, save_snapshot
+
+    back = ShortTermMemory()
+    mem = TieredMemory(ShortTermMemory(), back)
+    await mem.store("kept", {"v": 1})
+    assert await mem.retrieve("ghost") is None  # cached as a negative entry
+    path = tmp_path / "tiered.snap"
+    assert await save_snapshot(mem, path) == 1
+    await mem.close()
+
+    front = ShortTermMemory()
+    restored = TieredMemory(front, ShortTermMemory())
+    assert await restore_snapshot(restored, path) == 1
+    assert await front.retrieve("kept") == {"v": 1}
+    assert await restored.retrieve("ghost") is None
+    assert restored.pending_writes == 0
+    await restored.close()
+
+
+def test_lazy_value_is_abstract():
+    from src.memory.short_term import LazyValue
+
+    with pytest.raises(TypeError):
+        LazyValue()
@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import pytest
 
+from src.agents.coordinator_agent import CoordinatorAgent
 from src.agents.registry import AgentRegistry
 from src.agents.task_agent import TaskAgent
 from src.protocol.a2a_protocol import A2AProtocol
@@ -65,3 +66,116 @@ async def test_dispatch_timeout(protocol_setup, monkeypatch):
     response = await protocol.dispatch(msg, timeout=0.01)
     assert response.success is False
     assert "timed out" in response.error.lower()
+
+
+@pytest.fixture
+async def broadcast_setup():
+    registry = AgentRegistry()
+    coordinator = CoordinatorAgent(registry=registry)
+    tasks = [TaskAgent() for _ in range(3)]
+    await registry.register(coordinator)
+    for task in tasks:
+        await registry.register(task)
+    protocol = A2AProtocol(registry)
+    yield protocol, coordinator, tasks
+    await registry.shutdown_all()
+
+
+def _broadcast_message(**options) -> A2AMessage:
+    return A2AMessage(
+        sender_id="test",
+        message_type=MessageType.BROADCAST,
+        payload={"task_type": "score", "data": {"x": 1}, "broadcast": options},
+    )
+
+
+@pytest.mark.asyncio
+async def test_broadcast_fans_out_to_every_matching_agent(broadcast_setup):
+    protocol, _, tasks = broadcast_setup
+    response = await protocol.dispatch(_broadcast_message(target_type="task"))
+    assert response.success is True
+    assert set(response.payload["responses"]) == {t.agent_id for t in tasks}
+    assert response.payload["broadcast"]["succeeded"] == 3
+
+
+@pytest.mark.asyncio
+async def test_broadcast_first_k_cancels_stragglers(broadcast_setup, monkeypatch):
+    import asyncio
+    protocol, _, tasks = broadcast_setup
+    cancelled = []
+
+    async def slow_handle(message):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(message.recipient_id)
+            raise
+
+    monkeypatch.setattr(tasks[0], "handle", slow_handle)
+    response = await protocol.dispatch(
+        _broadcast_message(capability="execute", first_k=2, aggregator="first_success")
+    )
+    assert response.success is True
+    assert response.payload["winner"] != tasks[0].agent_id
+    assert response.payload["broadcast"]["cancelled"] == 1
+    assert cancelled == [tasks[0].agent_id]
+
+
+@pytest.mark.asyncio
+async def test_broadcast_quorum_not_met_on_timeouts(broadcast_setup, monkeypatch):
+    import asyncio
+    protocol, _, tasks = broadcast_setup
+
+    async def slow_handle(message):
+        await asyncio.sleep(10)
+
+    for task in tasks[:2]:
+        monkeypatch.setattr(task, "handle", slow_handle)
+    response = await protocol.dispatch(
+        _broadcast_message(target_type="task", quorum=2, per_target_timeout=0.01)
+    )
+    assert response.success is False
+    assert "Quorum not met" in response.error
+    assert response.payload["broadcast"]["failed"] == 2
+
+
+@pytest.mark.asyncio
+async def test_broadcast_custom_aggregator():
+    registry = AgentRegistry()
+    coordinator = CoordinatorAgent(
+        registry=registry, aggregators={"count": lambda rs: {"count": len(rs)}}
+    )
+    await registry.register(coordinator)
+    await registry.register(TaskAgent())
+    await registry.register(TaskAgent())
+    response = await A2AProtocol(registry).dispatch(
+        _broadcast_message(target_type="task", aggregator="count")
+    )
+    await registry.shutdown_all()
+    assert response.payload["count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_broadcast_without_selector_is_rejected(broadcast_setup):
+    protocol, _, _ = broadcast_setup
+    response = await protocol.dispatch(_broadcast_message())
+    assert response.success is False
+    assert "target_type or capability" in response.error
+
+
+@pytest.mark.asyncio
+async def test_registered_aggregator_reaches_existing_coordinator(broadcast_setup, monkeypatch):
+    from src.protocol import scatter_gather
+
+    protocol, _, tasks = broadcast_setup
+    monkeypatch.setitem(scatter_gather.AGGREGATORS, "late", lambda rs: {"late": len(rs)})
+    response = await protocol.dispatch(_broadcast_message(target_type="task", aggregator="late"))
+    assert response.payload["late"] == len(tasks)
+
+
+@pytest.mark.asyncio
+async def test_broadcast_first_k_below_quorum_is_rejected(broadcast_setup):
+    protocol, _, _ = broadcast_setup
+    response = await protocol.dispatch(_broadcast_message(target_type="task", first_k=1, quorum=2))
+    assert response.success is False
+    assert "Invalid broadcast options" in response.error
@@ -0,0 +1,280 @@
+"""Tests for the embedder and vector stores."""
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.retrieval.chroma_adapter import ChromaAdapterStub
+from src.retrieval.embedding import HashingEmbedder
+from src.retrieval.numpy_store import NumpyVectorStore
+
+
+def test_hashing_embedder_is_deterministic_and_normalised():
+    embedder = HashingEmbedder(dim=64)
+    a = embedder.embed("Late payment on the credit card")
+    assert a.dtype == np.float32
+    assert np.linalg.norm(a) == pytest.approx(1.0)
+    assert np.array_equal(a, HashingEmbedder(dim=64).embed("late payment on the CREDIT card"))
+    assert not embedder.embed("").any()
+
+
+@pytest.mark.asyncio
+async def test_numpy_store_ranks_by_similarity():
+    store = NumpyVectorStore(initial_capacity=2)
+    await store.add("limit", "credit limit increase request", {"kind": "faq"})
+    await store.add("late", "late payment fee on credit card", {"kind": "policy"})
+    await store.add("age", "minimum applicant age", {"kind": "policy"})
+    results = await store.query("credit card late payment", top_k=2)
+    assert [r["id"] for r in results] == ["late", "limit"]
+    assert results[0]["score"] > results[1]["score"]
+
+    filtered = await store.query("credit card late payment", top_k=5, where={"kind": "faq"})
+    assert [r["id"] for r in filtered] == ["limit"]
+
+
+@pytest.mark.asyncio
+async def test_numpy_store_tombstones_updates_and_compacts():
+    store = NumpyVectorStore(compaction_min_rows=2)
+    for i in range(4):
+        await store.add(f"d{i}", f"document number {i} about topic{i}")
+    await store.add("d1", "rewritten about something else")
+    await store.delete("d0")
+    assert len(store) == 3
+    assert "d0" not in {r["id"] for r in await store.query("document topic0", top_k=10)}
+
+    await store.delete("d2")  # Half the rows are now dead: compaction runs.
+    assert store._size == 2
+    results = await store.query("topic3", top_k=1)
+    assert results[0]["id"] == "d3"
+    assert (await store.query("rewritten something", top_k=1))[0]["id"] == "d1"
+
+
+@pytest.mark.asyncio
+async def test_chroma_stub_honours_where_filter():
+    store = ChromaAdapterStub()
+    await store.add("a", "one", {"lang": "en"})
+    await store.add("b", "two", {"lang": "fr"})
+    results = await store.query("anything", where={"lang": "fr"})
+    assert results == [{"text": "two", "metadata": {"lang": "fr"}}]
+
+
+def _clustered(n: int, dim: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(20, dim)).astype(np.float32)
+    data = centres[rng.integers(0, 20, n)] + 0.2 * rng.normal(size=(n, dim)).astype(np.float32)
+    return data / np.linalg.norm(data, axis=1, keepdims=True)
+
+
+@pytest.mark.parametrize("pq_m", [None, 16])
+def test_ivf_index_finds_near_duplicates(pq_m):
+    from src.retrieval.ivf_index import IVFIndex
+
+    data = _clustered(2000, 32)
+    index = IVFIndex(32, nlist=16, nprobe=4, pq_m=pq_m)
+    index.train(data)
+    index.add(np.arange(2000), data)
+    scores, ids = index.search(data[:50], k=5)
+    assert ids.shape == (50, 5)
+    assert np.mean([i in row for i, row in enumerate(ids)]) >= 0.9
+    assert np.all(np.diff(scores, axis=1) <= 1e-6)
+
+
+def test_ivf_index_persists_memory_mapped_and_accepts_adds(tmp_path):
+    from src.retrieval.ivf_index import IVFIndex
+
+    data = _clustered(1000, 16)
+    index = IVFIndex(16, nlist=8, nprobe=8, pq_m=None)
+    index.train(data)
+    index.add(np.arange(900), data[:900])
+    index.save(tmp_path)
+
+    loaded = IVFIndex.load(tmp_path)
+    assert loaded.ntotal == 900
+    assert any(isinstance(chunks[0][1], np.memmap) for chunks in loaded._lists if chunks)
+    loaded.add(np.arange(900, 1000), data[900:])
+    _, ids = loaded.search(data[[10, 950]], k=1)
+    assert ids[:, 0].tolist() == [10, 950]
+
+
+@pytest.mark.asyncio
+async def test_ivf_store_trains_after_buffering_and_round_trips(tmp_path):
+    from src.retrieval.ivf_store import IVFVectorStore
+
+    store = IVFVectorStore(HashingEmbedder(dim=64), nlist=4, nprobe=4, pq_m=None, train_size=40)
+    for i in range(30):
+        await store.add(f"doc{i}", f"topic{i} shared words", {"even": i % 2 == 0})
+    assert not store.index.is_trained
+    assert (await store.query("topic3 shared", top_k=1))[0]["id"] == "doc3"
+    for i in range(30, 60):
+        await store.add(f"doc{i}", f"topic{i} shared words", {"even": i % 2 == 0})
+    assert store.index.is_trained
+
+    await store.delete("doc41")
+    results = await store.query("topic41 shared words", top_k=3, where={"even": True})
+    assert "doc41" not in {r["id"] for r in results}
+    assert all(r["metadata"]["even"] for r in results)
+
+    store.save(tmp_path / "store")
+    reopened = IVFVectorStore.load(tmp_path / "store", embedder=HashingEmbedder(dim=64))
+    assert len(reopened) == 59
+    assert (await reopened.query("topic52 shared words", top_k=1))[0]["id"] == "doc52"
+
+
+@pytest.mark.asyncio
+async def test_ivf_store_repeated_overwrites_do_not_crowd_out_results(tmp_path):
+    from src.retrieval.ivf_store import IVFVectorStore
+
+    texts = [f"record {i} with payment history {i % 11}" for i in range(400)]
+    store = IVFVectorStore(HashingEmbedder(dim=64), nlist=8, pq_m=None, train_size=200)
+    reference = NumpyVectorStore(HashingEmbedder(dim=64))
+    for target in (store, reference):
+        await target.add_many([f"doc{i}" for i in range(400)], texts)
+        for _ in range(30):
+            await target.add("doc7", texts[7])
+    assert store.index.is_trained and store.index.ntotal == 400
+    results = await store.query(texts[7], top_k=5)
+    assert len(results) == 5
+    assert results[0]["id"] == "doc7"
+    assert [r["id"] for r in results] == [r["id"] for r in await reference.query(texts[7], top_k=5)]
+
+    await store.delete("doc7")
+    assert "doc7" not in {r["id"] for r in await store.query(texts[7], top_k=5)}
+    store.save(tmp_path / "store")
+    reopened = IVFVectorStore.load(tmp_path / "store", embedder=HashingEmbedder(dim=64))
+    assert reopened.index.ntotal == 399
+    assert len(await reopened.query(texts[7], top_k=5)) == 5
+
+
+@pytest.mark.asyncio
+async def test_ivf_store_filtered_query_searches_deeper_when_short():
+    from src.retrieval.ivf_store import IVFVectorStore
+
+    store = IVFVectorStore(
+        HashingEmbedder(dim=64), nlist=4, nprobe=4, pq_m=None, train_size=50, overfetch=1
+    )
+    await store.add_many(
+        [f"doc{i}" for i in range(200)],
+        [f"shared words {i}" for i in range(200)],
+        [{"rare": i % 50 == 0} for i in range(200)],
+    )
+    results = await store.query("shared words", top_k=4, where={"rare": True})
+    assert sorted(r["id"] for r in results) == ["doc0", "doc100", "doc150", "doc50"]
+
+
+@pytest.mark.asyncio
+async def test_ivf_store_save_keeps_an_untrained_buffer(tmp_path):
+    from src.retrieval.ivf_store import IVFVectorStore
+
+    store = IVFVectorStore(HashingEmbedder(dim=64), nlist=4, nprobe=4, pq_m=None, train_size=40)
+    await store.add_many([f"doc{i}" for i in range(10)], [f"topic{i} words" for i in range(10)])
+    store.save(tmp_path / "store")
+    assert not store.index.is_trained
+
+    reopened = IVFVectorStore.load(tmp_path / "store", embedder=HashingEmbedder(dim=64))
+    assert not reopened.index.is_trained
+    assert (await reopened.query("topic7 words", top_k=1))[0]["id"] == "doc7"
+    await reopened.add_many([f"doc{i}" for i in range(10, 40)], [f"topic{i} words" for i in range(10, 40)])
+    assert reopened.index.is_trained
+    assert reopened.index.nlist == 4
+    assert reopened.index.ntotal == 40
+
+
+def test_ivf_index_save_replaces_the_directory_without_touching_mapped_files(tmp_path):
+    from src.retrieval.ivf_index import IVFIndex
+
+    data = _clustered(200, 16)
+    index = IVFIndex(16, nlist=4, nprobe=4, pq_m=None)
+    index.train(data)
+    index.add(np.arange(100), data[:100])
+    index.save(tmp_path / "index")
+    mapped = IVFIndex.load(tmp_path / "index")
+    before = [ids.copy() for chunks in mapped._lists for ids, _ in chunks]
+
+    index.add(np.arange(100, 200), data[100:])
+    index.save(tmp_path / "index")
+    # The old mapping still reads the old files; a fresh load sees the new ones.
+    assert [ids.tolist() for chunks in mapped._lists for ids, _ in chunks] == [
+        ids.tolist() for ids in before
+    ]
+    assert IVFIndex.load(tmp_path / "index").ntotal == 200
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["index"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("factory", ["numpy", "ivf", "chroma"])
+async def test_batched_add_and_query_match_single_calls(factory):
+    from src.retrieval.ivf_store import IVFVectorStore
+
+    def make():
+        if factory == "numpy":
+            return NumpyVectorStore(HashingEmbedder(dim=64))
+        if factory == "ivf":
+            return IVFVectorStore(HashingEmbedder(dim=64), nlist=4, pq_m=None, train_size=20)
+        return ChromaAdapterStub()
+
+    ids = [f"doc{i}" for i in range(40)]
+    texts = [f"applicant {i} with payment history {i % 7}" for i in range(40)]
+    metadatas = [{"bucket": i % 3} for i in range(40)]
+    batched, single = make(), make()
+    await batched.add_many(ids, texts, metadatas)
+    for args in zip(ids, texts, metadatas):
+        await single.add(*args)
+
+    queries = ["payment history 3", "applicant 13 with payment history 6", "nothing relevant"]
+    many = await batched.query_many(queries, top_k=4, where={"bucket": 1})
+    one_by_one = [await single.query(q, top_k=4, where={"bucket": 1}) for q in queries]
+    assert len(many) == 3
+    for got, expected in zip(many, one_by_one):
+        # Equal-score ties may come back in either order.
+        assert [r.get("score") for r in got] == pytest.approx([r.get("score") for r in expected])
+    if factory != "chroma":
+        assert many[1][0]["id"] == "doc13"
+    assert all(r["metadata"]["bucket"] == 1 for results in many for r in results)
+
+
+def test_embedding_cache_is_shared_and_embeds_each_text_once():
+    from src.retrieval.embedding import (
+        CachedEmbedder,
+        EmbeddingCache,
+        shared_embedding_cache,
+    )
+
+    calls = []
+
+    class CountingEmbedder(HashingEmbedder):
+        def embed_many(self, texts):
+            texts = list(texts)
+            calls.append(texts)
+            return super().embed_many(texts)
+
+    cache = EmbeddingCache(max_entries=2)
+    first = CachedEmbedder(CountingEmbedder(dim=16), cache)
+    second = CachedEmbedder(CountingEmbedder(dim=16), cache)
+    vectors = first.embed_many(["a b", "c d", "a b"])
+    assert calls == [["a b", "c d"]]
+    assert np.array_equal(second.embed("c d"), vectors[1])
+    assert len(calls) == 1
+    second.embed("e f")  # Evicts the least recently used entry ("a b").
+    first.embed("a b")
+    assert calls[-1] == ["a b"]
+    assert len(cache) == 2
+    assert CachedEmbedder(HashingEmbedder())._cache is shared_embedding_cache()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("factory", ["numpy", "ivf"])
+async def test_bulk_ingest_does_not_fill_the_query_cache(factory):
+    from src.retrieval.embedding import shared_embedding_cache
+    from src.retrieval.ivf_store import IVFVectorStore
+
+    embedder = HashingEmbedder(dim=48)
+    if factory == "numpy":
+        store = NumpyVectorStore(embedder)
+    else:
+        store = IVFVectorStore(embedder, nlist=4, pq_m=None, train_size=20)
+    cache = shared_embedding_cache()
+    cache.clear()
+    await store.add_many([f"doc{i}" for i in range(50)], [f"ingested text {i}" for i in range(50)])
+    assert len(cache) == 0
+    assert (await store.query("ingested text 7", top_k=1))[0]["id"] == "doc7"
+    assert len(cache) == 1
@@ -0,0 +1,127 @@
+"""Tests for the priority-aware, per-sender fair DispatchScheduler."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from src.core.metrics import SCHEDULER_QUEUE_WAIT
+from src.core.scheduler import DispatchScheduler
+from src.protocol.message_schema import A2AMessage, AgentResponse, MessageType, Priority
+
+
+def _msg(sender: str = "client", priority: Priority = Priority.NORMAL, tag: str = "") -> A2AMessage:
+    return A2AMessage(
+        sender_id=sender,
+        message_type=MessageType.TASK_REQUEST,
+        priority=priority,
+        payload={"tag": tag},
+    )
+
+
+class _RecordingHandler:
+    """Blocks on the first message until released, then records run order."""
+
+    def __init__(self) -> None:
+        self.order: list[str] = []
+        self.release = asyncio.Event()
+
+    async def __call__(self, message: A2AMessage) -> AgentResponse:
+        await self.release.wait()
+        self.order.append(message.payload["tag"])
+        return AgentResponse(agent_id="h", message_id=message.message_id, success=True)
+
+
+async def _submit_all(scheduler: DispatchScheduler, messages: list[A2AMessage]):
+    tasks = [asyncio.create_task(scheduler.submit(m)) for m in messages]
+    await asyncio.sleep(0)
+    return tasks
+
+
+@pytest.mark.asyncio
+async def test_interactive_drains_before_bulk():
+    handler = _RecordingHandler()
+    scheduler = DispatchScheduler(handler, workers=1)
+    await scheduler.start()
+    blocker = await _submit_all(scheduler, [_msg(tag="first")])
+    queued = await _submit_all(
+        scheduler,
+        [_msg(priority=Priority.BULK, tag="bulk"), _msg(priority=Priority.INTERACTIVE, tag="pos")],
+    )
+    handler.release.set()
+    await asyncio.gather(*blocker, *queued)
+    await scheduler.stop()
+    assert handler.order == ["first", "pos", "bulk"]
+
+
+@pytest.mark.asyncio
+async def test_senders_share_a_class_fairly():
+    handler = _RecordingHandler()
+    scheduler = DispatchScheduler(handler, workers=1)
+    await scheduler.start()
+    blocker = await _submit_all(scheduler, [_msg(tag="first")])
+    flood = [_msg(sender="rescoring-job", tag=f"job{i}") for i in range(6)]
+    queued = await _submit_all(scheduler, flood + [_msg(sender="pos", tag="pos0")])
+    handler.release.set()
+    await asyncio.gather(*blocker, *queued)
+    await scheduler.stop()
+    # The late point-of-sale request overtakes most of the queued bulk flood.
+    assert handler.order.index("pos0") <= 2
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_and_records_wait():
+    handler = _RecordingHandler()
+    scheduler = DispatchScheduler(handler, workers=1, max_queue_size=1)
+    await scheduler.start()
+    before = SCHEDULER_QUEUE_WAIT.labels(priority="interactive")._sum.get()
+    blocker = await _submit_all(scheduler, [_msg(tag="first")])
+    queued = await _submit_all(scheduler, [_msg(priority=Priority.INTERACTIVE, tag="q")])
+    rejected = await scheduler.submit(_msg(tag="over"))
+    assert rejected.success is False
+    assert "full" in rejected.error
+    await asyncio.sleep(0.01)
+    handler.release.set()
+    await asyncio.gather(*blocker, *queued)
+    await scheduler.stop()
+    assert SCHEDULER_QUEUE_WAIT.labels(priority="interactive")._sum.get() > before
+
+
+@pytest.mark.asyncio
+async def test_stop_fails_pending_messages():
+    handler = _RecordingHandler()
+    scheduler = DispatchScheduler(handler, workers=1)
+    await scheduler.start()
+    tasks = await _submit_all(scheduler, [_msg(tag="a"), _msg(tag="b")])
+    await scheduler.stop()
+    responses = await asyncio.gather(*tasks)
+    assert all(r.success is False for r in responses)
+
+
+@pytest.mark.parametrize("weight", [0.0, -1.0])
+def test_non_positive_sender_weight_is_rejected(weight):
+    with pytest.raises(ValueError, match="must be > 0"):
+        DispatchScheduler(_RecordingHandler(), sender_weights={"bulk": weight})
+
+
+@pytest.mark.asyncio
+async def test_messages_expire_while_queued_behind_a_backlog():
+    from src.core.metrics import SCHEDULER_EXPIRED
+
+    handler = _RecordingHandler()
+    scheduler = DispatchScheduler(handler, workers=1, max_queue_wait=0.05)
+    await scheduler.start()
+    expired_before = SCHEDULER_EXPIRED.labels(priority="normal")._value.get()
+    blocker = await _submit_all(scheduler, [_msg(sender="heavy", tag="running")])
+    backlog = await _submit_all(scheduler, [_msg(sender="heavy", tag=f"b{i}") for i in range(3)])
+    await asyncio.sleep(0.1)
+    late = await _submit_all(scheduler, [_msg(sender="light", tag="late")])
+    handler.release.set()
+    responses = await asyncio.gather(*blocker, *backlog, *late)
+    await scheduler.stop()
+
+    # Only work dequeued before its deadline ran; the queued backlog timed out.
+    assert handler.order == ["running", "late"]
+    assert [r.success for r in responses] == [True, False, False, False, True]
+    assert all("Timed out" in r.error for r in responses[1:4])
+    assert SCHEDULER_EXPIRED.labels(priority="normal")._value.get() == expired_before + 3
@@ -0,0 +1,120 @@
+"""Tests for the WoE scorecard builder and integer scoring engine."""
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pytest
+from scipy.stats import spearmanr
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import roc_auc_score
+from sklearn.preprocessing import StandardScaler
+
+from src.scorecard import bin_index, build_scorecard, monotonic_bins, woe_table
+
+FEATURES = ["LIMIT_BAL", "AGE", "PAY_0"]
+
+
+def _applicants(n: int, seed: int) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    X = np.column_stack(
+        [
+            np.maximum(np.round(rng.lognormal(11.5, 0.8, n), -4), 10_000),
+            rng.integers(21, 75, n),
+            rng.integers(-2, 6, n),
+        ]
+    )
+    logit = -1.4 - 0.5 * (np.log(X[:, 0]) - 11.5) + 0.7 * np.clip(X[:, 2], -1, 4)
+    y = (rng.random(n) < 1 / (1 + np.exp(-logit))).astype(np.int8)
+    return X, y
+
+
+@pytest.fixture(scope="module")
+def training() -> tuple[np.ndarray, np.ndarray]:
+    return _applicants(20_000, seed=0)
+
+
+def test_bin_index_matches_searchsorted():
+    rng = np.random.default_rng(1)
+    values = rng.normal(0, 2, 1_000)
+    values[:3] = [-1.0, 0.0, 1.0]  # values equal to an edge go to the upper bin
+    for edges in (np.array([-1.0, 0.0, 1.0]), np.linspace(-3, 3, 40)):
+        np.testing.assert_array_equal(
+            bin_index(edges, values), np.searchsorted(edges, values, side="right")
+        )
+
+
+def test_bins_are_monotonic_and_respect_limits(training):
+    X, y = training
+    edges = monotonic_bins(X[:, 0], y, max_bins=5, min_bin_share=0.05)
+    assert 1 <= len(edges) + 1 <= 5
+    idx = bin_index(edges, X[:, 0])
+    counts = np.bincount(idx)
+    rates = np.bincount(idx, weights=y) / counts
+    # Higher limits default less often.
+    assert np.all(np.diff(rates) <= 0)
+    assert counts.min() >= 0.05 * len(X)
+
+
+def test_woe_is_log_ratio_of_good_to_bad_shares():
+    x = np.array([0, 0, 0, 0, 1, 1, 1, 1], dtype=float)
+    y = np.array([0, 0, 0, 1, 0, 1, 1, 1])
+    woe, iv = woe_table(x, y, np.array([0.5]))
+    # Smoothed shares: good (3.5/5, 1.5/5), bad (1.5/5, 3.5/5).
+    assert woe == pytest.approx([math.log(3.5 / 1.5), math.log(1.5 / 3.5)])
+    assert iv == pytest.approx(2 * 0.4 * math.log(3.5 / 1.5))
+
+
+def test_score_is_base_plus_integer_points(training):
+    X, y = training
+    card = build_scorecard(X, y, FEATURES)
+    assert all(p.dtype == np.int32 for p in card.points)
+    sample = X[:100]
+    expected = card.base_points + sum(
+        card.points[j][np.searchsorted(card.edges[j], sample[:, j], side="right")]
+        for j in range(len(FEATURES))
+    )
+    # Small batches take the pure-Python path, larger ones the vectorized one.
+    np.testing.assert_array_equal(card.score(sample[:5]), expected[:5])
+    np.testing.assert_array_equal(card.score(sample), expected)
+    assert card.score(sample).dtype == np.int32
+    table = card.table()
+    assert {row["feature"] for row in table} == set(FEATURES)
+    assert len(table) == sum(len(p) for p in card.points)
+
+
+def test_points_scaling_doubles_odds_every_pdo(training):
+    X, y = training
+    card = build_scorecard(X, y, FEATURES, base_score=600, base_odds=50, pdo=20)
+    pd_at_base = card.default_probability(np.array([600.0]))[0]
+    pd_at_next = card.default_probability(np.array([620.0]))[0]
+    assert (1 - pd_at_base) / pd_at_base == pytest.approx(50)
+    assert (1 - pd_at_next) / pd_at_next == pytest.approx(100)
+
+
+def test_scorecard_ranks_like_the_continuous_model(training):
+    X, y = training
+    card = build_scorecard(X, y, FEATURES)
+    scaler = StandardScaler().fit(X)
+    model = LogisticRegression(max_iter=1000).fit(scaler.transform(X), y)
+    X_test, y_test = _applicants(20_000, seed=1)
+    points = card.score(X_test)
+    pd_model = model.predict_proba(scaler.transform(X_test))[:, 1]
+    # Binning loses little, and captures the non-linear PAY_0 effect.
+    assert roc_auc_score(y_test, -points) >= roc_auc_score(y_test, pd_model) - 0.01
+    assert spearmanr(points, -pd_model).statistic > 0.85
+
+
+def test_missing_values_are_rejected_the_same_way_for_any_batch_size(training):
+    X, y = training
+    card = build_scorecard(X, y, FEATURES)
+    batch = X[:20].copy()
+    # Infinite values land in the same bin on both paths.
+    batch[1, 0], batch[2, 0] = np.inf, -np.inf
+    np.testing.assert_array_equal(card.score(batch[:3]), card.score(batch)[:3])
+    batch[0, 1] = np.nan
+    for rows in (batch[:1], batch):
+        with pytest.raises(ValueError, match="AGE"):
+            card.score(rows)
+    with pytest.raises(ValueError, match="missing"):
+        build_scorecard(batch, y[:20], FEATURES)
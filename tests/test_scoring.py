@@ -0,0 +1,138 @@
+"""Tests for the similar-applicant index and the ScoringAgent."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+from src.agents.coordinator_agent import CoordinatorAgent
+from src.agents.registry import AgentRegistry
+from src.agents.scoring_agent import ScoringAgent
+from src.agents.task_agent import TaskAgent
+from src.protocol.message_schema import A2AMessage, MessageType
+from src.similar_applicants import SimilarApplicantIndex
+from src.train_model import export_model
+
+FEATURES = ["LIMIT_BAL", "AGE", "PAY_0", "BILL_AMT1", "PAY_AMT1"]
+
+
+def _training_frame(n: int = 500, seed: int = 0) -> tuple[pd.DataFrame, pd.Series]:
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(
+        {
+            "LIMIT_BAL": rng.integers(10_000, 500_000, n),
+            "AGE": rng.integers(21, 70, n),
+            "PAY_0": rng.integers(-2, 6, n),
+            "BILL_AMT1": rng.integers(0, 200_000, n),
+            "PAY_AMT1": rng.integers(0, 50_000, n),
+        }
+    )
+    y = pd.Series((X["PAY_0"] + rng.normal(0, 1, n) > 2).astype(int))
+    return X, y
+
+
+@pytest.fixture
+def artifact_path(tmp_path):
+    X, y = _training_frame()
+    scaler = StandardScaler()
+    model = LogisticRegression(max_iter=1000).fit(scaler.fit_transform(X), y)
+    path = tmp_path / "model.joblib"
+    export_model(model, scaler, X, y, path=str(path))
+    return str(path)
+
+
+def test_similar_applicants_returns_nearest_rows_first():
+    rng = np.random.default_rng(1)
+    scaled = rng.normal(size=(1000, 5))
+    outcomes = rng.integers(0, 2, 1000)
+    index = SimilarApplicantIndex(scaled, outcomes, FEATURES)
+    results = index.query(scaled[[3, 7]] + 1e-6, k=4)
+    assert [r["neighbours"][0]["row"] for r in results] == [3, 7]
+    distances = [n["distance"] for n in results[0]["neighbours"]]
+    assert distances == sorted(distances)
+    assert results[0]["default_rate"] == pytest.approx(
+        np.mean([n["default"] for n in results[0]["neighbours"]])
+    )
+
+
+@pytest.mark.asyncio
+async def test_scoring_agent_scores_batch_with_similar_applicants(artifact_path):
+    agent = ScoringAgent(artifact_path, neighbours=3)
+    X, _ = _training_frame()
+    applicants = X.iloc[:2].to_dict(orient="records")
+    msg = A2AMessage(
+        sender_id="test",
+        message_type=MessageType.TASK_REQUEST,
+        payload={"task_type": "score", "applicants": applicants},
+    )
+    response = await agent.handle(msg)
+    assert response.success is True
+    scores = response.payload["scores"]
+    assert len(scores) == 2
+    assert 0.0 <= scores[0]["default_probability"] <= 1.0
+    nearest = scores[0]["similar_applicants"]["neighbours"][0]
+    assert nearest["row"] == 0 and nearest["distance"] == pytest.approx(0.0)
+    assert nearest["features"]["AGE"] == applicants[0]["AGE"]
+
+
+@pytest.mark.asyncio
+async def test_scoring_agent_warm_up_loads_the_artifact(artifact_path):
+    agent = ScoringAgent(artifact_path)
+    await agent.warm_up()
+    assert agent._artifact is not None
+    assert len(agent._artifact["similar_applicants"]) == 500
+
+
+@pytest.mark.asyncio
+async def test_scored_batches_feed_the_drift_monitor(artifact_path):
+    agent = ScoringAgent(artifact_path, neighbours=0, drift_min_rows=0)
+    await agent.warm_up()
+    assert agent.drift_monitor is not None and agent.drift_monitor.rows == 0
+    X, _ = _training_frame(seed=1)
+    msg = A2AMessage(
+        sender_id="test",
+        message_type=MessageType.TASK_REQUEST,
+        payload={"task_type": "score", "applicants": X.to_dict(orient="records")},
+    )
+    assert (await agent.handle(msg)).success
+    assert agent.drift_monitor.rows == pytest.approx(500, rel=0.01)
+    assert set(agent.drift_monitor.psi()) == set(FEATURES) | {"score"}
+    assert max(agent.drift_monitor.psi().values()) < 0.1
+
+
+@pytest.mark.asyncio
+async def test_scoring_agent_rejects_missing_features(artifact_path):
+    agent = ScoringAgent(artifact_path)
+    msg = A2AMessage(
+        sender_id="test",
+        message_type=MessageType.TASK_REQUEST,
+        payload={"task_type": "score", "applicants": [{"AGE": 30}]},
+    )
+    response = await agent.handle(msg)
+    assert response.success is False
+    assert "LIMIT_BAL" in response.error
+
+
+@pytest.mark.asyncio
+async def test_coordinator_routes_score_tasks_to_scoring_agent(artifact_path):
+    registry = AgentRegistry()
+    coordinator = CoordinatorAgent(registry=registry)
+    scoring = ScoringAgent(artifact_path)
+    await registry.register(coordinator)
+    await registry.register(TaskAgent())
+    await registry.register(scoring)
+    X, _ = _training_frame()
+    msg = A2AMessage(
+        sender_id="test",
+        message_type=MessageType.TASK_REQUEST,
+        payload={"task_type": "score", "applicants": X.iloc[:1].to_dict(orient="records")},
+    )
+    response = await coordinator.handle(msg)
+    assert response.agent_id == scoring.agent_id
+    echo = await coordinator.handle(
+        A2AMessage(sender_id="test", message_type=MessageType.TASK_REQUEST, payload={})
+    )
+    assert echo.agent_id != scoring.agent_id
+    await registry.shutdown_all()
@@ -0,0 +1,90 @@
+"""Tests for per-hop latency spans and task outcome counters."""
+from __future__ import annotations
+
+import logging
+
+import pytest
+
+from src.agents.coordinator_agent import CoordinatorAgent
+from src.agents.registry import AgentRegistry
+from src.agents.task_agent import TaskAgent
+from src.core.metrics import HOP_LATENCY, TASK_FAILURE_COUNT, TASK_SUCCESS_COUNT
+from src.core.tracing import configure_tracing, ensure_correlation_id, span
+from src.protocol.a2a_protocol import A2AProtocol
+from src.protocol.message_schema import A2AMessage, MessageType
+
+
+def _hop_count(hop: str) -> float:
+    for metric in HOP_LATENCY.collect():
+        for sample in metric.samples:
+            if sample.name.endswith("_count") and sample.labels.get("hop") == hop:
+                return sample.value
+    return 0.0
+
+
+@pytest.fixture
+async def protocol():
+    registry = AgentRegistry()
+    coordinator = CoordinatorAgent(registry=registry)
+    await registry.register(coordinator)
+    await registry.register(TaskAgent())
+    yield A2AProtocol(registry), coordinator
+    await registry.shutdown_all()
+
+
+@pytest.mark.asyncio
+async def test_dispatch_records_every_hop_and_the_outcome(protocol):
+    a2a, coordinator = protocol
+    hops = ("protocol_dispatch", "coordinator_delegate", "task_execute")
+    before = {hop: _hop_count(hop) for hop in hops}
+    succeeded = TASK_SUCCESS_COUNT.labels(agent_type="task")._value.get()
+
+    msg = A2AMessage(
+        sender_id="test",
+        recipient_id=coordinator.agent_id,
+        message_type=MessageType.TASK_REQUEST,
+        payload={"task_type": "analyse"},
+    )
+    response = await a2a.dispatch(msg)
+
+    assert response.success
+    assert all(_hop_count(hop) == before[hop] + 1 for hop in hops)
+    assert TASK_SUCCESS_COUNT.labels(agent_type="task")._value.get() == succeeded + 1
+
+
+@pytest.mark.asyncio
+async def test_failed_task_counts_as_failure(protocol):
+    a2a, _ = protocol
+    task = next(a for a in a2a._registry.get_by_type("task"))
+
+    async def broken(message):
+        raise RuntimeError("boom")
+
+    task._run_task = broken
+    failed = TASK_FAILURE_COUNT.labels(agent_type="task")._value.get()
+    msg = A2AMessage(
+        sender_id="test",
+        recipient_id=task.agent_id,
+        message_type=MessageType.TASK_REQUEST,
+        payload={"task_type": "analyse"},
+    )
+    response = await a2a.dispatch(msg)
+
+    assert not response.success
+    assert TASK_FAILURE_COUNT.labels(agent_type="task")._value.get() == failed + 1
+
+
+def test_slow_spans_are_logged_with_the_correlation_id(caplog):
+    msg = A2AMessage(sender_id="test", message_type=MessageType.TASK_REQUEST)
+    assert ensure_correlation_id(msg) == msg.message_id
+
+    configure_tracing(slow_span_seconds=0.0)
+    try:
+        with caplog.at_level(logging.WARNING, logger="src.core.tracing"), span("api", msg):
+            pass
+    finally:
+        configure_tracing(None)
+
+    [record] = [r for r in caplog.records if r.msg == "slow_span"]
+    assert record.hop == "api"
+    assert record.correlation_id == msg.message_id
@@ -0,0 +1,171 @@
+"""Tests for the socket A2A transport against a local stand-in AgentServer."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from src.agents.coordinator_agent import CoordinatorAgent
+from src.agents.registry import AgentRegistry
+from src.agents.remote_agent import RemoteAgent
+from src.agents.task_agent import TaskAgent
+from src.protocol.a2a_protocol import A2AProtocol
+from src.protocol.message_schema import A2AMessage, AgentResponse, MessageType
+from src.protocol.socket_transport import AgentServer, SocketTransport
+
+
+@pytest.fixture(params=["unix", "tcp"])
+async def remote_node(request, tmp_path):
+    if request.param == "unix":
+        address = f"unix:{tmp_path / 'agents.sock'}"
+    else:
+        address = "tcp://127.0.0.1:0"
+    server_registry = AgentRegistry()
+    task = TaskAgent()
+    await server_registry.register(task)
+    server = AgentServer(server_registry, address)
+    await server.start()
+    yield server, task
+    await server.stop()
+    await server_registry.shutdown_all()
+
+
+@pytest.fixture
+async def client(remote_node):
+    server, _ = remote_node
+    transport = SocketTransport(pool_size=2)
+    registry = AgentRegistry()
+    await registry.register(CoordinatorAgent(registry=registry))
+    remote = await transport.register_remote_agents(registry, server.address)
+    yield A2AProtocol(registry, transport=transport), transport, remote, server
+    await registry.shutdown_all()
+    await transport.close()
+
+
+def _task(recipient_id=None) -> A2AMessage:
+    return A2AMessage(
+        sender_id="test",
+        recipient_id=recipient_id,
+        message_type=MessageType.TASK_REQUEST,
+        payload={"task_type": "ping", "data": {"n": 1}},
+    )
+
+
+@pytest.mark.asyncio
+async def test_remote_agents_are_discovered(client, remote_node):
+    _, _, remote, _ = client
+    _, task = remote_node
+    assert len(remote) == 1
+    assert isinstance(remote[0], RemoteAgent)
+    assert remote[0].agent_id == task.agent_id
+    assert remote[0].agent_type == "task"
+
+
+@pytest.mark.asyncio
+async def test_dispatch_reaches_remote_agent(client, remote_node):
+    protocol, _, remote, _ = client
+    _, task = remote_node
+    response = await protocol.dispatch(_task(remote[0].agent_id))
+    assert response.success is True
+    assert response.agent_id == task.agent_id
+    # Unaddressed messages go through the local coordinator to the remote TaskAgent.
+    delegated = await protocol.dispatch(_task())
+    assert delegated.success is True
+    assert delegated.agent_id == task.agent_id
+
+
+@pytest.mark.asyncio
+async def test_requests_are_pipelined_over_pooled_connections(client):
+    protocol, transport, remote, server = client
+    responses = await asyncio.gather(
+        *(protocol.dispatch(_task(remote[0].agent_id)) for _ in range(50))
+    )
+    assert all(r.success for r in responses)
+    assert len({r.message_id for r in responses}) == 50
+    assert 1 <= transport.connection_count(server.address) <= 2
+
+
+@pytest.mark.asyncio
+async def test_remote_errors_and_dead_servers_become_error_responses(client):
+    protocol, transport, remote, server = client
+    missing = await transport.request(server.address, _task("nonexistent-id"))
+    assert missing.success is False
+    assert "No agent found" in missing.error
+    await server.stop()
+    response = await protocol.dispatch(_task(remote[0].agent_id))
+    assert response.success is False
+
+
+@pytest.mark.asyncio
+async def test_delegation_spreads_over_local_and_remote_task_agents(remote_node):
+    server, remote_task = remote_node
+    transport = SocketTransport(pool_size=1)
+    registry = AgentRegistry()
+    local_task = TaskAgent()
+    await registry.register(CoordinatorAgent(registry=registry))
+    await registry.register(local_task)
+    await transport.register_remote_agents(registry, server.address)
+    protocol = A2AProtocol(registry, transport=transport)
+    try:
+        responses = [await protocol.dispatch(_task()) for _ in range(4)]
+    finally:
+        await registry.shutdown_all()
+        await transport.close()
+    assert all(r.success for r in responses)
+    assert {r.agent_id for r in responses} == {local_task.agent_id, remote_task.agent_id}
+
+
+@pytest.mark.asyncio
+async def test_malformed_request_frame_gets_an_error_response(remote_node):
+    from src.protocol.socket_transport import (
+        FRAME_REQUEST,
+        _encode_frame,
+        _open,
+        _read_frame,
+    )
+
+    server, _ = remote_node
+    reader, writer = await _open(server.address)
+    try:
+        writer.write(_encode_frame(FRAME_REQUEST, 7, b"{not json"))
+        await writer.drain()
+        _, request_id, body = await asyncio.wait_for(_read_frame(reader), timeout=2)
+    finally:
+        writer.close()
+    response = AgentResponse.model_validate_json(body)
+    assert request_id == 7
+    assert response.success is False
+    assert response.message_id == "request-7"
+
+
+@pytest.mark.asyncio
+async def test_unknown_and_oversized_frames_fail_fast(remote_node):
+    from src.protocol.socket_transport import (
+        _HEADER,
+        FRAME_ERROR,
+        MAX_FRAME_BYTES,
+        FrameError,
+        _Connection,
+        _open,
+        _read_frame,
+    )
+
+    server, _ = remote_node
+    connection = _Connection(*await _open(server.address))
+    try:
+        with pytest.raises(FrameError, match="Unknown frame kind 42"):
+            await asyncio.wait_for(connection.request(42, b""), timeout=2)
+        # The connection stays usable after an unknown frame.
+        assert not connection.closed
+    finally:
+        await connection.close()
+
+    reader, writer = await _open(server.address)
+    try:
+        writer.write(_HEADER.pack(MAX_FRAME_BYTES + 1, 1, 9))
+        await writer.drain()
+        kind, request_id, body = await asyncio.wait_for(_read_frame(reader), timeout=2)
+    finally:
+        writer.close()
+    assert (kind, request_id) == (FRAME_ERROR, 9)
+    assert b"exceeds" in body